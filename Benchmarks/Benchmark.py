@@ -0,0 +1,350 @@
+# Benchmarks for UXTU4Unix's own hot paths, on any Linux box: no AMD hardware, sudo or ryzenadj needed.
+# The Linux edition is copied into a sandbox with a stub ryzenadj, a sudo shim and a generated config.ini.
+#
+#   python3 Benchmarks/Benchmark.py --output results.json
+#   python3 Benchmarks/Benchmark.py --compare results.json    # exit 1 when a metric regressed
+#
+# Every metric is lower-is-better, so two result files from different commits compare directly.
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import atexit
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+
+REPO = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+EDITION = os.path.join(REPO, 'Linux')
+FORMAT_VERSION = 1
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+STUB_RYZENADJ = r'''#!{python}
+import os
+import sys
+import time
+with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'ryzenadj.calls'), 'a') as f:
+    f.write(f"{{time.time()!r}} {{' '.join(sys.argv[1:])}}\n")
+if '-i' in sys.argv:
+    print("CPU Family: Renoir\nSMU BIOS Interface Version: 18\nVersion: v0.14.0\nPM Table Version: 370005")
+    print("|        Name         |   Value   |     Parameter      |")
+    print("|---------------------|-----------|--------------------|")
+    for row, value, parameter in ROWS:
+        print(f"| {{row:<19}} | {{value:>9.3f}} | {{parameter:<18}} |")
+for arg in sys.argv[1:]:
+    option, _, value = arg.lstrip('-').partition('=')
+    if arg.startswith('--'):
+        print(f"Sucessfully set {{option}} to {{value}}")
+'''
+INFO_ROWS = [
+    ('STAPM LIMIT', 15.0, 'stapm-limit'), ('STAPM VALUE', 9.8, ''),
+    ('PPT LIMIT FAST', 25.0, 'fast-limit'), ('PPT VALUE FAST', 12.1, ''),
+    ('PPT LIMIT SLOW', 18.0, 'slow-limit'), ('PPT VALUE SLOW', 10.4, ''),
+    ('TDC LIMIT VDD', 30.0, 'vrm-current'), ('TDC VALUE VDD', 11.7, ''),
+    ('EDC LIMIT VDD', 45.0, 'vrmmax-current'), ('EDC VALUE VDD', 20.3, ''),
+    ('THM LIMIT CORE', 95.0, 'tctl-temp'), ('THM VALUE CORE', 61.5, ''),
+    ('STT LIMIT APU', 45.0, 'apu-skin-temp'), ('STT VALUE APU', 38.2, ''),
+] + [(f'CORE CLOCK {core}', 2.4 + core / 10, '') for core in range(6)]
+
+# sudo -S <command>: swallow the password line, keep the rest of stdin for the command
+SUDO_SHIM = '''#!/bin/sh
+[ "$1" = "-S" ] && shift
+[ "$1" = "-k" ] && exit 0
+IFS= read -r _password
+exec "$@"
+'''
+
+CONFIG = '''[User]
+password = bench
+mode = Balance
+customargs =
+preset =
+
+[Settings]
+time = {interval}
+softwareupdate = 0
+reapply = {reapply}
+verify = 0
+applyonstart = 1
+dynamicmode = 0
+debug = 1
+
+[Info]
+cpu = AMD Ryzen 5 4500U with Radeon Graphics
+signature = Family 23, Model 96, Stepping 1
+voltage = 1.2 V
+max speed = 4000 MHz
+current speed = 2375 MHz
+core count = 6
+core enabled = 6
+thread count = 6
+architecture = Zen 1 - Zen 2
+family = Renoir
+type = Amd_Apu
+fingerprint = {fingerprint}
+'''
+
+class Sandbox:
+    def __init__(self, edition=EDITION):
+        self.root = tempfile.mkdtemp(prefix='uxtu4unix-bench-')
+        self.app = os.path.join(self.root, 'UXTU4Unix')
+        ignore = shutil.ignore_patterns('config.ini', '.config.ini.lock', 'update.json', 'ryzenadj', '__pycache__', 'Logs')
+        shutil.copytree(edition, self.app, ignore=ignore)
+        self.assets = os.path.join(self.app, 'Assets')
+        self.config = os.path.join(self.assets, 'config.ini')
+        self.calls = os.path.join(self.assets, 'ryzenadj.calls')
+        self.tmp = os.path.join(self.root, 'tmp')
+        bin_dir = os.path.join(self.root, 'bin')
+        os.makedirs(self.tmp)
+        os.makedirs(bin_dir)
+        stub = STUB_RYZENADJ.format(python=sys.executable).replace('ROWS', repr(INFO_ROWS))
+        self.write(os.path.join(self.assets, 'ryzenadj'), stub, 0o755)
+        self.write(os.path.join(bin_dir, 'sudo'), SUDO_SHIM, 0o755)
+        self.env = dict(os.environ, PATH=bin_dir + os.pathsep + os.environ.get('PATH', ''), TMPDIR=self.tmp, TERM=os.environ.get('TERM', 'dumb'))
+        self.fingerprint = subprocess.run([sys.executable, '-c', 'from Assets.Probe import HardwareProbe; print(HardwareProbe("dmidecode", "").fingerprint())'],
+                                          cwd=self.app, env=self.env, stdout=subprocess.PIPE, check=True).stdout.decode().strip()
+
+    @staticmethod
+    def write(path, text, mode=0o644):
+        with open(path, 'w') as f:
+            f.write(text)
+        os.chmod(path, mode)
+
+    def configure(self, reapply=0, interval=30):
+        self.write(self.config, CONFIG.format(reapply=reapply, interval=interval, fingerprint=self.fingerprint), 0o600)
+        if os.path.exists(self.calls):
+            os.remove(self.calls)
+
+    def applies(self):
+        # Timestamps of stub invocations that set limits (not -i reads)
+        try:
+            with open(self.calls) as f:
+                return [float(line.split()[0]) for line in f if ' --' in line]
+        except OSError:
+            return []
+
+    def launch(self):
+        return subprocess.Popen([sys.executable, os.path.join(self.app, 'UXTU4Unix.py')], cwd=self.app, env=self.env,
+                                stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+    def wait_for_apply(self, proc, count=1, timeout=30):
+        deadline = time.monotonic() + timeout
+        while len(self.applies()) < count:
+            if proc.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"UXTU4Unix did not apply a preset (exit code {proc.poll()})")
+            time.sleep(0.002)
+        return self.applies()[count - 1]
+
+    @staticmethod
+    def terminate(proc):
+        # The SMU helper runs in the same session, so the whole group goes
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+
+    def close(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+def stats(samples, unit):
+    return {'unit': unit, 'median': statistics.median(samples), 'min': min(samples), 'max': max(samples), 'samples': len(samples)}
+
+def timed(function, repeat, number=1):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+def bench_startup(sandbox, repeat):
+    # Process launch until the stub ryzenadj first receives limits (ApplyOnStart, no reapply)
+    samples = []
+    for _ in range(repeat):
+        sandbox.configure(reapply=0)
+        launched = time.time()
+        proc = sandbox.launch()
+        try:
+            samples.append(sandbox.wait_for_apply(proc) - launched)
+        finally:
+            sandbox.terminate(proc)
+    return {'startup_to_first_apply': stats(samples, 's')}
+
+def bench_cli_apply(sandbox, repeat):
+    # Same, through the headless `apply` subcommand; the first run fills Assets/argv.cache
+    samples = []
+    sandbox.configure(reapply=0)
+    for _ in range(repeat + 1):
+        launched = time.time()
+        proc = subprocess.Popen([sys.executable, os.path.join(sandbox.app, 'UXTU4Unix.py'), 'apply'], cwd=sandbox.app, env=sandbox.env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        proc.wait()
+        samples.append(sandbox.applies()[-1] - launched)
+    return {'cli_apply': stats(samples[1:], 's')}
+
+def read_proc(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    ticks = sum(int(value) for value in fields[11:15])
+    switches = 0
+    for task in os.listdir(f'/proc/{pid}/task'):
+        try:
+            with open(f'/proc/{pid}/task/{task}/status') as f:
+                switches += sum(int(line.split()[1]) for line in f if 'ctxt_switches:' in line)
+        except OSError:
+            continue
+    with open(f'/proc/{pid}/status') as f:
+        rss = next((int(line.split()[1]) for line in f if line.startswith('VmRSS:')), 0)
+    return ticks / CLOCK_TICKS, switches, rss
+
+def session_pids(sid):
+    pids = []
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    fields = f.read().rsplit(')', 1)[1].split()
+            except OSError:
+                continue
+            if int(fields[3]) == sid:
+                pids.append(int(entry))
+    return pids
+
+def bench_reapply(sandbox, duration, interval):
+    # Steady state: CPU time (including ryzenadj children), context switches and RSS of the
+    # UXTU4Unix process and its SMU helper while auto reapply idles between applies
+    sandbox.configure(reapply=1, interval=interval)
+    proc = sandbox.launch()
+    try:
+        sandbox.wait_for_apply(proc)
+        time.sleep(min(1.0, interval / 2))
+        pids = session_pids(proc.pid)
+        before = {pid: read_proc(pid) for pid in pids}
+        applies = len(sandbox.applies())
+        start = time.monotonic()
+        time.sleep(duration)
+        after = {pid: read_proc(pid) for pid in pids}
+        elapsed = time.monotonic() - start
+        applies = len(sandbox.applies()) - applies
+    finally:
+        sandbox.terminate(proc)
+    cpu = sum(after[pid][0] - before[pid][0] for pid in pids)
+    switches = sum(after[pid][1] - before[pid][1] for pid in pids)
+    single = lambda value, unit: {'unit': unit, 'median': value, 'min': value, 'max': value, 'samples': 1}
+    return {
+        'reapply_cpu_fraction': single(cpu / elapsed, 'cpu'),
+        'reapply_cpu_per_apply': single(cpu / applies if applies else cpu, 's'),
+        'reapply_wakeups_per_second': single(switches / elapsed, '1/s'),
+        'reapply_rss_main': single(after[proc.pid][2], 'KiB'),
+        'reapply_rss_total': single(sum(rss for _, _, rss in after.values()), 'KiB'),
+    }
+
+def bench_in_process(sandbox, repeat):
+    # Import the sandboxed copy and time its functions directly; its output goes to /dev/null
+    sandbox.configure(reapply=0)
+    tempfile.tempdir = sandbox.tmp
+    os.environ.update(sandbox.env)
+    sys.path.insert(0, sandbox.app)
+    saved = os.dup(1), os.dup(2)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    results = {}
+    try:
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+        import UXTU4Unix as app
+        app.input = lambda prompt='': ''
+
+        def cold_presets():
+            app.preset_cache.clear()
+            app.compile_args.cache_clear()
+            app.preset_catalog.data = None
+            app.get_presets()
+
+        results['get_presets_cold'] = stats(timed(cold_presets, repeat), 's')
+        results['get_presets_warm'] = stats(timed(app.get_presets, repeat, 1000), 's')
+        results['check_cfg_integrity'] = stats(timed(app.check_cfg_integrity, repeat, 1000), 's')
+        presets = app.get_presets()
+        start = time.perf_counter()
+        app.apply_smu(presets['Balance'], 'Balance')
+        results['apply_smu_first'] = stats([time.perf_counter() - start], 's')
+        results['apply_smu'] = stats(timed(lambda: app.apply_smu(presets['Balance'], 'Balance'), repeat), 's')
+        app.smu.close()
+        # The sandbox is deleted before the interpreter exits, so save now rather than from atexit
+        app.cfg.flush()
+        atexit.unregister(app.cfg.flush)
+    finally:
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        for fd in saved + (devnull,):
+            os.close(fd)
+    return results
+
+def git_commit():
+    result = subprocess.run(['git', '-C', REPO, 'rev-parse', 'HEAD'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return result.stdout.decode().strip() or None
+
+def compare(baseline, current, threshold):
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if not base or not base['median']:
+            continue
+        change = result['median'] / base['median'] - 1
+        flag = ' REGRESSION' if change > threshold else ''
+        print(f"{name:<30} {base['median']:>12.6g} -> {result['median']:>12.6g} {result['unit']:<4} {change:+8.1%}{flag}", file=sys.stderr)
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark UXTU4Unix's startup, preset resolution and apply paths")
+    parser.add_argument('--repeat', type=int, default=20, help="samples per metric (default: 20)")
+    parser.add_argument('--startup-runs', type=int, default=10, help="process launches for the startup metric (default: 10)")
+    parser.add_argument('--duration', type=float, default=30, help="seconds of steady-state reapply to measure (default: 30)")
+    parser.add_argument('--interval', type=int, default=5, help="reapply interval for the steady-state run (default: 5)")
+    parser.add_argument('--edition', default=EDITION, help="edition directory to benchmark (default: Linux)")
+    parser.add_argument('--output', help="write results to this file instead of stdout")
+    parser.add_argument('--compare', help="baseline results file; exit 1 if a median regressed by more than --threshold")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed relative slowdown for --compare (default: 0.2)")
+    args = parser.parse_args()
+    if not sys.platform.startswith('linux'):
+        parser.error("the benchmarks need Linux (/proc)")
+
+    sandbox = Sandbox(args.edition)
+    try:
+        results = {}
+        results.update(bench_startup(sandbox, args.startup_runs))
+        results.update(bench_cli_apply(sandbox, args.startup_runs))
+        results.update(bench_reapply(sandbox, args.duration, args.interval))
+        results.update(bench_in_process(sandbox, args.repeat))
+    finally:
+        sandbox.close()
+    report = {
+        'format': FORMAT_VERSION,
+        'commit': git_commit(),
+        'time': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True) + '\n'
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold):
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import re
+
+FAMILIES = [
+    "Unknown", "SummitRidge", "PinnacleRidge", "RavenRidge", "Dali", "Pollock",
+    "Picasso", "FireFlight", "Matisse", "Renoir", "Lucienne", "VanGogh", "Mendocino",
+    "Vermeer", "Cezanne_Barcelo", "Rembrandt", "Raphael", "DragonRange", "PhoenixPoint",
+    "PhoenixPoint2", "HawkPoint", "SonomaValley", "GraniteRidge", "FireRange",
+    "StrixPoint", "StrixPoint2", "Sarlak"
+]
+FAMILY_RANK = {family: rank for rank, family in enumerate(FAMILIES)}
+
+ARCHITECTURES = {23: 'Zen 1 - Zen 2', 25: 'Zen 3 - Zen 4', 26: 'Zen 5 - Zen 6'}
+# (CPUID family, model[, stepping]) -> codename
+CODENAMES = {
+    (23, 1): 'SummitRidge',
+    (23, 8): 'PinnacleRidge',
+    (23, 17): 'RavenRidge',
+    (23, 18): 'RavenRidge',
+    (23, 24): 'Picasso',
+    (23, 32): 'Dali',
+    (23, 80): 'FireFlight',
+    (23, 96): 'Renoir',
+    (23, 104): 'Lucienne',
+    (23, 113): 'Matisse',
+    (23, 144): 'VanGogh',
+    (23, 160): 'Mendocino',
+    (25, 33): 'Vermeer',
+    (25, 63): 'Rembrandt',
+    (25, 68): 'Rembrandt',
+    (25, 80): 'Cezanne_Barcelo',
+    (25, 97): 'Raphael',
+    (25, 116): 'PhoenixPoint',
+    (25, 117): 'HawkPoint',
+    (25, 120): 'PhoenixPoint2',
+    (26, 32): 'StrixPoint',
+    (26, 36): 'StrixPoint',
+    (26, 68): 'GraniteRidge',
+    (26, 96): 'StrixPoint2',
+    (26, 112): 'Sarlak',
+}
+# Families without an exact model entry
+FAMILY_FALLBACK = {26: 'GraniteRidge'}
+# Same silicon sold under a different codename, told apart by the model-number suffix
+VARIANTS = {
+    'Dali': [({'15e', '15Ce', '20e'}, 'Pollock')],
+    'Raphael': [({'HX', 'HX3D'}, 'DragonRange')],
+    'GraniteRidge': [({'HX', 'HX3D'}, 'FireRange')],
+}
+DESKTOP = {'SummitRidge', 'PinnacleRidge', 'Matisse', 'Vermeer', 'Raphael', 'GraniteRidge'}
+
+APU_CLASSES_PRE = {'U': 'U_e_Ce', 'e': 'U_e_Ce', 'Ce': 'U_e_Ce', 'H': 'H', 'HS': 'H', 'GE': 'GE', 'G': 'G'}
+APU_CLASSES_POST = {'U': 'U', 'HX': 'HX', 'HX3D': 'HX', 'HS': 'HS', 'H': 'H', 'GE': 'GE', 'G': 'G'}
+# Parts whose model number carries no suffix (Steam Deck, Ryzen AI)
+APU_DEFAULT_CLASS = {'VanGogh': 'U', 'StrixPoint': 'HS', 'StrixPoint2': 'HS', 'Sarlak': 'HX'}
+DESIGNATORS = {'U', 'H', 'HS', 'HX', 'G', 'GE'}
+DESKTOP_SUFFIXES = {'E', 'X', 'X3D'}
+
+MODEL_TOKEN = re.compile(r'^(\d{3,4})([A-Za-z][A-Za-z0-9]*)?$')
+
+def parse_signature(signature):
+    values = dict(re.findall(r'(Family|Model|Stepping)\s+(\d+)', signature))
+    if not {'Family', 'Model', 'Stepping'} <= values.keys():
+        return None
+    return int(values['Family']), int(values['Model']), int(values['Stepping'])
+
+def tokenize(cpu):
+    tokens = cpu.replace('(R)', ' ').replace('(TM)', ' ').split()
+    tier, number, suffix = None, None, ''
+    for index, token in enumerate(tokens):
+        if tier is None and token.isdigit() and len(token) == 1:
+            tier = token
+            continue
+        match = MODEL_TOKEN.match(token)
+        if match:
+            number, suffix = match.group(1), match.group(2) or ''
+            if not suffix and index and tokens[index - 1] in DESIGNATORS:
+                suffix = tokens[index - 1]
+            break
+    return tier, number, suffix
+
+def designator(suffix, known):
+    # The longest known designator the suffix starts with: XT counts as X and GT as G, while X3D and GE stay their own
+    matches = [candidate for candidate in known if suffix.startswith(candidate)]
+    return max(matches, key=len) if matches else ''
+
+def classify_codename(cpu, signature):
+    if 'Intel' in cpu:
+        return 'Intel', 'Intel', 'Intel'
+    parsed = parse_signature(signature)
+    if parsed is None:
+        return 'Unknown', 'Unknown', 'Unknown'
+    cpu_family, cpu_model, cpu_stepping = parsed
+    family = CODENAMES.get((cpu_family, cpu_model, cpu_stepping)) or CODENAMES.get((cpu_family, cpu_model)) or FAMILY_FALLBACK.get(cpu_family, 'Unknown')
+    _, number, suffix = tokenize(cpu)
+    for suffixes, variant in VARIANTS.get(family, []):
+        if suffix in suffixes or (number and any((number + suffix).endswith(s) for s in suffixes)):
+            family = variant
+            break
+    architecture = ARCHITECTURES.get(cpu_family, 'Unknown')
+    if family in DESKTOP:
+        cpu_type = 'Amd_Desktop_Cpu'
+    elif architecture == 'Unknown':
+        cpu_type = 'Unknown'
+    else:
+        cpu_type = 'Amd_Apu'
+    return architecture, family, cpu_type
+
+def classify_presets(cpu, family, cpu_type):
+    tier, _, suffix = tokenize(cpu)
+    rank = FAMILY_RANK.get(family, 0)
+    if cpu_type == 'Amd_Apu':
+        if rank < FAMILY_RANK['Matisse']:
+            cls = APU_CLASSES_PRE.get(designator(suffix, APU_CLASSES_PRE))
+            return f"AMDAPUPreMatisse_{cls}" if cls else "AMDCPU"
+        cls = APU_CLASSES_POST.get(designator(suffix, APU_CLASSES_POST)) or APU_DEFAULT_CLASS.get(family)
+        return f"AMDAPUPostMatisse_{cls}" if cls else "AMDCPU"
+    if cpu_type == 'Amd_Desktop_Cpu':
+        prefix = "AMDCPUPreRaphael" if rank < FAMILY_RANK['Raphael'] else "AMDCPU"
+        suffix = designator(suffix, DESKTOP_SUFFIXES)
+        if suffix == 'E':
+            return f"{prefix}_E"
+        if suffix == 'X3D':
+            return f"{prefix}_X3D"
+        if suffix == 'X':
+            return f"{prefix}_X9" if tier == '9' else f"{prefix}_X"
+        return prefix
+    return "AMDCPU"
@@ -0,0 +1,185 @@
+import os
+import time
+import fcntl
+import tempfile
+import threading
+from configparser import ConfigParser
+from contextlib import contextmanager
+
+class ConfigStore(ConfigParser):
+    def __init__(self, path, debounce=1.0):
+        self.mutex = threading.RLock()
+        self.dirty = set()
+        # Removed in memory since the last flush; merge_from_disk must not bring them back
+        self.removed = set()
+        self.removed_sections = set()
+        self.loading = False
+        super().__init__()
+        self.path = path
+        self.lock_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.lock")
+        self.debounce = debounce
+        self.depth = 0
+        self.last_flush = 0
+        self.timer = None
+
+    def match_owner(self, fd):
+        # A root process (the fleet agent, the daemon) must not leave files the user's session cannot
+        # read: copy config.ini's owner and mode, or the folder's owner and 0644 when there is none yet
+        try:
+            reference, mode = os.stat(self.path), None
+        except FileNotFoundError:
+            reference, mode = os.stat(os.path.dirname(self.path) or '.'), 0o644
+        try:
+            os.fchown(fd, reference.st_uid, reference.st_gid)
+        except PermissionError:
+            # Only root can give a file away, and anyone else already owns what they create
+            pass
+        os.fchmod(fd, mode if mode is not None else reference.st_mode & 0o7777)
+
+    @contextmanager
+    def file_lock(self, mode):
+        try:
+            fd = os.open(self.lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            self.match_owner(fd)
+        except FileExistsError:
+            # flock works on a read-only descriptor, so a lock file owned by someone else still serves
+            fd = os.open(self.lock_path, os.O_RDONLY)
+        with os.fdopen(fd) as lock_file:
+            fcntl.flock(lock_file, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self):
+        with self.mutex, self.file_lock(fcntl.LOCK_SH):
+            self.read(self.path)
+        return self
+
+    def set(self, section, option, value=None):
+        with self.mutex:
+            unchanged = self.has_section(section) and self.get(section, option, raw=True, fallback=None) == value
+            super().set(section, option, value)
+            # ConfigParser calls set() while reading too; only real user changes are dirty
+            if not self.loading and not unchanged:
+                self.dirty.add((section, self.optionxform(option)))
+
+    def remove_option(self, section, option):
+        with self.mutex:
+            removed = super().remove_option(section, option)
+            if removed and not self.loading:
+                key = (section, self.optionxform(option))
+                self.removed.add(key)
+                self.dirty.discard(key)
+            return removed
+
+    def remove_section(self, section):
+        with self.mutex:
+            removed = super().remove_section(section)
+            if removed and not self.loading:
+                self.removed_sections.add(section)
+                self.dirty = {key for key in self.dirty if key[0] != section}
+            return removed
+
+    def reset(self):
+        # Forget everything, on disk and in memory; whatever is set afterwards is written as new
+        with self.mutex, self.file_lock(fcntl.LOCK_EX):
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.loading = True
+            try:
+                for section in self.sections():
+                    super().remove_section(section)
+            finally:
+                self.loading = False
+            self.dirty.clear()
+            self.removed.clear()
+            self.removed_sections.clear()
+
+    def pending(self):
+        # A missing file counts as unsaved, or setting the values it held would never recreate it
+        return bool(self.dirty or self.removed or self.removed_sections or
+                    (self.sections() and not os.path.exists(self.path)))
+
+    def read(self, filenames, encoding=None):
+        self.loading = True
+        try:
+            return super().read(filenames, encoding)
+        finally:
+            self.loading = False
+
+    @contextmanager
+    def transaction(self):
+        with self.mutex:
+            self.depth += 1
+            try:
+                yield self
+            finally:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.flush()
+
+    def save(self):
+        with self.mutex:
+            if self.depth or not self.pending():
+                return
+            wait = self.last_flush + self.debounce - time.monotonic()
+            if wait <= 0:
+                self.flush()
+            elif self.timer is None:
+                self.timer = threading.Timer(wait, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def merge_from_disk(self):
+        # Keep changes other processes made to keys this process has not touched
+        disk = ConfigParser()
+        disk.read(self.path)
+        self.loading = True
+        try:
+            for section in disk.sections():
+                if section in self.removed_sections:
+                    continue
+                if not self.has_section(section):
+                    self.add_section(section)
+                for option, value in disk.items(section, raw=True):
+                    if (section, option) not in self.dirty and (section, option) not in self.removed:
+                        super().set(section, option, value)
+        finally:
+            self.loading = False
+
+    def flush(self):
+        with self.mutex:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.pending():
+                return
+            with self.file_lock(fcntl.LOCK_EX):
+                self.merge_from_disk()
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix='.config-', suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'w') as tmp_file:
+                        self.match_owner(tmp_file.fileno())
+                        self.write(tmp_file)
+                        tmp_file.flush()
+                        os.fsync(tmp_file.fileno())
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+                dir_fd = os.open(os.path.dirname(self.path), os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            self.dirty.clear()
+            self.removed.clear()
+            self.removed_sections.clear()
+            self.last_flush = time.monotonic()
@@ -0,0 +1,94 @@
+import sys
+import asyncio
+import logging
+import selectors
+
+# Seconds before the next tick when the handler failed before returning an interval of its own
+RETRY_INTERVAL = 30
+
+class ReapplyEngine:
+    def __init__(self, handler, stdin=sys.stdin):
+        self.handler = handler
+        self.stdin = stdin
+        self.sources = []
+        self.pending = []
+        self.loop = None
+        self.wakeup = None
+
+    def add_source(self, source, callback):
+        # callback runs when source is readable and may return a command for the handler
+        self.sources.append((source, callback))
+
+    def post(self, command):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.push, command)
+        else:
+            self.pending.append(command)
+
+    def stop(self):
+        self.post('stop')
+
+    def push(self, command):
+        self.pending.append(command)
+        self.wakeup.set()
+
+    def on_stdin(self):
+        line = self.stdin.readline()
+        if not line:
+            self.loop.remove_reader(self.stdin)
+        elif line.lower().strip() == 'b':
+            self.push('stop')
+
+    def on_source(self, callback):
+        command = callback()
+        if command:
+            self.push(command)
+
+    def handle(self, command, interval):
+        try:
+            return self.handler(command)
+        except Exception:
+            # One failed tick must not end auto reapply; try again after the last interval
+            logging.exception(f"Reapply failed ({command!r})")
+            return interval
+
+    async def main(self):
+        self.loop = asyncio.get_running_loop()
+        self.wakeup = asyncio.Event()
+        if self.pending:
+            self.wakeup.set()
+        readers = [(self.stdin, self.on_stdin)] if self.stdin is not None else []
+        readers += [(source, lambda callback=callback: self.on_source(callback)) for source, callback in self.sources]
+        for source, callback in readers:
+            self.loop.add_reader(source, callback)
+        try:
+            commands = [None]
+            interval = RETRY_INTERVAL
+            while True:
+                # Every command reaches the handler in posting order (a profile switch must not be lost
+                # behind a power event); only back-to-back repeats of the same command are merged
+                for index, command in enumerate(commands):
+                    if index == 0 or command != commands[index - 1]:
+                        interval = self.handle(command, interval)
+                try:
+                    # Sleep until the timer expires or something posts a command; nothing polls in between
+                    await asyncio.wait_for(self.wakeup.wait(), interval)
+                except asyncio.TimeoutError:
+                    commands = [None]
+                    continue
+                self.wakeup.clear()
+                commands, self.pending = self.pending or [None], []
+                if 'stop' in commands:
+                    break
+        finally:
+            for source, _ in readers:
+                self.loop.remove_reader(source)
+            self.loop = None
+
+    def run(self):
+        # SelectSelector works with ttys on macOS, where kqueue does not
+        loop = asyncio.SelectorEventLoop(selectors.SelectSelector())
+        try:
+            loop.run_until_complete(self.main())
+        finally:
+            loop.close()
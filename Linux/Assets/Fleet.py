@@ -0,0 +1,297 @@
+import os
+import json
+import hmac
+import time
+import signal
+import socket
+import secrets
+import hashlib
+import threading
+import socketserver
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from Assets.CLI import UsageError, read_smu, read_daemon_pid
+
+PORT = 9878
+TIMEOUT = 30
+MAX_MESSAGE = 1 << 20
+
+class AuthError(Exception):
+    pass
+
+def sign(key, nonce, kind, payload):
+    # Bound to the connection's nonce and the direction, so neither side's messages can be replayed
+    body = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hmac.new(key, f"{nonce}\n{kind}\n{body}".encode(), hashlib.sha256).hexdigest()
+
+def verified(key, nonce, kind, message):
+    payload = message.get(kind)
+    return isinstance(payload, dict) and hmac.compare_digest(str(message.get('mac', '')), sign(key, nonce, kind, payload))
+
+def read_message(stream):
+    line = stream.readline(MAX_MESSAGE)
+    if not line.endswith(b'\n'):
+        raise ValueError("connection closed or message too long")
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("malformed message")
+    return message
+
+def write_message(stream, message):
+    stream.write(json.dumps(message).encode() + b'\n')
+    stream.flush()
+
+def parse_host(text, port=PORT):
+    # host, host:port, an IPv6 address, or [IPv6]:port
+    text = text.strip()
+    if text.startswith('['):
+        host, bracket, rest = text[1:].partition(']')
+        host_port = rest[1:] if rest.startswith(':') else None
+        if not bracket or not host or (rest and host_port is None):
+            raise UsageError(f"Bad host {text!r}, expected host, host:port or [address]:port")
+    elif text.count(':') == 1:
+        host, _, host_port = text.partition(':')
+    else:
+        host, host_port = text, None
+    try:
+        return (host, int(host_port) if host_port else port)
+    except ValueError:
+        raise UsageError(f"Bad host {text!r}, expected host, host:port or [address]:port")
+
+def format_host(host):
+    return f"[{host[0]}]:{host[1]}" if ':' in host[0] else f"{host[0]}:{host[1]}"
+
+def parse_key(text):
+    try:
+        if len(text) < 32:
+            raise ValueError
+        return bytes.fromhex(text)
+    except ValueError:
+        raise UsageError("The fleet key must be at least 16 bytes, written as hex")
+
+def load_key(cfg, create=False):
+    # Shared secret every agent and the controller hold; the agent creates one on first start
+    key = cfg.get('Fleet', 'Key', fallback='')
+    if not key and create:
+        key = secrets.token_hex(32)
+        if not cfg.has_section('Fleet'):
+            cfg.add_section('Fleet')
+        cfg.set('Fleet', 'Key', key)
+        cfg.flush()
+    if not key:
+        raise UsageError("No [Fleet] key in config.ini; start an agent once to create one, then copy it")
+    return parse_key(key)
+
+class Agent:
+    # Applies presets for a controller. It remembers the previous apply, so one rollback step
+    # restores what ran before, even after an apply that failed halfway through the limits. A
+    # successful apply or rollback is saved as the mode in config.ini and a running daemon is told
+    # to reload, so its next reapply keeps the pushed preset instead of overwriting it.
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.lock = threading.Lock()
+        mode = ctx.cfg.get('User', 'Mode', fallback='')
+        try:
+            self.current = (mode, ctx.resolve(mode)) if mode else None
+        except UsageError:
+            self.current = None
+        self.previous = None
+
+    def handle(self, request):
+        command = request.get('command')
+        try:
+            if command == 'status':
+                return self.status()
+            if command == 'apply':
+                return self.apply(request)
+            if command == 'rollback':
+                return self.rollback()
+        except (UsageError, OSError, ValueError) as e:
+            return {'ok': False, 'error': str(e)}
+        return {'ok': False, 'error': f"unknown command {command!r}"}
+
+    def run(self, label, argv):
+        result = self.ctx.ryzenadj_run(argv)
+        error = (result.stderr.strip() or f"ryzenadj exited with {result.returncode}") if result.returncode != 0 else None
+        return {'ok': result.returncode == 0, 'applied': label, 'error': error}
+
+    def apply(self, request):
+        if request.get('args'):
+            label, argv = 'Custom', tuple(str(request['args']).split())
+        elif request.get('mode'):
+            label = str(request['mode'])
+            argv = self.ctx.resolve(label)
+        else:
+            return {'ok': False, 'error': "apply needs a mode or args"}
+        with self.lock:
+            response = self.run(label, argv)
+            self.previous, self.current = self.current, (label, argv)
+            response['previous'] = self.previous[0] if self.previous else None
+            if response['ok']:
+                self.persist(label, argv)
+            return response
+
+    def rollback(self):
+        with self.lock:
+            if self.previous is None:
+                return {'ok': False, 'error': "nothing to roll back to"}
+            label, argv = self.previous
+            response = self.run(label, argv)
+            if response['ok']:
+                self.current, self.previous = self.previous, None
+                self.persist(label, argv)
+            return response
+
+    def persist(self, label, argv):
+        cfg = self.ctx.cfg
+        with cfg.transaction():
+            cfg.set('User', 'Mode', label)
+            if label == 'Custom':
+                cfg.set('User', 'CustomArgs', ' '.join(argv))
+        pid = read_daemon_pid(self.ctx.pid_path)
+        if pid:
+            try:
+                os.kill(pid, signal.SIGHUP)
+            except OSError:
+                pass
+
+    def status(self):
+        limits, _, error = read_smu(self.ctx, self.ctx.ryzenadj_run)
+        return {
+            'ok': error is None,
+            'hostname': socket.gethostname(),
+            'version': self.ctx.version,
+            'preset': self.ctx.preset_class(),
+            'mode': self.current[0] if self.current else None,
+            'limits': limits,
+            'error': error,
+        }
+
+class AgentHandler(socketserver.StreamRequestHandler):
+    timeout = TIMEOUT
+
+    def handle(self):
+        nonce = secrets.token_hex(16)
+        try:
+            write_message(self.wfile, {'nonce': nonce})
+            message = read_message(self.rfile)
+        except (OSError, ValueError):
+            return
+        if not verified(self.server.key, nonce, 'request', message):
+            write_message(self.wfile, {'error': "authentication failed"})
+            return
+        response = self.server.agent.handle(message['request'])
+        write_message(self.wfile, {'response': response, 'mac': sign(self.server.key, nonce, 'response', response)})
+
+class AgentServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, agent, key, address):
+        self.agent = agent
+        self.key = key
+        if ':' in address[0]:
+            self.address_family = socket.AF_INET6
+        super().__init__(address, AgentHandler)
+
+def request(address, key, payload, timeout=TIMEOUT):
+    with socket.create_connection(address, timeout) as sock, sock.makefile('rwb') as stream:
+        nonce = read_message(stream)['nonce']
+        write_message(stream, {'request': payload, 'mac': sign(key, nonce, 'request', payload)})
+        message = read_message(stream)
+        if not verified(key, nonce, 'response', message):
+            raise AuthError(message.get('error') or "response signature mismatch")
+        return message['response']
+
+class Controller:
+    def __init__(self, hosts, key, parallel=8, timeout=TIMEOUT):
+        self.hosts = hosts
+        self.key = key
+        self.parallel = max(1, parallel)
+        self.timeout = timeout
+
+    def call(self, host, payload):
+        start = time.monotonic()
+        try:
+            response = request(host, self.key, payload, self.timeout)
+        except (OSError, ValueError, KeyError, AuthError) as e:
+            response = {'ok': False, 'error': str(e) if isinstance(e, AuthError) else f"unreachable: {e}"}
+        return dict(response, host=format_host(host), seconds=round(time.monotonic() - start, 3))
+
+    def fan_out(self, hosts, payload):
+        if not hosts:
+            return []
+        with ThreadPoolExecutor(min(self.parallel, len(hosts))) as pool:
+            return list(pool.map(lambda host: self.call(host, payload), hosts))
+
+    def status(self):
+        results = self.fan_out(self.hosts, {'command': 'status'})
+        for result in results:
+            result['result'] = 'ok' if result['ok'] else 'failed'
+        return results
+
+    def rollback(self):
+        results = self.fan_out(self.hosts, {'command': 'rollback'})
+        for result in results:
+            result['result'] = 'rolled back' if result['ok'] else 'failed'
+        return results
+
+    def rollout(self, payload, canary=1, max_failures=0):
+        # Canaries first; any canary failure stops the rollout. The rest go out at most `parallel`
+        # at a time, and nothing new starts once more than `max_failures` hosts have failed. An
+        # aborted rollout rolls back every host it touched; otherwise only the hosts that failed.
+        canaries, remaining = self.hosts[:canary], list(self.hosts[canary:])
+        results = self.fan_out(canaries, payload)
+        for result in results:
+            result['phase'] = 'canary'
+        aborted = not all(result['ok'] for result in results)
+        failures = 0
+        with ThreadPoolExecutor(self.parallel) as pool:
+            running = set()
+            while not aborted and (remaining or running):
+                while remaining and len(running) < self.parallel:
+                    running.add(pool.submit(self.call, remaining.pop(0), payload))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = dict(future.result(), phase='rollout')
+                    results.append(result)
+                    failures += not result['ok']
+                aborted = failures > max_failures
+            for future in running:
+                results.append(dict(future.result(), phase='rollout'))
+        results += [{'host': format_host(host), 'phase': 'rollout', 'ok': False, 'result': 'skipped'} for host in remaining]
+        # Only hosts whose agent ran ryzenadj changed anything; unreachable ones have nothing to undo
+        touched = [result for result in results if 'applied' in result and (aborted or not result['ok'])]
+        reverted = self.fan_out([parse_host(result['host']) for result in touched], {'command': 'rollback'})
+        for result, rollback in zip(touched, reverted):
+            result['result'] = ('' if result['ok'] else 'failed, ') + ('rolled back' if rollback['ok'] else 'rollback failed')
+            if not rollback['ok']:
+                result['rollback_error'] = rollback['error']
+        for result in results:
+            result.setdefault('result', 'applied' if result['ok'] else 'failed')
+        order = {format_host(host): index for index, host in enumerate(self.hosts)}
+        return sorted(results, key=lambda result: order[result['host']]), aborted
+
+def summarize(results):
+    summary = {}
+    for result in results:
+        summary[result['result']] = summary.get(result['result'], 0) + 1
+    return summary
+
+def format_report(results, aborted=False):
+    lines = [f"{'HOST':<24} {'PHASE':<8} {'RESULT':<24} DETAIL"]
+    for result in results:
+        detail = result.get('error') or ''
+        if result.get('applied'):
+            detail = f"{result['applied']}" + (f" (was {result['previous']})" if result.get('previous') else '') + (f"; {detail}" if detail else '')
+        elif result.get('mode') is not None or result.get('limits'):
+            limits = result.get('limits') or {}
+            detail = f"{result.get('hostname', '')} {result.get('mode') or '-'} ({result.get('preset') or '-'})" + \
+                     (f", STAPM {limits['stapm-limit'] / 1000:g} W" if 'stapm-limit' in limits else '')
+        if result.get('rollback_error'):
+            detail += f"; rollback: {result['rollback_error']}"
+        if 'seconds' in result:
+            detail += f" [{result['seconds']:.2f} s]"
+        lines.append(f"{result['host']:<24} {result.get('phase', '-'):<8} {result['result']:<24} {detail.strip()}")
+    summary = '; '.join(f"{count} {name}" for name, count in summarize(results).items())
+    lines.append(f"Summary: {summary}" + (" (rollout aborted)" if aborted else ''))
+    return '\n'.join(lines)
@@ -0,0 +1,135 @@
+import os
+import re
+import subprocess
+from collections import namedtuple
+
+SYSFS_ROOT = '/sys/class/power_supply'
+ADAPTER_TYPES = {'Mains', 'USB', 'USB_C', 'USB_PD', 'USB_PD_DRP', 'Wireless'}
+ATTRIBUTES = ['online', 'status', 'capacity', 'power_now', 'current_now', 'voltage_now', 'energy_now', 'energy_full']
+
+PowerStatus = namedtuple('PowerStatus', ['status', 'capacity', 'power_now', 'adapter', 'on_ac'])
+
+class PowerSupply:
+    def __init__(self, root=SYSFS_ROOT):
+        self.root = root
+        self.devices = {}
+        self.scan()
+        if not self.devices:
+            raise OSError(f"No power supplies under {root}")
+
+    def scan(self):
+        self.close()
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name)
+            try:
+                with open(os.path.join(path, 'type')) as f:
+                    kind = f.read().strip()
+            except OSError:
+                continue
+            fds = {}
+            for attribute in ATTRIBUTES:
+                try:
+                    fds[attribute] = os.open(os.path.join(path, attribute), os.O_RDONLY)
+                except OSError:
+                    continue
+            self.devices[name] = (kind, fds)
+
+    def read(self, fds, attribute):
+        if attribute not in fds:
+            return None
+        # sysfs regenerates the value on every read from offset 0, so the fd can stay open
+        return os.pread(fds[attribute], 64, 0).decode().strip()
+
+    def read_int(self, fds, attribute):
+        value = self.read(fds, attribute)
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def snapshot(self):
+        try:
+            return self.aggregate()
+        except OSError:
+            # A battery or adapter was hot-unplugged under us
+            self.scan()
+            return self.aggregate()
+
+    def states(self):
+        # Per supply (online, status) as the kernel spells them in uevents, e.g. ('1', None) or (None, 'Charging')
+        read = lambda: {name: (self.read(fds, 'online'), self.read(fds, 'status')) for name, (_, fds) in self.devices.items()}
+        try:
+            return read()
+        except OSError:
+            self.scan()
+            return read()
+
+    def aggregate(self):
+        adapter = None
+        has_adapter = False
+        statuses, capacities, energy_now, energy_full, power = [], [], 0, 0, 0.0
+        for name, (kind, fds) in self.devices.items():
+            if kind in ADAPTER_TYPES:
+                has_adapter = True
+                if adapter is None and self.read_int(fds, 'online') == 1:
+                    adapter = name
+            elif kind == 'Battery':
+                statuses.append(self.read(fds, 'status') or 'Unknown')
+                capacity = self.read_int(fds, 'capacity')
+                if capacity is not None:
+                    capacities.append(capacity)
+                now, full = self.read_int(fds, 'energy_now'), self.read_int(fds, 'energy_full')
+                if now is not None and full:
+                    energy_now += now
+                    energy_full += full
+                power_now = self.read_int(fds, 'power_now')
+                if power_now is None:
+                    current, voltage = self.read_int(fds, 'current_now'), self.read_int(fds, 'voltage_now')
+                    power_now = current * voltage / 1e6 if current is not None and voltage is not None else 0
+                power += abs(power_now) / 1e6
+        if 'Charging' in statuses:
+            status = 'Charging'
+        elif 'Discharging' in statuses:
+            status = 'Discharging'
+        else:
+            status = statuses[0] if statuses else 'Unknown'
+        if energy_full:
+            capacity = round(energy_now * 100 / energy_full)
+        else:
+            capacity = round(sum(capacities) / len(capacities)) if capacities else None
+        on_ac = adapter is not None if has_adapter else status != 'Discharging'
+        return PowerStatus(status, capacity, round(power, 3), adapter, on_ac)
+
+    def close(self):
+        for _, fds in self.devices.values():
+            for fd in fds.values():
+                os.close(fd)
+        self.devices = {}
+
+class UPowerSupply:
+    DEVICE = '/org/freedesktop/UPower/devices/DisplayDevice'
+
+    def scan(self):
+        pass
+
+    def states(self):
+        return {}
+
+    def snapshot(self):
+        output = subprocess.check_output(["upower", "-i", self.DEVICE]).decode("utf-8")
+        fields = dict(re.findall(r'^\s*([\w -]+?):\s+(.+?)\s*$', output, re.MULTILINE))
+        state = fields.get('state', 'unknown').lower()
+        status = {'charging': 'Charging', 'discharging': 'Discharging', 'fully-charged': 'Full'}.get(state, 'Unknown')
+        capacity = re.match(r'[\d.]+', fields.get('percentage', ''))
+        rate = re.match(r'[\d.]+', fields.get('energy-rate', ''))
+        return PowerStatus(status, round(float(capacity.group())) if capacity else None,
+                           float(rate.group()) if rate else 0.0, None, status != 'Discharging')
+
+    def close(self):
+        pass
+
+def open_power_supply(root=SYSFS_ROOT):
+    try:
+        return PowerSupply(root)
+    except OSError:
+        return UPowerSupply()
@@ -0,0 +1,188 @@
+import os
+import sys
+import socket
+import struct
+import threading
+import subprocess
+
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+NLMSG_DONE = 3
+NLMSG_HEADER = struct.Struct('=IHHII')
+CN_MSG = struct.Struct('=IIIIHH')
+PROC_EVENT = struct.Struct('=IIQII')
+SCAN_INTERVAL = 2
+
+def read_name(pid, root='/proc'):
+    # argv[0] survives the 15-character comm truncation; kernel threads only have comm
+    try:
+        with open(os.path.join(root, str(pid), 'cmdline'), 'rb') as f:
+            argv0 = f.read(4096).split(b'\0', 1)[0]
+        if argv0:
+            return os.path.basename(argv0.decode(errors='replace'))
+        with open(os.path.join(root, str(pid), 'comm')) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+class ProcConnector:
+    # Kernel process events over netlink: nothing is read until a process execs or exits.
+    # Subscribing needs CAP_NET_ADMIN, so this is only available when running as root.
+    def __init__(self, root='/proc'):
+        self.root = root
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            self.sock.bind((os.getpid(), CN_IDX_PROC))
+            payload = struct.pack('=I', PROC_CN_MCAST_LISTEN)
+            message = CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+            self.sock.send(NLMSG_HEADER.pack(NLMSG_HEADER.size + len(message), NLMSG_DONE, 0, 0, os.getpid()) + message)
+        except OSError:
+            self.sock.close()
+            raise
+        self.seeded = False
+
+    def events(self, timeout):
+        if not self.seeded:
+            # Processes that were already running when we subscribed
+            self.seeded = True
+            return ProcScanner(self.root).events(0)
+        self.sock.settimeout(timeout)
+        try:
+            data = self.sock.recv(65536)
+        except socket.timeout:
+            return []
+        events = []
+        offset = 0
+        while offset + NLMSG_HEADER.size <= len(data):
+            length = NLMSG_HEADER.unpack_from(data, offset)[0]
+            body = offset + NLMSG_HEADER.size + CN_MSG.size
+            if length < NLMSG_HEADER.size or body + PROC_EVENT.size > len(data):
+                break
+            what, _, _, pid, tgid = PROC_EVENT.unpack_from(data, body)
+            # Thread exits arrive too; only whole processes (pid == tgid) matter
+            if pid == tgid:
+                if what == PROC_EVENT_EXEC:
+                    events.append(('exec', pid, read_name(pid, self.root)))
+                elif what == PROC_EVENT_EXIT:
+                    events.append(('exit', pid, None))
+            offset += (length + 3) & ~3
+        return events
+
+    def close(self):
+        self.sock.close()
+
+class ProcScanner:
+    # Fallback: diff the pid list between scans and only read names for new pids
+    def __init__(self, root='/proc', interval=SCAN_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.pids = set()
+        self.wakeup = threading.Event()
+
+    def scan(self):
+        return {int(entry.name) for entry in os.scandir(self.root) if entry.name.isdigit()}
+
+    def events(self, timeout):
+        if self.pids:
+            self.wakeup.wait(min(timeout, self.interval))
+        pids = self.scan()
+        events = [('exit', pid, None) for pid in self.pids - pids]
+        events += [('exec', pid, read_name(pid, self.root)) for pid in sorted(pids - self.pids)]
+        self.pids = pids
+        return events
+
+    def close(self):
+        self.wakeup.set()
+
+class PsScanner(ProcScanner):
+    # macOS has no /proc; one ps call per scan gives pids and executable paths together
+    def scan(self):
+        output = subprocess.run(["ps", "-axo", "pid=,comm="], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout.decode(errors='replace')
+        self.names = {}
+        for line in output.splitlines():
+            pid, _, command = line.strip().partition(' ')
+            if pid.isdigit():
+                self.names[int(pid)] = os.path.basename(command.strip())
+        return set(self.names)
+
+    def events(self, timeout):
+        if self.pids:
+            self.wakeup.wait(min(timeout, self.interval))
+        pids = self.scan()
+        events = [('exit', pid, None) for pid in self.pids - pids]
+        events += [('exec', pid, self.names.get(pid)) for pid in sorted(pids - self.pids)]
+        self.pids = pids
+        return events
+
+def open_process_source(root='/proc'):
+    if sys.platform == 'darwin':
+        return PsScanner()
+    try:
+        return ProcConnector(root)
+    except OSError:
+        return ProcScanner(root)
+
+class ProfileTracker:
+    # The most recently started profiled process decides the preset; when it exits the next
+    # most recent one still running takes over, and with none left the profile ends (None)
+    def __init__(self, profiles):
+        self.profiles = {name.lower(): mode for name, mode in profiles.items()}
+        self.running = {}
+        self.order = 0
+        self.current = None
+
+    def update(self, events):
+        for kind, pid, name in events:
+            mode = self.profiles.get(name.lower()) if kind == 'exec' and name else None
+            if mode:
+                self.order += 1
+                self.running[pid] = (self.order, mode, name)
+            else:
+                # exit, or an exec that replaced a profiled image with something else
+                self.running.pop(pid, None)
+        wanted = max(self.running.values())[1] if self.running else None
+        changed = wanted != self.current
+        self.current = wanted
+        return changed
+
+    @property
+    def trigger(self):
+        # Executable name behind the current profile
+        return max(self.running.values())[2] if self.running else None
+
+class ProcessWatcher:
+    # callback(mode, executable) runs on the watcher thread whenever the wanted profile changes;
+    # mode is None once no profiled process is left
+    def __init__(self, profiles, callback, source=None):
+        self.tracker = ProfileTracker(profiles)
+        self.callback = callback
+        self.source = source
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def loop(self):
+        while not self.stopping.is_set():
+            try:
+                events = self.source.events(1)
+            except OSError:
+                continue
+            if self.tracker.update(events):
+                self.callback(self.tracker.current, self.tracker.trigger)
+
+    def start(self):
+        if self.source is None:
+            self.source = open_process_source()
+        self.thread = threading.Thread(target=self.loop, name='profiles', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        self.source.close()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
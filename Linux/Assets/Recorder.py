@@ -0,0 +1,224 @@
+import os
+import sys
+import csv
+import mmap
+import math
+import time
+import glob
+import struct
+import zlib
+import threading
+from Assets.Telemetry import CHANNEL_NAMES
+
+MAGIC = b'UXTL'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+HEADER_SIZE = 1024
+SEGMENT_SIZE = 4 * 1024 * 1024
+MAX_SEGMENTS = 64
+FLUSH_INTERVAL = 30
+
+class Segment:
+    # Fixed-size file: a header naming the channels, then fixed-size records of
+    # timestamp, values and a CRC32. Unwritten space is zero, which never passes the CRC.
+    def __init__(self, path, channels=None, size=SEGMENT_SIZE, writable=False):
+        self.path = path
+        self.file = open(path, 'r+b' if writable else 'rb')
+        if channels is not None and os.fstat(self.file.fileno()).st_size == 0:
+            self.file.truncate(size)
+            header = HEADER.pack(MAGIC, FORMAT_VERSION, len(channels), 0) + '\n'.join(channels).encode()
+            if len(header) > HEADER_SIZE:
+                raise ValueError("Too many telemetry channels for the segment header")
+            self.file.write(header)
+            self.file.flush()
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        magic, version, width, _ = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path}: not a telemetry log")
+        self.channels = self.map[HEADER.size:HEADER_SIZE].rstrip(b'\0').decode().split('\n')[:width]
+        self.record = struct.Struct(f'<d{width}dI')
+        self.capacity = (len(self.map) - HEADER_SIZE) // self.record.size
+        self.count = self.valid_prefix()
+
+    def offset(self, index):
+        return HEADER_SIZE + index * self.record.size
+
+    def read(self, index):
+        fields = self.record.unpack_from(self.map, self.offset(index))
+        if zlib.crc32(self.map[self.offset(index):self.offset(index) + self.record.size - 4]) != fields[-1] or not fields[0]:
+            return None
+        return fields[0], fields[1:-1]
+
+    def valid_prefix(self):
+        # Records are written in order, so the written region is a prefix: binary search for its end
+        low, high = 0, self.capacity
+        while low < high:
+            middle = (low + high) // 2
+            if self.read(middle) is None:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def timestamp(self, index):
+        return struct.unpack_from('<d', self.map, self.offset(index))[0]
+
+    def find(self, timestamp):
+        # First record at or after timestamp
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamp(middle) < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def append(self, timestamp, values):
+        if self.count >= self.capacity:
+            return False
+        packed = self.record.pack(timestamp, *values, 0)
+        packed = packed[:-4] + struct.pack('<I', zlib.crc32(packed[:-4]))
+        self.map[self.offset(self.count):self.offset(self.count) + self.record.size] = packed
+        self.count += 1
+        return True
+
+    def records(self, start=None, end=None):
+        index = self.find(start) if start is not None else 0
+        while index < self.count:
+            record = self.read(index)
+            if record is None or (end is not None and record[0] > end):
+                return
+            yield record
+            index += 1
+
+    def flush(self):
+        self.map.flush()
+
+    def close(self):
+        if not self.map.closed:
+            self.map.close()
+        self.file.close()
+
+def segment_name(timestamp):
+    # Named by their first timestamp, so a time range maps to segments without opening them
+    return f"telemetry-{int(timestamp * 1000):015d}.bin"
+
+def segment_start(path):
+    return int(os.path.basename(path)[10:-4]) / 1000
+
+class TelemetryLog:
+    def __init__(self, directory, channels=CHANNEL_NAMES, segment_size=SEGMENT_SIZE, max_segments=MAX_SEGMENTS):
+        self.directory = directory
+        self.channels = list(channels)
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.segment = None
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+
+    def segments(self):
+        return sorted(glob.glob(os.path.join(self.directory, 'telemetry-*.bin')))
+
+    def open_segment(self, timestamp):
+        paths = self.segments()
+        if paths and self.segment is None:
+            # Resume the newest segment after a restart or crash if it has the same layout and room left
+            try:
+                segment = Segment(paths[-1], writable=True)
+                if segment.channels == self.channels and segment.count < segment.capacity:
+                    return segment
+                segment.close()
+            except (OSError, ValueError):
+                pass
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, segment_name(timestamp))
+        for stale in paths[:max(0, len(paths) + 1 - self.max_segments)]:
+            os.remove(stale)
+        open(path, 'ab').close()
+        return Segment(path, self.channels, self.segment_size, writable=True)
+
+    def append(self, timestamp, values):
+        with self.lock:
+            if self.segment is None or not self.segment.append(timestamp, values):
+                if self.segment is not None:
+                    self.segment.close()
+                self.segment = self.open_segment(timestamp)
+                self.segment.append(timestamp, values)
+            # Page cache already survives a process crash; msync now and then bounds loss on power failure
+            if time.monotonic() - self.last_flush >= FLUSH_INTERVAL:
+                self.segment.flush()
+                self.last_flush = time.monotonic()
+
+    def read(self, start=None, end=None):
+        # Yields (timestamp, {channel: value}) across segments, oldest first
+        paths = self.segments()
+        starts = [segment_start(path) for path in paths]
+        for i, path in enumerate(paths):
+            if end is not None and starts[i] > end:
+                break
+            if start is not None and i + 1 < len(paths) and starts[i + 1] <= start:
+                continue
+            try:
+                segment = Segment(path)
+            except (OSError, ValueError):
+                continue
+            try:
+                for timestamp, values in segment.records(start, end):
+                    yield timestamp, dict(zip(segment.channels, values))
+            finally:
+                segment.close()
+
+    def close(self):
+        with self.lock:
+            if self.segment is not None:
+                self.segment.flush()
+                self.segment.close()
+                self.segment = None
+
+def export_csv(log, output, start=None, end=None):
+    writer = csv.writer(output)
+    writer.writerow(['timestamp'] + log.channels)
+    rows = 0
+    for timestamp, values in log.read(start, end):
+        writer.writerow([f"{timestamp:.3f}"] + ['' if math.isnan(values.get(name, math.nan)) else f"{values[name]:g}" for name in log.channels])
+        rows += 1
+    return rows
+
+def export_parquet(log, path, start=None, end=None, batch=65536):
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip3 install pyarrow)")
+    schema = pyarrow.schema([('timestamp', pyarrow.float64())] + [(name, pyarrow.float64()) for name in log.channels])
+    rows = 0
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        columns = {name: [] for name in schema.names}
+        for timestamp, values in log.read(start, end):
+            columns['timestamp'].append(timestamp)
+            for name in log.channels:
+                columns[name].append(values.get(name, math.nan))
+            rows += 1
+            if len(columns['timestamp']) >= batch:
+                writer.write_table(pyarrow.table(columns, schema=schema))
+                columns = {name: [] for name in schema.names}
+        if columns['timestamp']:
+            writer.write_table(pyarrow.table(columns, schema=schema))
+    return rows
+
+if __name__ == "__main__":
+    # From the install folder: python3 -m Assets.Recorder Logs/Telemetry [--format csv|parquet]
+    #   [--since epoch] [--until epoch] [--output path]
+    args = dict(zip(sys.argv[2::2], sys.argv[3::2]))
+    log = TelemetryLog(sys.argv[1])
+    since = float(args['--since']) if '--since' in args else None
+    until = float(args['--until']) if '--until' in args else None
+    if args.get('--format', 'csv') == 'parquet':
+        export_parquet(log, args.get('--output', 'telemetry.parquet'), since, until)
+    elif '--output' in args:
+        with open(args['--output'], 'w', newline='') as f:
+            export_csv(log, f, since, until)
+    else:
+        export_csv(log, sys.stdout, since, until)
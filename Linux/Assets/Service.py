@@ -0,0 +1,120 @@
+import os
+import time
+import signal
+import socket
+from Assets.CLI import UsageError, write_boot_argv
+from Assets.Engine import ReapplyEngine
+
+class Notifier:
+    # sd_notify(3) without libsystemd: newline-separated KEY=VALUE datagrams to $NOTIFY_SOCKET. A no-op
+    # when not started by a Type=notify unit, so the daemon also runs by hand.
+    def __init__(self, environ=os.environ):
+        path = environ.get('NOTIFY_SOCKET', '')
+        # '@' names a socket in the abstract namespace
+        self.address = '\0' + path[1:] if path.startswith('@') else path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM | socket.SOCK_CLOEXEC) if self.address else None
+        usec = environ.get('WATCHDOG_USEC', '')
+        pid = environ.get('WATCHDOG_PID', '')
+        # Ping at half the timeout, as systemd recommends; the watchdog is meant for this process only
+        self.watchdog = int(usec) / 2e6 if usec.isdigit() and int(usec) > 0 and (not pid or pid == str(os.getpid())) else None
+
+    def send(self, *fields):
+        if self.sock is None:
+            return False
+        try:
+            self.sock.sendto('\n'.join(fields).encode(), self.address)
+            return True
+        except OSError:
+            return False
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+def monotonic_usec():
+    return time.clock_gettime_ns(time.CLOCK_MONOTONIC) // 1000
+
+class Daemon:
+    # Applies the configured preset, then again every Time seconds while ReApply is on. SIGHUP
+    # re-reads config.ini and applies at once; SIGTERM and SIGINT stop. Every wakeup pings the
+    # watchdog, so a ryzenadj call that hangs gets the service restarted.
+    def __init__(self, ctx, notifier):
+        self.ctx = ctx
+        self.notifier = notifier
+        self.engine = ReapplyEngine(self.tick, stdin=None)
+        self.mode = None
+        self.argv = ()
+        self.interval = 30
+        self.reapply = False
+        self.due = 0
+        self.ready = False
+
+    def load(self):
+        self.ctx.config = None
+        cfg = self.ctx.cfg
+        mode = cfg.get('User', 'Mode', fallback='')
+        if not mode:
+            raise UsageError("No mode in config.ini")
+        self.argv = self.ctx.resolve(mode)
+        self.mode = mode
+        self.reapply = cfg.get('Settings', 'ReApply', fallback='0') == '1'
+        try:
+            self.interval = max(1, int(cfg.get('Settings', 'Time', fallback='30')))
+        except ValueError:
+            self.interval = 30
+
+    def apply(self):
+        result = self.ctx.ryzenadj_run(self.argv)
+        stamp = time.strftime('%H:%M:%S')
+        if result.returncode == 0:
+            write_boot_argv(self.ctx.boot_path, self.argv)
+            status = f"Applied {self.mode} at {stamp}"
+        else:
+            status = f"Applying {self.mode} failed at {stamp}: {(result.stderr.strip().splitlines() or [f'exit code {result.returncode}'])[0]}"
+        print(status, flush=True)
+        self.notifier.send(f"STATUS={status}")
+        # A failed apply is retried on the next interval even with ReApply off
+        return result.returncode == 0
+
+    def reload(self):
+        self.notifier.send('RELOADING=1', f"MONOTONIC_USEC={monotonic_usec()}")
+        try:
+            self.load()
+        except UsageError as e:
+            # Keep applying the last good preset rather than going down over a bad edit
+            print(f"Reload failed, keeping {self.mode}: {e}", flush=True)
+        self.due = 0
+
+    def tick(self, command):
+        if command == 'reload':
+            self.reload()
+        now = time.monotonic()
+        if now >= self.due:
+            applied = self.apply()
+            self.due = now + self.interval if self.reapply or not applied else float('inf')
+        if not self.ready or command == 'reload':
+            self.notifier.send('READY=1')
+            self.ready = True
+        if self.notifier.watchdog:
+            self.notifier.send('WATCHDOG=1')
+        return min(self.due - now, self.notifier.watchdog or float('inf'), 86400)
+
+    def run(self):
+        self.load()
+        previous = {signum: signal.signal(signum, handler) for signum, handler in
+                    ((signal.SIGHUP, lambda *_: self.engine.post('reload')),
+                     (signal.SIGTERM, lambda *_: self.engine.stop()),
+                     (signal.SIGINT, lambda *_: self.engine.stop()))}
+        with open(self.ctx.pid_path, 'w') as f:
+            f.write(f"{os.getpid()}\n")
+        try:
+            self.engine.run()
+        finally:
+            self.notifier.send('STOPPING=1')
+            try:
+                os.remove(self.ctx.pid_path)
+            except OSError:
+                pass
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
@@ -0,0 +1,129 @@
+import sys
+import time
+import logging
+
+# Cursor home, clear screen and scrollback; the same bytes `clear` writes, without forking a shell for it
+CLEAR = '\033[H\033[2J\033[3J'
+RESIZE = '\033[8;{rows};{columns}t'
+BACK_KEYS = {ord('b'), ord('B'), ord('q'), ord('Q')}
+
+def clear_screen(stream=sys.stdout):
+    stream.write(CLEAR)
+    stream.flush()
+
+def resize_terminal(rows, columns, stream=sys.stdout):
+    if stream.isatty():
+        stream.write(RESIZE.format(rows=rows, columns=columns))
+        stream.flush()
+
+class Screen:
+    # Full-screen view for the auto reapply loop: a title, a status area and the log of the current
+    # cycle. Rows that did not change since the last frame are not touched, and curses only sends the
+    # cells that differ, so a reapply with the same output writes next to nothing to the terminal.
+    def __init__(self, title):
+        import curses
+        self.curses = curses
+        self.title = title
+        self.window = None
+        self.lines = []
+        self.drawn = {}
+        self.status = {}
+
+    def start(self):
+        curses = self.curses
+        self.window = curses.initscr()
+        try:
+            curses.noecho()
+            curses.cbreak()
+            self.window.keypad(True)
+            self.window.nodelay(True)
+            try:
+                curses.curs_set(0)
+            except curses.error:
+                pass
+        except Exception:
+            self.stop()
+            raise
+        return self
+
+    def stop(self):
+        if self.window is not None:
+            curses = self.curses
+            self.window.keypad(False)
+            curses.nocbreak()
+            curses.echo()
+            curses.endwin()
+            self.window = None
+
+    def fileno(self):
+        return sys.stdin.fileno()
+
+    def keys(self):
+        # Everything typed since the last call, without blocking
+        keys = []
+        while True:
+            key = self.window.getch()
+            if key == -1:
+                return keys
+            if key == self.curses.KEY_RESIZE:
+                self.redraw()
+            keys.append(key)
+
+    def back_requested(self):
+        return any(key in BACK_KEYS for key in self.keys())
+
+    def reset(self):
+        self.lines = []
+
+    def write(self, text):
+        self.lines.extend(text.splitlines() or [''])
+
+    def set_status(self, name, value):
+        self.status[name] = value
+
+    def rows(self, height, width):
+        status = '  '.join(f"{name}: {value}" for name, value in self.status.items() if value is not None)
+        body = [self.title, status, '-' * (width - 1)] + self.lines
+        body = body[:height - 1] + [''] * (height - 1 - len(body))
+        return [row[:width - 1] for row in body + ["B: back to the main menu"]]
+
+    def refresh(self):
+        height, width = self.window.getmaxyx()
+        for y, text in enumerate(self.rows(height, width)):
+            if self.drawn.get(y) != text:
+                try:
+                    self.window.move(y, 0)
+                    self.window.clrtoeol()
+                    self.window.addstr(y, 0, text)
+                except self.curses.error:
+                    # Writing the bottom-right cell raises after drawing it
+                    pass
+                self.drawn[y] = text
+        self.window.noutrefresh()
+        self.curses.doupdate()
+
+    def redraw(self):
+        self.drawn = {}
+        self.window.clear()
+        self.refresh()
+
+class ScreenHandler(logging.Handler):
+    # Routes UI text (the root logger) into the screen's log area while the screen is up
+    def __init__(self, screen):
+        super().__init__()
+        self.screen = screen
+
+    def emit(self, record):
+        self.screen.write(self.format(record))
+
+def open_screen(title, stdin=sys.stdin, stdout=sys.stdout):
+    # None when there is no terminal to draw on, or curses cannot drive it (e.g. TERM unset)
+    if not (stdin.isatty() and stdout.isatty()):
+        return None
+    try:
+        return Screen(title).start()
+    except Exception:
+        return None
+
+def next_time(seconds):
+    return time.strftime('%H:%M:%S', time.localtime(time.time() + seconds))
@@ -0,0 +1,165 @@
+import math
+import time
+import array
+import threading
+from Assets.SMU import parse_info
+
+# Channel -> ryzenadj -i row; core clocks are folded from the per-core "CORE CLOCK n" rows
+CHANNELS = [
+    ('stapm_value', 'STAPM VALUE'),
+    ('stapm_limit', 'STAPM LIMIT'),
+    ('ppt_fast_value', 'PPT VALUE FAST'),
+    ('ppt_fast_limit', 'PPT LIMIT FAST'),
+    ('ppt_slow_value', 'PPT VALUE SLOW'),
+    ('ppt_slow_limit', 'PPT LIMIT SLOW'),
+    ('tdc_value', 'TDC VALUE VDD'),
+    ('tdc_limit', 'TDC LIMIT VDD'),
+    ('edc_value', 'EDC VALUE VDD'),
+    ('edc_limit', 'EDC LIMIT VDD'),
+    ('tctl_value', 'THM VALUE CORE'),
+    ('tctl_limit', 'THM LIMIT CORE'),
+    ('skin_temp_value', 'STT VALUE APU'),
+    ('skin_temp_limit', 'STT LIMIT APU'),
+    ('core_clock_avg', None),
+    ('core_clock_max', None),
+]
+CHANNEL_NAMES = [name for name, _ in CHANNELS]
+CORE_CLOCK = 'CORE CLOCK'
+
+def sample_values(info_text):
+    rows = parse_info(info_text)
+    clocks = [value for row, value in rows.items() if row.startswith(CORE_CLOCK) and not math.isnan(value)]
+    values = [rows.get(row, math.nan) for _, row in CHANNELS[:-2]]
+    values += [sum(clocks) / len(clocks), max(clocks)] if clocks else [math.nan, math.nan]
+    return values
+
+class RingBuffer:
+    # Fixed-size columns of doubles: memory is capacity * (channels + 1) * 8 bytes, whatever the uptime
+    def __init__(self, capacity, width):
+        self.capacity = max(1, int(capacity))
+        self.width = width
+        self.times = array.array('d', bytes(8 * self.capacity))
+        self.values = array.array('d', bytes(8 * self.capacity * width))
+        self.head = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def append(self, timestamp, values):
+        with self.lock:
+            slot = self.head
+            self.times[slot] = timestamp
+            self.values[slot * self.width:(slot + 1) * self.width] = array.array('d', values)
+            self.head = (slot + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def slot(self, index):
+        # index 0 is the oldest sample still held
+        return (self.head - self.count + index) % self.capacity
+
+    def since(self, start):
+        # Timestamps are appended in order, so the window start is a binary search over the ring, not a scan
+        with self.lock:
+            low, high = 0, self.count
+            while low < high:
+                middle = (low + high) // 2
+                if self.times[self.slot(middle)] < start:
+                    low = middle + 1
+                else:
+                    high = middle
+            return [(self.times[slot], tuple(self.values[slot * self.width:(slot + 1) * self.width]))
+                    for slot in map(self.slot, range(low, self.count))]
+
+    def latest(self):
+        with self.lock:
+            if not self.count:
+                return None
+            slot = self.slot(self.count - 1)
+            return self.times[slot], tuple(self.values[slot * self.width:(slot + 1) * self.width])
+
+class TelemetrySampler:
+    # read_info returns a CompletedProcess of `ryzenadj -i`; its optional `cpu` attribute is the CPU time
+    # the SMU helper and ryzenadj spent producing it, which is most of what sampling costs
+    def __init__(self, read_info, rate=1.0, window=600, clock=time.time):
+        self.read_info = read_info
+        self.rate = rate
+        self.window = window
+        self.clock = clock
+        self.buffer = RingBuffer(math.ceil(window * rate), len(CHANNELS))
+        self.samples = 0
+        self.errors = 0
+        self.cpu_time = 0.0
+        self.child_cpu_time = 0.0
+        self.started = None
+        self.thread = None
+        self.stopping = threading.Event()
+        # Objects with append(timestamp, values), e.g. a Recorder.TelemetryLog
+        self.sinks = []
+
+    def record(self, info_text, timestamp=None):
+        values = sample_values(info_text)
+        if all(math.isnan(value) for value in values):
+            return False
+        timestamp = self.clock() if timestamp is None else timestamp
+        self.buffer.append(timestamp, values)
+        self.samples += 1
+        for sink in self.sinks:
+            sink.append(timestamp, values)
+        return True
+
+    def sample(self):
+        cpu = time.thread_time()
+        try:
+            result = self.read_info()
+            self.child_cpu_time += getattr(result, 'cpu', 0.0)
+            if not self.record(result.stdout):
+                self.errors += 1
+        except Exception:
+            self.errors += 1
+        finally:
+            self.cpu_time += time.thread_time() - cpu
+
+    def loop(self):
+        period = 1 / self.rate
+        deadline = time.monotonic()
+        while not self.stopping.is_set():
+            self.sample()
+            deadline += period
+            # Skip missed ticks instead of bursting to catch up after a suspend
+            deadline = max(deadline, time.monotonic())
+            self.stopping.wait(deadline - time.monotonic())
+
+    def start(self):
+        if self.thread is None:
+            self.stopping.clear()
+            self.started = time.monotonic()
+            self.thread = threading.Thread(target=self.loop, name='telemetry', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        if self.thread is not None:
+            self.stopping.set()
+            self.thread.join()
+            self.thread = None
+
+    def overhead(self, children=True):
+        # Fraction of one CPU spent sampling since start(): this thread, plus the helper and ryzenadj unless children=False
+        elapsed = time.monotonic() - self.started if self.started else 0
+        cpu = self.cpu_time + (self.child_cpu_time if children else 0)
+        return cpu / elapsed if elapsed > 0 else 0.0
+
+    def history(self, seconds):
+        return self.buffer.since(self.clock() - seconds)
+
+    def summary(self, seconds):
+        # channel -> (min, mean, max) over the last `seconds`, ignoring rows the firmware did not report
+        columns = list(zip(*(values for _, values in self.history(seconds))))
+        result = {}
+        for name, column in zip(CHANNEL_NAMES, columns):
+            valid = [value for value in column if not math.isnan(value)]
+            if valid:
+                result[name] = (min(valid), sum(valid) / len(valid), max(valid))
+        return result
@@ -0,0 +1,126 @@
+import math
+import time
+from Assets.SMU import parse_info, parse_args
+
+SENSORS = {'tctl': 'THM VALUE CORE', 'skin': 'STT VALUE APU'}
+CONTROLLED = ('stapm-limit', 'fast-limit', 'slow-limit')
+# Lower bound as a fraction of the preset when the class has no Eco preset to borrow it from
+MIN_FRACTION = 0.5
+
+class PID:
+    # Output is clamped to [low, high]; the integral only grows while that does not push the
+    # output further into saturation (conditional integration), so it never winds up
+    def __init__(self, kp, ki, kd=0.0, low=0.0, high=1.0):
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.low, self.high = low, high
+        self.integral = 0.0
+        self.previous = None
+
+    def clamp(self, value):
+        return min(self.high, max(self.low, value))
+
+    def reset(self, output=None):
+        # Bumpless start: preload the integral so the first output is `output`
+        self.integral = (output if output is not None else self.high) / self.ki if self.ki else 0.0
+        self.previous = None
+
+    def update(self, error, dt):
+        derivative = (error - self.previous) / dt if self.previous is not None and dt > 0 else 0.0
+        self.previous = error
+        integral = self.integral + error * dt
+        raw = self.kp * error + self.ki * integral + self.kd * derivative
+        if self.low <= raw <= self.high or (raw > self.high and error < 0) or (raw < self.low and error > 0):
+            self.integral = integral
+        return self.clamp(self.kp * error + self.ki * self.integral + self.kd * derivative)
+
+class ThermalController:
+    # One control variable in [0, 1] interpolates every controlled limit between its lower and
+    # upper bound, so the preset's fast/slow/STAPM proportions are kept at every operating point
+    def __init__(self, target, sensor='tctl', kp=0.04, ki=0.004, kd=0.0, clock=time.monotonic):
+        self.target = target
+        self.sensor = sensor
+        self.row = SENSORS[sensor]
+        self.pid = PID(kp, ki, kd)
+        self.pid.reset()
+        self.clock = clock
+        self.upper = {}
+        self.lower = {}
+        self.output = 1.0
+        self.temperature = math.nan
+        self.last = None
+
+    def set_bounds(self, upper, lower=None):
+        upper = {option: value for option, value in upper.items() if option in CONTROLLED}
+        lower = lower or {}
+        self.upper = upper
+        self.lower = {option: min(value, lower.get(option, int(value * MIN_FRACTION))) for option, value in upper.items()}
+
+    def update(self, temperature, now=None):
+        now = self.clock() if now is None else now
+        if not math.isnan(temperature):
+            dt = now - self.last if self.last is not None else 0.0
+            self.output = self.pid.update(self.target - temperature, dt)
+            self.temperature = temperature
+        self.last = now
+        return self.limits()
+
+    def limits(self):
+        return {option: int(round(self.lower[option] + (value - self.lower[option]) * self.output)) for option, value in self.upper.items()}
+
+    def fraction(self):
+        # The controlled limits as a share of the preset's, averaged; `output` is only the position
+        # between the lower bounds and the preset, which understates how much of the preset is left
+        limits = self.limits()
+        ratios = [limits[option] / value for option, value in self.upper.items() if value]
+        return sum(ratios) / len(ratios) if ratios else 1.0
+
+    def adjust(self, argv, info_text, now=None):
+        # argv with the controlled limits replaced by the controller's current values
+        if not self.upper:
+            self.set_bounds(parse_args(argv))
+        limits = self.update(parse_info(info_text).get(self.row, math.nan), now)
+        adjusted = [arg for arg in argv if arg.lstrip('-').partition('=')[0] not in limits]
+        return tuple(adjusted + [f"--{option}={value}" for option, value in limits.items()])
+
+class SimulatedPlant:
+    # Lumped RC model of die and cooler: C dT/dt = P - (T - ambient) / R, with the package drawing
+    # min(demand, STAPM limit) and firmware throttling hard at `throttle`
+    def __init__(self, ambient=30.0, resistance=2.2, capacitance=20.0, demand=40.0, throttle=95.0):
+        self.ambient = ambient
+        self.resistance = resistance
+        self.capacitance = capacitance
+        self.demand = demand
+        self.throttle = throttle
+        self.temperature = ambient
+        self.power = 0.0
+
+    def step(self, limits, dt):
+        power = min(self.demand, limits.get('stapm-limit', math.inf) / 1000)
+        if self.temperature >= self.throttle:
+            power = min(power, (self.throttle - self.ambient) / self.resistance)
+        self.power = power
+        self.temperature += dt * (power - (self.temperature - self.ambient) / self.resistance) / self.capacitance
+        return self.temperature
+
+    def info(self):
+        return f"| THM VALUE CORE | {self.temperature:.3f} | tctl |\n| STAPM VALUE | {self.power:.3f} | stapm |"
+
+def simulate(controller, plant, argv, seconds=900, dt=1.0):
+    trace = []
+    for step in range(int(seconds / dt)):
+        adjusted = controller.adjust(argv, plant.info(), step * dt)
+        plant.step(parse_args(adjusted), dt)
+        trace.append((step * dt, plant.temperature, plant.power))
+    return trace
+
+if __name__ == "__main__":
+    # Extreme U-series preset (30 W) on a cooler that settles near 96 C at full power; hold 85 C
+    upper = "--stapm-limit=30000 --fast-limit=34000 --slow-limit=32000 --tctl-temp=95".split()
+    controller = ThermalController(85)
+    controller.set_bounds(parse_args(upper), {'stapm-limit': 6000, 'fast-limit': 8000, 'slow-limit': 6000})
+    trace = simulate(controller, SimulatedPlant(), upper)
+    settled = [temperature for t, temperature, _ in trace if t >= 600]
+    peak = max(temperature for _, temperature, _ in trace)
+    power = trace[-1][2]
+    print(f"peak {peak:.1f} C, settled {min(settled):.1f}-{max(settled):.1f} C at {power:.1f} W")
+    raise SystemExit(0 if peak < 88 and all(abs(temperature - 85) < 1 for temperature in settled) else 1)
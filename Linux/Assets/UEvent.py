@@ -0,0 +1,112 @@
+import os
+import socket
+import select
+import time
+import threading
+
+NETLINK_KOBJECT_UEVENT = 15
+KERNEL_GROUP = 1
+
+def parse_uevent(data):
+    fields = data.split(b'\0')
+    event = {}
+    if b'@' in fields[0]:
+        event['HEADER'] = fields[0].decode(errors='replace')
+        fields = fields[1:]
+    for field in fields:
+        key, sep, value = field.partition(b'=')
+        if sep:
+            event[key.decode(errors='replace')] = value.decode(errors='replace')
+    return event
+
+class UEventSource:
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        # Port 0 lets the kernel pick a free port id; the pid may already be taken by another netlink socket
+        self.sock.bind((0, KERNEL_GROUP))
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def receive(self):
+        return parse_uevent(self.sock.recv(65536))
+
+    def close(self):
+        self.sock.close()
+
+class FakeUEventSource(UEventSource):
+    def __init__(self):
+        self.sock, self.writer = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+    def emit(self, action='change', devpath='/devices/virtual/power_supply/AC', **fields):
+        payload = [f"{action}@{devpath}", f"ACTION={action}", f"DEVPATH={devpath}", "SUBSYSTEM=power_supply"]
+        payload += [f"{key}={value}" for key, value in fields.items()]
+        self.writer.send('\0'.join(payload).encode() + b'\0')
+
+    def close(self):
+        super().close()
+        self.writer.close()
+
+class PowerEvents:
+    def __init__(self, source=None, supply=None, debounce=0.3, max_wait=3):
+        self.source = source if source is not None else UEventSource()
+        self.debounce = debounce
+        self.max_wait = max_wait
+        # Seeded from sysfs, so the first event of each supply only counts if it really changed something
+        self.state = supply.states() if supply is not None else {}
+        self.lock = threading.Lock()
+        self.timer = None
+        self.deadline = 0
+
+    def fileno(self):
+        return self.source.fileno()
+
+    def relevant(self, event):
+        # Capacity and power_now updates arrive as change events too; only plug state matters here
+        if event.get('SUBSYSTEM') != 'power_supply':
+            return False
+        name = event.get('POWER_SUPPLY_NAME', os.path.basename(event.get('DEVPATH', '')))
+        state = (event.get('POWER_SUPPLY_ONLINE'), event.get('POWER_SUPPLY_STATUS'))
+        changed = self.state.get(name) != state
+        self.state[name] = state
+        return changed
+
+    def poll(self, callback):
+        # Called when the socket is readable and never blocks: it reads what is queued, and a plug change
+        # (re)starts a timer that calls back once things have been quiet for `debounce`, so a flapping dock
+        # only triggers one switch. A burst that never goes quiet still calls back after `max_wait`.
+        changed = False
+        while select.select([self.source], [], [], 0)[0]:
+            changed = self.relevant(self.source.receive()) or changed
+        if changed:
+            with self.lock:
+                now = time.monotonic()
+                if self.timer is None:
+                    self.deadline = now + self.max_wait
+                else:
+                    self.timer.cancel()
+                self.timer = threading.Timer(max(0, min(self.debounce, self.deadline - now)), self.fire, (callback,))
+                self.timer.daemon = True
+                self.timer.start()
+        return changed
+
+    def fire(self, callback):
+        with self.lock:
+            # A timer replaced just as it went off must not call back as well
+            if self.timer is not threading.current_thread():
+                return
+            self.timer = None
+        callback()
+
+    def close(self):
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        self.source.close()
+
+def open_power_events(source=None, supply=None):
+    try:
+        return PowerEvents(source, supply)
+    except OSError:
+        return None
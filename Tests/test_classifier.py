@@ -0,0 +1,65 @@
+# CPU family and preset classification against real brand strings and CPUID signatures.
+#
+#   python3 -m unittest discover -s Tests
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'Linux'))
+from Assets.Classifier import classify_codename, classify_presets
+
+# Real brand strings and signatures with the expected (family, preset module)
+CORPUS = [
+    ("AMD Ryzen 7 1700X Eight-Core Processor", "Family 23, Model 1, Stepping 1", 'SummitRidge', 'AMDCPUPreRaphael_X'),
+    ("AMD Ryzen 5 2600 Six-Core Processor", "Family 23, Model 8, Stepping 2", 'PinnacleRidge', 'AMDCPUPreRaphael'),
+    ("AMD Ryzen 5 2500U with Radeon Vega Mobile Gfx", "Family 23, Model 17, Stepping 0", 'RavenRidge', 'AMDAPUPreMatisse_U_e_Ce'),
+    ("AMD Ryzen 5 2400GE with Radeon Vega Graphics", "Family 23, Model 17, Stepping 0", 'RavenRidge', 'AMDAPUPreMatisse_GE'),
+    ("AMD Ryzen 5 3400G with Radeon Vega Graphics", "Family 23, Model 24, Stepping 1", 'Picasso', 'AMDAPUPreMatisse_G'),
+    ("AMD Ryzen 7 3750H with Radeon Vega Mobile Gfx", "Family 23, Model 24, Stepping 1", 'Picasso', 'AMDAPUPreMatisse_H'),
+    ("AMD Athlon Silver 3050U with Radeon Graphics", "Family 23, Model 32, Stepping 1", 'Dali', 'AMDAPUPreMatisse_U_e_Ce'),
+    ("AMD Ryzen 3 3015e with Radeon Graphics", "Family 23, Model 32, Stepping 1", 'Pollock', 'AMDAPUPreMatisse_U_e_Ce'),
+    ("AMD Ryzen 9 3900X 12-Core Processor", "Family 23, Model 113, Stepping 0", 'Matisse', 'AMDCPUPreRaphael_X9'),
+    ("AMD Ryzen 7 3800XT 8-Core Processor", "Family 23, Model 113, Stepping 0", 'Matisse', 'AMDCPUPreRaphael_X'),
+    ("AMD Ryzen 5 4500U with Radeon Graphics", "Family 23, Model 96, Stepping 1", 'Renoir', 'AMDAPUPostMatisse_U'),
+    ("AMD Ryzen 7 PRO 4750U with Radeon Graphics", "Family 23, Model 96, Stepping 1", 'Renoir', 'AMDAPUPostMatisse_U'),
+    ("AMD Ryzen 7 4800HS with Radeon Graphics", "Family 23, Model 96, Stepping 1", 'Renoir', 'AMDAPUPostMatisse_HS'),
+    ("AMD Ryzen 5 PRO 4650GE with Radeon Graphics", "Family 23, Model 96, Stepping 1", 'Renoir', 'AMDAPUPostMatisse_GE'),
+    ("AMD Ryzen 7 5700U with Radeon Graphics", "Family 23, Model 104, Stepping 1", 'Lucienne', 'AMDAPUPostMatisse_U'),
+    ("AMD Custom APU 0405", "Family 23, Model 144, Stepping 2", 'VanGogh', 'AMDAPUPostMatisse_U'),
+    ("AMD Ryzen 5 7520U with Radeon Graphics", "Family 23, Model 160, Stepping 0", 'Mendocino', 'AMDAPUPostMatisse_U'),
+    ("AMD Ryzen 7 5800X3D 8-Core Processor", "Family 25, Model 33, Stepping 2", 'Vermeer', 'AMDCPUPreRaphael_X3D'),
+    ("AMD Ryzen 9 5950X 16-Core Processor", "Family 25, Model 33, Stepping 0", 'Vermeer', 'AMDCPUPreRaphael_X9'),
+    ("AMD Ryzen 9 5900XT 16-Core Processor", "Family 25, Model 33, Stepping 2", 'Vermeer', 'AMDCPUPreRaphael_X9'),
+    ("AMD Ryzen 7 5800H with Radeon Graphics", "Family 25, Model 80, Stepping 0", 'Cezanne_Barcelo', 'AMDAPUPostMatisse_H'),
+    ("AMD Ryzen 5 5600G with Radeon Graphics", "Family 25, Model 80, Stepping 0", 'Cezanne_Barcelo', 'AMDAPUPostMatisse_G'),
+    ("AMD Ryzen 5 5600GT with Radeon Graphics", "Family 25, Model 80, Stepping 0", 'Cezanne_Barcelo', 'AMDAPUPostMatisse_G'),
+    ("AMD Ryzen 7 6800H with Radeon Graphics", "Family 25, Model 68, Stepping 1", 'Rembrandt', 'AMDAPUPostMatisse_H'),
+    ("AMD Ryzen 7 7735HS with Radeon Graphics", "Family 25, Model 68, Stepping 1", 'Rembrandt', 'AMDAPUPostMatisse_HS'),
+    ("AMD Ryzen 9 7950X 16-Core Processor", "Family 25, Model 97, Stepping 2", 'Raphael', 'AMDCPU_X9'),
+    ("AMD Ryzen 7 7800X3D 8-Core Processor", "Family 25, Model 97, Stepping 2", 'Raphael', 'AMDCPU_X3D'),
+    ("AMD Ryzen 9 7945HX with Radeon Graphics", "Family 25, Model 97, Stepping 2", 'DragonRange', 'AMDAPUPostMatisse_HX'),
+    ("AMD Ryzen 9 7945HX3D with Radeon Graphics", "Family 25, Model 97, Stepping 2", 'DragonRange', 'AMDAPUPostMatisse_HX'),
+    ("AMD Ryzen 7 7840U w/ Radeon 780M Graphics", "Family 25, Model 116, Stepping 1", 'PhoenixPoint', 'AMDAPUPostMatisse_U'),
+    ("AMD Ryzen 9 7940HS w/ Radeon 780M Graphics", "Family 25, Model 116, Stepping 1", 'PhoenixPoint', 'AMDAPUPostMatisse_HS'),
+    ("AMD Ryzen 5 7540U w/ Radeon 740M Graphics", "Family 25, Model 120, Stepping 0", 'PhoenixPoint2', 'AMDAPUPostMatisse_U'),
+    ("AMD Ryzen 7 8840HS w/ Radeon 780M Graphics", "Family 25, Model 117, Stepping 2", 'HawkPoint', 'AMDAPUPostMatisse_HS'),
+    ("AMD Ryzen 7 8700G w/ Radeon 780M Graphics", "Family 25, Model 117, Stepping 2", 'HawkPoint', 'AMDAPUPostMatisse_G'),
+    ("AMD Ryzen AI 9 HX 370 w/ Radeon 890M", "Family 26, Model 36, Stepping 0", 'StrixPoint', 'AMDAPUPostMatisse_HX'),
+    ("AMD Ryzen AI 9 365 w/ Radeon 880M", "Family 26, Model 36, Stepping 0", 'StrixPoint', 'AMDAPUPostMatisse_HS'),
+    ("AMD Ryzen AI 7 350 w/ Radeon 860M", "Family 26, Model 96, Stepping 0", 'StrixPoint2', 'AMDAPUPostMatisse_HS'),
+    ("AMD RYZEN AI MAX+ 395 w/ Radeon 8060S", "Family 26, Model 112, Stepping 0", 'Sarlak', 'AMDAPUPostMatisse_HX'),
+    ("AMD Ryzen 9 9950X 16-Core Processor", "Family 26, Model 68, Stepping 0", 'GraniteRidge', 'AMDCPU_X9'),
+    ("AMD Ryzen 7 9800X3D 8-Core Processor", "Family 26, Model 68, Stepping 0", 'GraniteRidge', 'AMDCPU_X3D'),
+    ("AMD Ryzen 9 9955HX 16-Core Processor", "Family 26, Model 68, Stepping 0", 'FireRange', 'AMDAPUPostMatisse_HX'),
+    ("Intel(R) Core(TM) i7-8565U CPU @ 1.80GHz", "Family 6, Model 142, Stepping 11", 'Intel', 'AMDCPU'),
+]
+
+class ClassifierTest(unittest.TestCase):
+    def test_corpus(self):
+        for cpu, signature, expected_family, expected_presets in CORPUS:
+            with self.subTest(cpu=cpu):
+                _, family, cpu_type = classify_codename(cpu, signature)
+                self.assertEqual((family, classify_presets(cpu, family, cpu_type)), (expected_family, expected_presets))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# The reapply engine: command ordering, stopping, and surviving a handler that raises.
+#
+#   python3 -m unittest discover -s Tests
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'Linux'))
+from Assets.Engine import ReapplyEngine
+
+class ReapplyEngineTest(unittest.TestCase):
+    def test_commands_in_order(self):
+        commands = []
+        engine = ReapplyEngine(lambda command: commands.append(command) or 10, stdin=None)
+        engine.post(('profile', 'Eco', 'game'))
+        engine.post('power')
+        engine.post('power')
+        threading.Timer(0.2, engine.stop).start()
+        engine.run()
+        # Back-to-back repeats are merged, and stop ends the loop without another tick
+        self.assertEqual(commands, [None, ('profile', 'Eco', 'game'), 'power'])
+
+    def test_handler_exception_keeps_running(self):
+        commands = []
+
+        def handler(command):
+            commands.append(command)
+            if command == 'power':
+                raise KeyError('Extreme')
+            return 0.05
+
+        engine = ReapplyEngine(handler, stdin=None)
+        threading.Timer(0.1, engine.post, ('power',)).start()
+        threading.Timer(0.4, engine.stop).start()
+        with self.assertLogs(level='ERROR') as logs:
+            engine.run()
+        self.assertIn("Reapply failed ('power')", logs.output[0])
+        # The failed tick retried after the last interval instead of ending the loop
+        self.assertGreater(commands.count(None), 3)
+        self.assertGreater(commands.index(None, commands.index('power')), commands.index('power'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# Fleet agents on 127.0.0.1 with a stand-in ryzenadj: signatures, canary order and rollback.
+#
+#   python3 -m unittest discover -s Tests
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'Linux'))
+from Assets.Config import ConfigStore
+from Assets.Fleet import AgentServer, Agent, Controller, AuthError, request
+
+KEY = bytes(range(32))
+
+class FakeContext:
+    def __init__(self, directory, name, log):
+        self.name = name
+        self.log = log
+        self.cfg = ConfigStore(os.path.join(directory, 'config.ini')).load()
+        self.cfg.read_dict({'User': {'Mode': 'Balance'}})
+        self.pid_path = os.path.join(directory, 'daemon.pid')
+        self.version = 'test'
+        # ryzenadj argument lists this host rejects
+        self.failing = set()
+
+    def resolve(self, mode):
+        return (f"--{mode.lower()}",)
+
+    def preset_class(self):
+        return 'AMDCPU'
+
+    def ryzenadj_run(self, argv):
+        self.log.append((self.name, argv))
+        returncode = 1 if tuple(argv) in self.failing else 0
+        return subprocess.CompletedProcess(argv, returncode, '', 'SMU rejected' if returncode else '')
+
+class FleetTest(unittest.TestCase):
+    def setUp(self):
+        self.log = []
+        self.contexts, self.hosts = [], []
+        for index in range(3):
+            directory = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree, directory, True)
+            ctx = FakeContext(directory, f"agent{index}", self.log)
+            server = AgentServer(Agent(ctx), KEY, ('127.0.0.1', 0))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.addCleanup(server.server_close)
+            self.addCleanup(server.shutdown)
+            self.contexts.append(ctx)
+            self.hosts.append(server.server_address[:2])
+
+    def test_wrong_key_rejected(self):
+        with self.assertRaises(AuthError):
+            request(self.hosts[0], bytes(32), {'command': 'apply', 'mode': 'Eco'})
+        results, aborted = Controller(self.hosts, bytes(32)).rollout({'command': 'apply', 'mode': 'Eco'})
+        self.assertTrue(aborted)
+        self.assertEqual([result['result'] for result in results], ['failed', 'skipped', 'skipped'])
+        self.assertIn('authentication failed', results[0]['error'])
+        self.assertEqual(self.log, [])
+
+    def test_canary_first(self):
+        results, aborted = Controller(self.hosts, KEY, parallel=2).rollout({'command': 'apply', 'mode': 'Eco'})
+        self.assertFalse(aborted)
+        self.assertEqual(self.log[0], ('agent0', ('--eco',)))
+        self.assertEqual(sorted(self.log[1:]), [('agent1', ('--eco',)), ('agent2', ('--eco',))])
+        self.assertEqual([(result['phase'], result['result']) for result in results],
+                         [('canary', 'applied'), ('rollout', 'applied'), ('rollout', 'applied')])
+        # Saved as the mode, so a daemon's next reapply keeps it
+        self.assertEqual([ctx.cfg.get('User', 'Mode') for ctx in self.contexts], ['Eco'] * 3)
+
+    def test_failed_canary_stops_rollout(self):
+        self.contexts[0].failing.add(('--eco',))
+        results, aborted = Controller(self.hosts, KEY).rollout({'command': 'apply', 'mode': 'Eco'})
+        self.assertTrue(aborted)
+        self.assertEqual([result['result'] for result in results], ['failed, rolled back', 'skipped', 'skipped'])
+        self.assertEqual(self.log, [('agent0', ('--eco',)), ('agent0', ('--balance',))])
+
+    def test_rollback_past_max_failures(self):
+        for ctx in self.contexts[1:]:
+            ctx.failing.add(('--eco',))
+        results, aborted = Controller(self.hosts, KEY, parallel=1).rollout({'command': 'apply', 'mode': 'Eco'}, max_failures=0)
+        self.assertTrue(aborted)
+        self.assertEqual([result['result'] for result in results], ['rolled back', 'failed, rolled back', 'skipped'])
+        self.assertNotIn('agent2', [name for name, _ in self.log])
+        self.assertEqual(sorted(self.log[-2:]), [('agent0', ('--balance',)), ('agent1', ('--balance',))])
+        self.assertEqual(self.contexts[0].cfg.get('User', 'Mode'), 'Balance')
+
+    def test_failures_within_budget_roll_back_only_failed_hosts(self):
+        self.contexts[1].failing.add(('--eco',))
+        results, aborted = Controller(self.hosts, KEY, parallel=1).rollout({'command': 'apply', 'mode': 'Eco'}, max_failures=1)
+        self.assertFalse(aborted)
+        self.assertEqual([result['result'] for result in results], ['applied', 'failed, rolled back', 'applied'])
+        self.assertEqual(self.contexts[0].cfg.get('User', 'Mode'), 'Eco')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# Load-aware Dynamic Mode: /proc parsing, the stepping policy, and the levels each preset class defines.
+#
+#   python3 -m unittest discover -s Tests
+import os
+import sys
+import json
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'Linux'))
+from Assets.Load import LoadPolicy, preset_levels, parse_proc_stat, parse_numbers, THRESHOLDS
+
+PRESETS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'Linux', 'Assets', 'Presets.json')
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class PresetLevelsTest(unittest.TestCase):
+    def test_every_class_has_levels(self):
+        with open(PRESETS_PATH) as f:
+            classes = json.load(f)['presets']
+        for name, modes in classes.items():
+            with self.subTest(preset_class=name):
+                levels = preset_levels(modes)
+                self.assertEqual([index for index, _ in levels], [0, 1, 2, 3])
+                self.assertTrue(all(mode in modes for _, mode in levels))
+
+    def test_framework_names(self):
+        self.assertEqual(preset_levels(['Eco', 'BalPreset', 'PerformancePreset', 'ExtremePreset', 'AC', 'DC']),
+                         [(0, 'Eco'), (1, 'BalPreset'), (2, 'PerformancePreset'), (3, 'ExtremePreset')])
+
+    def test_missing_level_skipped(self):
+        self.assertEqual(preset_levels(['Eco', 'Balance', 'Extreme']), [(0, 'Eco'), (1, 'Balance'), (3, 'Extreme')])
+
+class LoadPolicyTest(unittest.TestCase):
+    def policy(self, levels=None, **kwargs):
+        self.clock = Clock()
+        if levels is None:
+            return LoadPolicy(clock=self.clock, **kwargs)
+        # As load_policy builds it: each level keeps the threshold of its position in LEVELS
+        return LoadPolicy(tuple(THRESHOLDS[index - 1] for index, _ in levels[1:]), levels=[name for _, name in levels],
+                          clock=self.clock, **kwargs)
+
+    def run_for(self, policy, demand, seconds):
+        for _ in range(int(seconds)):
+            self.clock.now += 1
+            mode = policy.update(demand)
+        return mode
+
+    def test_steps_after_dwell(self):
+        policy = self.policy()
+        self.assertEqual(policy.update(60), 'Eco')
+        self.assertEqual(self.run_for(policy, 60, 5), 'Eco')
+        self.assertEqual(self.run_for(policy, 60, 1), 'Balance')
+        # One level at a time, each with its own dwell
+        self.assertEqual(self.run_for(policy, 60, 6), 'Balance')
+        self.assertEqual(self.run_for(policy, 60, 1), 'Performance')
+        self.assertEqual(self.run_for(policy, 60, 60), 'Performance')
+
+    def test_hysteresis(self):
+        policy = self.policy(initial='Balance')
+        # 20 is below the 25 threshold but within the hysteresis band
+        self.assertEqual(self.run_for(policy, 20, 60), 'Balance')
+        self.assertEqual(self.run_for(policy, 10, 29), 'Balance')
+        self.assertEqual(self.run_for(policy, 10, 2), 'Eco')
+
+    def test_burst_does_not_flap(self):
+        policy = self.policy()
+        self.run_for(policy, 90, 3)
+        self.run_for(policy, 0, 1)
+        self.assertEqual(self.run_for(policy, 90, 3), 'Eco')
+
+    def test_framework_levels(self):
+        policy = self.policy(preset_levels(['Eco', 'BalPreset', 'PerformancePreset', 'ExtremePreset']), initial='BalPreset')
+        self.assertEqual(self.run_for(policy, 100, 14), 'ExtremePreset')
+
+    def test_missing_level(self):
+        policy = self.policy(preset_levels(['Eco', 'Balance', 'Extreme']), initial='Balance')
+        # Extreme still needs the demand Extreme needs, even though Performance is skipped
+        self.assertEqual(self.run_for(policy, 60, 60), 'Balance')
+        self.assertEqual(self.run_for(policy, 80, 7), 'Extreme')
+
+class ParseTest(unittest.TestCase):
+    def test_proc_stat(self):
+        text = "cpu  10 0 10 70 10 0 0 0 0 0\ncpu0 10 0 10 70 10 0 0 0 0 0\nintr 1\n"
+        # iowait counts as idle
+        self.assertEqual(parse_proc_stat(text), {'cpu': (20, 100), 'cpu0': (20, 100)})
+
+    def test_numbers(self):
+        self.assertEqual(parse_numbers('20, 40,60', 3, THRESHOLDS), (20.0, 40.0, 60.0))
+        self.assertEqual(parse_numbers('20,40', 3, THRESHOLDS), THRESHOLDS)
+        self.assertEqual(parse_numbers('a,b,c', 3, THRESHOLDS), THRESHOLDS)
+
+if __name__ == '__main__':
+    unittest.main()
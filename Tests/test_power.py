@@ -0,0 +1,159 @@
+# Power-source detection: sysfs power_supply snapshots from a temporary tree, and the uevent debounce.
+#
+#   python3 -m unittest discover -s Tests
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'Linux'))
+from Assets.PowerSupply import PowerSupply, UPowerSupply, open_power_supply
+from Assets.UEvent import FakeUEventSource, PowerEvents, parse_uevent
+from Assets.Engine import ReapplyEngine
+
+def write_supply(root, name, **attributes):
+    path = os.path.join(root, name)
+    os.makedirs(path, exist_ok=True)
+    for attribute, value in attributes.items():
+        with open(os.path.join(path, attribute), 'w') as f:
+            f.write(f"{value}\n")
+
+class PowerTree(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+
+    def laptop(self, online=1, status='Charging'):
+        write_supply(self.root, 'ACAD', type='Mains', online=online)
+        write_supply(self.root, 'BAT0', type='Battery', status=status, capacity=80,
+                     energy_now=40000000, energy_full=50000000, power_now=12500000)
+
+class PowerSupplyTest(PowerTree):
+    def test_on_ac(self):
+        self.laptop()
+        supply = PowerSupply(self.root)
+        self.addCleanup(supply.close)
+        self.assertEqual(tuple(supply.snapshot()), ('Charging', 80, 12.5, 'ACAD', True))
+
+    def test_on_battery(self):
+        self.laptop()
+        supply = PowerSupply(self.root)
+        self.addCleanup(supply.close)
+        # The descriptors stay open and are re-read from offset 0
+        self.laptop(online=0, status='Discharging')
+        self.assertEqual(tuple(supply.snapshot()), ('Discharging', 80, 12.5, None, False))
+        self.assertEqual(supply.states(), {'ACAD': ('0', None), 'BAT0': (None, 'Discharging')})
+
+    def test_two_batteries(self):
+        self.laptop()
+        write_supply(self.root, 'BAT1', type='Battery', status='Full', capacity=100,
+                     energy_now=30000000, energy_full=30000000, current_now=1000000, voltage_now=12000000)
+        supply = PowerSupply(self.root)
+        self.addCleanup(supply.close)
+        snapshot = supply.snapshot()
+        # Capacity weighted by energy, power summed, power_now derived from current and voltage
+        self.assertEqual((snapshot.status, snapshot.capacity, snapshot.power_now), ('Charging', 88, 24.5))
+
+    def test_battery_only(self):
+        write_supply(self.root, 'BAT0', type='Battery', status='Discharging', capacity=55)
+        supply = PowerSupply(self.root)
+        self.addCleanup(supply.close)
+        self.assertEqual(tuple(supply.snapshot()), ('Discharging', 55, 0.0, None, False))
+
+    def test_scan_finds_new_supply(self):
+        write_supply(self.root, 'BAT0', type='Battery', status='Discharging', capacity=55)
+        supply = PowerSupply(self.root)
+        self.addCleanup(supply.close)
+        write_supply(self.root, 'ucsi-source-psy-USBC000:001', type='USB', online=1)
+        supply.scan()
+        self.assertEqual(supply.snapshot().adapter, 'ucsi-source-psy-USBC000:001')
+
+    def test_empty_tree_falls_back_to_upower(self):
+        self.assertIsInstance(open_power_supply(self.root), UPowerSupply)
+
+class PowerEventsTest(PowerTree):
+    def setUp(self):
+        super().setUp()
+        self.laptop()
+        self.supply = PowerSupply(self.root)
+        self.source = FakeUEventSource()
+        self.events = PowerEvents(self.source, self.supply)
+        self.addCleanup(self.supply.close)
+        self.addCleanup(self.events.close)
+        self.calls = []
+        self.called = threading.Event()
+
+    def callback(self):
+        self.calls.append(time.monotonic())
+        self.called.set()
+
+    def unplug(self, online=0):
+        self.source.emit(devpath='/devices/LNXSYSTM:00/ACPI0003:00/power_supply/ACAD',
+                         POWER_SUPPLY_NAME='ACAD', POWER_SUPPLY_ONLINE=online)
+
+    def test_parse(self):
+        event = parse_uevent(b'change@/devices/x/power_supply/BAT0\0ACTION=change\0SUBSYSTEM=power_supply\0POWER_SUPPLY_CAPACITY=79\0')
+        self.assertEqual(event['HEADER'], 'change@/devices/x/power_supply/BAT0')
+        self.assertEqual(event['POWER_SUPPLY_CAPACITY'], '79')
+
+    def test_debounce(self):
+        self.unplug()
+        started = time.monotonic()
+        self.assertTrue(self.events.poll(self.callback))
+        # poll only reads what is queued; the wait happens on a timer
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertTrue(self.called.wait(2))
+        self.assertGreaterEqual(self.calls[0] - started, 0.25)
+        self.assertLess(self.calls[0] - started, 1)
+        time.sleep(0.4)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_unchanged_state_ignored(self):
+        # Matches what sysfs already said, and a capacity update carries no plug state
+        self.unplug(online=1)
+        self.source.emit(devpath='/devices/x/power_supply/BAT0', POWER_SUPPLY_NAME='BAT0',
+                         POWER_SUPPLY_STATUS='Charging', POWER_SUPPLY_CAPACITY=79)
+        self.assertFalse(self.events.poll(self.callback))
+        self.assertFalse(self.called.wait(0.5))
+
+    def test_flapping_capped(self):
+        started = time.monotonic()
+        online = 0
+        while time.monotonic() - started < 4 and not self.called.is_set():
+            self.unplug(online)
+            self.events.poll(self.callback)
+            online ^= 1
+            time.sleep(0.1)
+        self.assertTrue(self.called.is_set())
+        # Never quiet for 0.3 s, so only the 3 s cap lets it through
+        self.assertGreaterEqual(self.calls[0] - started, 2.9)
+        self.assertLess(self.calls[0] - started, 3.5)
+
+    def test_close_cancels_pending(self):
+        self.unplug()
+        self.events.poll(self.callback)
+        self.events.close()
+        self.assertFalse(self.called.wait(0.6))
+
+    def test_engine_not_blocked(self):
+        commands = []
+        engine = ReapplyEngine(lambda command: commands.append((command, time.monotonic())) or 10, stdin=None)
+
+        def on_event():
+            self.events.poll(lambda: engine.post('power'))
+
+        engine.add_source(self.events, on_event)
+        threading.Timer(0.1, self.unplug).start()
+        threading.Timer(0.2, engine.post, ('profile',)).start()
+        threading.Timer(1, engine.stop).start()
+        started = time.monotonic()
+        engine.run()
+        self.assertEqual([command for command, _ in commands], [None, 'profile', 'power'])
+        # The profile switch is handled while the power change is still settling
+        self.assertLess(commands[1][1] - started, 0.3)
+
+if __name__ == '__main__':
+    unittest.main()
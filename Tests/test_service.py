@@ -0,0 +1,171 @@
+# sd_notify protocol of the Linux daemon, against a local datagram socket standing in for systemd.
+#
+#   python3 -m unittest discover -s Tests
+import os
+import sys
+import time
+import shutil
+import socket
+import signal
+import tempfile
+import threading
+import unittest
+import subprocess
+from configparser import ConfigParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'Linux'))
+from Assets.Service import Notifier, Daemon
+
+class NotifySocket:
+    def __init__(self, address):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(address)
+
+    def messages(self, timeout=0.2):
+        # Every datagram that arrives until the socket has been quiet for `timeout`
+        received = []
+        self.sock.settimeout(timeout)
+        try:
+            while True:
+                received.append(self.sock.recv(4096).decode())
+        except socket.timeout:
+            return received
+
+    def close(self):
+        self.sock.close()
+
+class FakeContext:
+    def __init__(self, directory, mode='Balance', reapply='1', interval='30'):
+        self.path = os.path.join(directory, 'config.ini')
+        self.write(mode, reapply, interval)
+        self.boot_path = os.path.join(directory, 'boot.argv')
+        self.pid_path = os.path.join(directory, 'daemon.pid')
+        self.config = None
+        self.returncode = 0
+        self.applied = []
+
+    def write(self, mode, reapply='1', interval='30'):
+        cfg = ConfigParser()
+        cfg.read_dict({'User': {'Mode': mode}, 'Settings': {'ReApply': reapply, 'Time': interval}})
+        with open(self.path, 'w') as f:
+            cfg.write(f)
+
+    @property
+    def cfg(self):
+        if self.config is None:
+            self.config = ConfigParser()
+            self.config.read(self.path)
+        return self.config
+
+    def resolve(self, mode):
+        return (f"--{mode.lower()}",)
+
+    def ryzenadj_run(self, argv):
+        self.applied.append(argv)
+        return subprocess.CompletedProcess(argv, self.returncode, '', 'SMU rejected' if self.returncode else '')
+
+class NotifierTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def test_path_socket(self):
+        address = os.path.join(self.directory, 'notify')
+        listener = NotifySocket(address)
+        notifier = Notifier({'NOTIFY_SOCKET': address})
+        self.assertTrue(notifier.send('READY=1', 'STATUS=up'))
+        self.assertEqual(listener.messages(), ['READY=1\nSTATUS=up'])
+        notifier.close()
+        listener.close()
+
+    def test_abstract_socket(self):
+        name = f"uxtu4unix-test-{os.getpid()}"
+        listener = NotifySocket('\0' + name)
+        notifier = Notifier({'NOTIFY_SOCKET': '@' + name})
+        self.assertTrue(notifier.send('WATCHDOG=1'))
+        self.assertEqual(listener.messages(), ['WATCHDOG=1'])
+        notifier.close()
+        listener.close()
+
+    def test_without_socket(self):
+        notifier = Notifier({})
+        self.assertFalse(notifier.send('READY=1'))
+        self.assertIsNone(notifier.watchdog)
+
+    def test_watchdog_interval(self):
+        self.assertEqual(Notifier({'WATCHDOG_USEC': '30000000'}).watchdog, 15)
+        self.assertEqual(Notifier({'WATCHDOG_USEC': '30000000', 'WATCHDOG_PID': str(os.getpid())}).watchdog, 15)
+        self.assertIsNone(Notifier({'WATCHDOG_USEC': '30000000', 'WATCHDOG_PID': '1'}).watchdog)
+        self.assertIsNone(Notifier({'WATCHDOG_USEC': '0'}).watchdog)
+
+class DaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        address = os.path.join(self.directory, 'notify')
+        self.listener = NotifySocket(address)
+        self.notifier = Notifier({'NOTIFY_SOCKET': address, 'WATCHDOG_USEC': '2000000'})
+        self.ctx = FakeContext(self.directory)
+
+    def tearDown(self):
+        self.notifier.close()
+        self.listener.close()
+
+    def test_ready_after_first_apply(self):
+        daemon = Daemon(self.ctx, self.notifier)
+        daemon.load()
+        interval = daemon.tick(None)
+        messages = self.listener.messages()
+        self.assertTrue(messages[0].startswith('STATUS=Applied Balance'))
+        self.assertEqual(messages[1:], ['READY=1', 'WATCHDOG=1'])
+        self.assertEqual(self.ctx.applied, [('--balance',)])
+        # Woken at half the watchdog timeout, long before the 30 s reapply
+        self.assertEqual(interval, 1)
+        with open(self.ctx.boot_path) as f:
+            self.assertEqual(f.read(), '--balance\n')
+        daemon.tick(None)
+        self.assertEqual(self.listener.messages(), ['WATCHDOG=1'])
+        self.assertEqual(len(self.ctx.applied), 1)
+
+    def test_failed_apply_keeps_boot_argv(self):
+        self.ctx.returncode = 3
+        daemon = Daemon(self.ctx, self.notifier)
+        daemon.load()
+        daemon.tick(None)
+        self.assertIn('failed', self.listener.messages()[0])
+        self.assertFalse(os.path.exists(self.ctx.boot_path))
+
+    def test_reload(self):
+        daemon = Daemon(self.ctx, self.notifier)
+        daemon.load()
+        daemon.tick(None)
+        self.listener.messages()
+        self.ctx.write('Eco')
+        daemon.tick('reload')
+        messages = self.listener.messages()
+        self.assertTrue(messages[0].startswith('RELOADING=1\nMONOTONIC_USEC='))
+        self.assertTrue(messages[1].startswith('STATUS=Applied Eco'))
+        self.assertEqual(messages[2:], ['READY=1', 'WATCHDOG=1'])
+        # A config that no longer resolves keeps the last good preset
+        self.ctx.write('')
+        daemon.tick('reload')
+        self.assertEqual(self.ctx.applied[-1], ('--eco',))
+
+    def test_signals(self):
+        daemon = Daemon(self.ctx, self.notifier)
+        pid = os.getpid()
+        threading.Timer(0.2, os.kill, (pid, signal.SIGHUP)).start()
+        threading.Timer(0.5, os.kill, (pid, signal.SIGTERM)).start()
+        started = time.monotonic()
+        daemon.run()
+        self.assertLess(time.monotonic() - started, 5)
+        messages = self.listener.messages()
+        self.assertIn('READY=1', messages)
+        self.assertTrue(any(message.startswith('RELOADING=1') for message in messages))
+        self.assertEqual(messages[-1], 'STOPPING=1')
+        self.assertEqual(len(self.ctx.applied), 2)
+        self.assertFalse(os.path.exists(self.ctx.pid_path))
+        self.assertEqual(signal.getsignal(signal.SIGTERM), signal.SIG_DFL)
+
+if __name__ == '__main__':
+    unittest.main()
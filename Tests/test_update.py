@@ -0,0 +1,125 @@
+# Update check against a local stand-in for the GitHub releases API.
+#
+#   python3 -m unittest discover -s Tests
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'Linux'))
+from Assets.Update import UpdateChecker, parse_version, compare_versions, CACHE_TTL
+
+class ReleaseHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        etag = f'"{server.tag}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({'tag_name': server.tag, 'body': f"Changes in {server.tag}"}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class UpdateCheckerTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        self.cache_path = os.path.join(directory, 'update.json')
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ReleaseHandler)
+        self.server.requests = []
+        self.server.tag = '0.4.0'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/releases/latest"
+
+    def checker(self, local='0.3.2'):
+        return UpdateChecker(local, self.cache_path, self.url)
+
+    def expire_cache(self):
+        with open(self.cache_path) as f:
+            cache = json.load(f)
+        cache['checked'] -= CACHE_TTL + 1
+        with open(self.cache_path, 'w') as f:
+            json.dump(cache, f)
+
+    def test_fetch_and_status(self):
+        checker = self.checker()
+        checker.run()
+        self.assertIsNone(checker.error)
+        self.assertEqual((checker.latest_version, checker.changelog, checker.status()), ('0.4.0', 'Changes in 0.4.0', 'update'))
+        background = self.checker('0.5.0').start()
+        background.wait(5)
+        self.assertTrue(background.done())
+        self.assertEqual(background.status(), 'beta')
+        self.assertNotIn('If-None-Match', self.server.requests[0])
+
+    def test_cache_ttl(self):
+        self.checker().run()
+        checker = self.checker('0.4.0')
+        checker.run()
+        # Inside the 6 hours the cached answer serves without a request
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(checker.status(), 'current')
+        self.expire_cache()
+        self.checker().run()
+        self.assertEqual(len(self.server.requests), 2)
+        self.checker().run(force=True)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_etag_not_modified(self):
+        self.checker().run()
+        self.expire_cache()
+        checker = self.checker()
+        checker.run()
+        self.assertEqual(self.server.requests[-1].get('If-None-Match'), '"0.4.0"')
+        self.assertIsNone(checker.error)
+        self.assertEqual(checker.latest_version, '0.4.0')
+        # A 304 restarts the TTL
+        self.checker().run()
+        self.assertEqual(len(self.server.requests), 2)
+        # A new release has a new ETag and comes back in full
+        self.server.tag = '0.4.1'
+        self.expire_cache()
+        checker = self.checker()
+        checker.run()
+        self.assertEqual(checker.latest_version, '0.4.1')
+
+    def test_cache_from_other_url_ignored(self):
+        self.checker().run()
+        other = UpdateChecker('0.3.2', self.cache_path, self.url + '?other')
+        other.run()
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertNotIn('If-None-Match', self.server.requests[1])
+
+    def test_unreachable(self):
+        checker = UpdateChecker('0.3.2', self.cache_path, 'http://127.0.0.1:1/', timeout=1)
+        checker.run()
+        self.assertIsNotNone(checker.error)
+        self.assertIsNone(checker.status())
+
+class VersionTest(unittest.TestCase):
+    def test_ordering(self):
+        ordered = ['0.3.2', '0.3.9', '0.3.10', '0.4.0-beta1', '0.4.0-beta2', '0.4.0', '1.0']
+        self.assertEqual(sorted(reversed(ordered), key=parse_version), ordered)
+
+    def test_equal(self):
+        self.assertEqual(compare_versions('v0.4.0', '0.4'), 0)
+        self.assertEqual(compare_versions('0.3.10', '0.3.9'), 1)
+        self.assertEqual(compare_versions('0.4.0-beta1', '0.4.0'), -1)
+
+if __name__ == '__main__':
+    unittest.main()
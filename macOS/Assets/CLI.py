@@ -0,0 +1,296 @@
+import os
+import sys
+import time
+
+USAGE = """Usage: UXTU4Unix.py [command] [options]
+
+Without a command the interactive menu starts.
+
+  apply [--preset <mode>] [--args "<ryzenadj args>"]   Apply a preset (default: the mode in config.ini)
+  status [--json]                                      Show the configured preset and what the SMU reports
+  watch [--interval <seconds>]                         Print power, temperature and clock readings until Ctrl+C
+  probe [--json]                                       Show what hardware detection finds
+  agent [--bind <address>] [--port <port>]             Serve apply, rollback and status requests from a fleet controller
+  fleet <status|apply|rollback> --hosts <host[:port],...|file> [--preset <mode>] [--args "<ryzenadj args>"]
+        [--parallel <n>] [--canary <n>] [--max-failures <n>] [--timeout <seconds>] [--key-file <file>] [--json]
+                                                       Send a command to many agents and print one report
+"""
+# Resolved ryzenadj arguments per preset class and mode, so apply does not load the catalog
+ARGV_CACHE = 'argv.cache'
+
+class UsageError(Exception):
+    pass
+
+def parse_options(argv, flags=()):
+    options = {}
+    args = iter(argv)
+    for arg in args:
+        if not arg.startswith('--'):
+            raise UsageError(f"Unexpected argument: {arg}")
+        key, equals, value = arg.partition('=')
+        if key in flags:
+            options[key] = True
+        elif equals:
+            options[key] = value
+        else:
+            value = next(args, None)
+            if value is None:
+                raise UsageError(f"{key} needs a value")
+            options[key] = value
+    return options
+
+def read_argv_cache(path):
+    # class \t mode \t Presets.json mtime \t args
+    entries = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) == 4:
+                    entries[fields[0], fields[1]] = (fields[2], fields[3])
+    except OSError:
+        pass
+    return entries
+
+def write_argv_cache(path, entries):
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            for (preset_class, mode), (stamp, args) in sorted(entries.items()):
+                f.write(f"{preset_class}\t{mode}\t{stamp}\t{args}\n")
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+class Context:
+    def __init__(self, app_dir, version):
+        self.app_dir = app_dir
+        self.version = version
+        self.assets = os.path.join(app_dir, 'Assets')
+        self.ryzenadj = os.path.join(self.assets, 'ryzenadj')
+        self.presets_path = os.path.join(self.assets, 'Presets.json')
+        self.cache_path = os.path.join(self.assets, ARGV_CACHE)
+        self.config = None
+
+    @property
+    def cfg(self):
+        if self.config is None:
+            from Assets.Config import ConfigStore
+            self.config = ConfigStore(os.path.join(self.assets, 'config.ini')).load()
+        return self.config
+
+    def preset_class(self):
+        preset_class = self.cfg.get('User', 'Preset', fallback='')
+        if not preset_class:
+            from Assets.Classifier import classify_presets
+            preset_class = classify_presets(self.cfg.get('Info', 'CPU', fallback=''), self.cfg.get('Info', 'Family', fallback=''),
+                                            self.cfg.get('Info', 'Type', fallback=''))
+        return preset_class
+
+    def resolve(self, mode):
+        if mode == 'Custom':
+            return tuple(self.cfg.get('User', 'CustomArgs', fallback='').split())
+        preset_class = self.preset_class()
+        stamp = str(os.stat(self.presets_path).st_mtime_ns)
+        entries = read_argv_cache(self.cache_path)
+        cached = entries.get((preset_class, mode))
+        if cached and cached[0] == stamp:
+            return tuple(cached[1].split())
+        from Assets.Catalog import PresetCatalog, render_args
+        try:
+            args = render_args(PresetCatalog(self.presets_path).params(preset_class, mode))
+        except KeyError:
+            raise UsageError(f"No preset {mode!r} for {preset_class or 'this CPU'}")
+        entries[preset_class, mode] = (stamp, args)
+        write_argv_cache(self.cache_path, entries)
+        return tuple(args.split())
+
+    def ryzenadj_run(self, argv):
+        # One-shot: no SMU helper to start when a udev rule or login hook applies a single preset
+        import subprocess
+        if os.geteuid() == 0:
+            command, password = [self.ryzenadj], None
+        else:
+            command, password = ["sudo", "-S", self.ryzenadj], f"{self.cfg.get('User', 'Password', fallback='')}\n".encode()
+        result = subprocess.run(command + list(argv), input=password, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        return subprocess.CompletedProcess(argv, result.returncode, result.stdout.decode(errors='replace'), result.stderr.decode(errors='replace'))
+
+def cmd_apply(ctx, argv, started):
+    options = parse_options(argv)
+    if '--args' in options:
+        mode, ryzenadj_args = 'Custom', tuple(options['--args'].split())
+    else:
+        mode = options.get('--preset') or ctx.cfg.get('User', 'Mode', fallback='')
+        if not mode:
+            raise UsageError("No --preset given and no mode in config.ini")
+        ryzenadj_args = ctx.resolve(mode)
+    resolved = time.perf_counter()
+    result = ctx.ryzenadj_run(ryzenadj_args)
+    done = time.perf_counter()
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr or f"ryzenadj exited with {result.returncode}\n")
+        return result.returncode
+    print(f"Applied {mode} in {(done - started) * 1000:.1f} ms "
+          f"(startup {(resolved - started) * 1000:.1f} ms, ryzenadj {(done - resolved) * 1000:.1f} ms)")
+    return 0
+
+def read_smu(ctx, run):
+    from Assets.SMU import parse_info, LIMIT_ROWS
+    from Assets.Telemetry import CHANNEL_NAMES, sample_values
+    result = run(('-i',))
+    if result.returncode != 0:
+        return None, None, (result.stderr.strip() or f"ryzenadj exited with {result.returncode}")
+    rows = parse_info(result.stdout)
+    limits = {option: rows[row] * scale for option, (row, scale) in LIMIT_ROWS.items() if row in rows}
+    readings = {name: value for name, value in zip(CHANNEL_NAMES, sample_values(result.stdout)) if value == value}
+    return limits, readings, None
+
+def cmd_status(ctx, argv, started):
+    options = parse_options(argv, flags=('--json',))
+    cfg = ctx.cfg
+    limits, readings, error = read_smu(ctx, ctx.ryzenadj_run)
+    status = {
+        'version': ctx.version,
+        'preset': ctx.preset_class(),
+        'mode': cfg.get('User', 'Mode', fallback=''),
+        'reapply': cfg.get('Settings', 'ReApply', fallback='0') == '1',
+        'dynamic': cfg.get('Settings', 'DynamicMode', fallback='0') == '1',
+        'limits': limits,
+        'readings': readings,
+        'error': error,
+    }
+    if options.get('--json'):
+        import json
+        print(json.dumps(status, indent=2))
+        return 0 if error is None else 1
+    print(f"UXTU4Unix {status['version']}")
+    print(f"Preset: {status['mode'] or '-'} ({status['preset'] or 'unknown class'})")
+    print(f"Auto reapply: {'Enabled' if status['reapply'] else 'Disabled'}, Dynamic mode: {'Enabled' if status['dynamic'] else 'Disabled'}")
+    if error:
+        print(f"SMU: {error}")
+        return 1
+    for option, value in limits.items():
+        print(f"  {option}: {value:g}")
+    for name, value in readings.items():
+        print(f"  {name}: {value:g}")
+    return 0
+
+def cmd_watch(ctx, argv, started):
+    options = parse_options(argv)
+    interval = float(options.get('--interval', '1'))
+    from Assets.SMU import SMUHelper
+    # Repeated reads go through the helper, so sudo runs once
+    smu = SMUHelper(ctx.ryzenadj, ctx.cfg.get('User', 'Password', fallback=''))
+    try:
+        while True:
+            _, readings, error = read_smu(ctx, smu.run)
+            stamp = time.strftime('%H:%M:%S')
+            if error:
+                print(f"{stamp} {error}", flush=True)
+            else:
+                value = lambda name, unit: f"{readings[name]:.1f} {unit}" if name in readings else "-"
+                print(f"{stamp} STAPM {value('stapm_value', 'W')} / {value('stapm_limit', 'W')}  "
+                      f"PPT fast {value('ppt_fast_value', 'W')}  Tctl {value('tctl_value', 'C')}  "
+                      f"Clock {value('core_clock_avg', 'GHz')} avg, {value('core_clock_max', 'GHz')} max", flush=True)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        smu.close()
+
+def cmd_probe(ctx, argv, started):
+    options = parse_options(argv, flags=('--json',))
+    from Assets.Probe import HardwareProbe
+    from Assets.Classifier import classify_codename, classify_presets
+    bundled = os.path.join(ctx.assets, 'dmidecode')
+    probe = HardwareProbe(bundled if os.path.exists(bundled) else 'dmidecode', ctx.cfg.get('User', 'Password', fallback=''))
+    info = probe.probe()
+    info['Fingerprint'] = probe.fingerprint()
+    if info.get('CPU') and info.get('Signature'):
+        info['Architecture'], info['Family'], info['Type'] = classify_codename(info['CPU'], info['Signature'])
+        info['Preset'] = classify_presets(info['CPU'], info['Family'], info['Type'])
+    if options.get('--json'):
+        import json
+        print(json.dumps(info, indent=2))
+    else:
+        for key, value in info.items():
+            print(f"{key}: {value}")
+    return 0
+
+def cmd_agent(ctx, argv, started):
+    options = parse_options(argv)
+    from Assets.Fleet import PORT, Agent, AgentServer, load_key
+    bind = options.get('--bind') or ctx.cfg.get('Fleet', 'Bind', fallback='127.0.0.1')
+    port = int(options.get('--port') or ctx.cfg.get('Fleet', 'Port', fallback=str(PORT)))
+    server = AgentServer(Agent(ctx), load_key(ctx.cfg, create=True), (bind, port))
+    print(f"Agent listening on {bind}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+def read_hosts(value, port):
+    from Assets.Fleet import parse_host
+    if os.path.isfile(value):
+        with open(value) as f:
+            names = [line.split('#', 1)[0].strip() for line in f]
+    else:
+        names = value.split(',')
+    hosts = [parse_host(name, port) for name in names if name.strip()]
+    if not hosts:
+        raise UsageError("No hosts given")
+    return hosts
+
+def cmd_fleet(ctx, argv, started):
+    action = argv[0] if argv else None
+    options = parse_options(argv[1:], flags=('--json',))
+    from Assets.Fleet import PORT, TIMEOUT, Controller, load_key, parse_key, format_report, summarize
+    if action not in ('status', 'apply', 'rollback'):
+        raise UsageError("fleet needs status, apply or rollback")
+    if '--hosts' not in options:
+        raise UsageError("fleet needs --hosts")
+    if '--key-file' in options:
+        with open(options['--key-file']) as f:
+            key = parse_key(f.read().strip())
+    else:
+        key = load_key(ctx.cfg)
+    controller = Controller(read_hosts(options['--hosts'], int(ctx.cfg.get('Fleet', 'Port', fallback=str(PORT)))), key,
+                            parallel=int(options.get('--parallel', '8')), timeout=float(options.get('--timeout', TIMEOUT)))
+    aborted = False
+    if action == 'status':
+        results = controller.status()
+    elif action == 'rollback':
+        results = controller.rollback()
+    else:
+        if '--args' in options:
+            payload = {'command': 'apply', 'args': options['--args']}
+        elif '--preset' in options:
+            payload = {'command': 'apply', 'mode': options['--preset']}
+        else:
+            raise UsageError("fleet apply needs --preset or --args")
+        results, aborted = controller.rollout(payload, canary=int(options.get('--canary', '1')),
+                                              max_failures=int(options.get('--max-failures', '0')))
+    if options.get('--json'):
+        import json
+        print(json.dumps({'command': action, 'aborted': aborted, 'summary': summarize(results), 'hosts': results}, indent=2))
+    else:
+        print(format_report(results, aborted))
+    return 0 if not aborted and all(result['ok'] for result in results) else 1
+
+COMMANDS = {'apply': cmd_apply, 'status': cmd_status, 'watch': cmd_watch, 'probe': cmd_probe, 'agent': cmd_agent, 'fleet': cmd_fleet}
+
+def main(argv, app_dir, version, started):
+    if argv[0] in ('-h', '--help', 'help'):
+        print(USAGE, end='')
+        return 0
+    command = COMMANDS.get(argv[0])
+    try:
+        if command is None:
+            raise UsageError(f"Unknown command: {argv[0]}")
+        return command(Context(app_dir, version), argv[1:], started)
+    except UsageError as e:
+        sys.stderr.write(f"{e}\n\n{USAGE}")
+        return 2
@@ -0,0 +1,66 @@
+import os
+import re
+import json
+
+CATALOG_VERSION = 1
+PARAMETER = re.compile(r'^[a-z0-9][a-z0-9_-]*$')
+
+class CatalogError(ValueError):
+    pass
+
+def render_args(params):
+    return ' '.join(f"--{name}" if value is True else f"--{name}={value}" for name, value in params.items())
+
+def validate(data):
+    if not isinstance(data, dict) or data.get('version') != CATALOG_VERSION:
+        raise CatalogError(f"Unsupported preset catalog version: {data.get('version') if isinstance(data, dict) else None}")
+    presets = data.get('presets')
+    if not isinstance(presets, dict) or not presets:
+        raise CatalogError("Preset catalog has no presets")
+    for preset_class, modes in presets.items():
+        if not isinstance(modes, dict) or not modes:
+            raise CatalogError(f"{preset_class}: no modes")
+        for mode, params in modes.items():
+            if not isinstance(params, dict):
+                raise CatalogError(f"{preset_class}/{mode}: parameters must be a mapping")
+            for name, value in params.items():
+                if not PARAMETER.match(name):
+                    raise CatalogError(f"{preset_class}/{mode}: invalid parameter {name!r}")
+                # bool is an int subclass, so check it first: only True marks a bare flag
+                if isinstance(value, bool) and not value or not isinstance(value, int) or value < 0:
+                    raise CatalogError(f"{preset_class}/{mode}: invalid value for {name}: {value!r}")
+    return presets
+
+class PresetCatalog:
+    def __init__(self, path):
+        self.path = path
+        self.mtime = None
+        self.data = None
+        self.rendered = {}
+
+    def load(self):
+        mtime = os.stat(self.path).st_mtime_ns
+        if self.data is None or mtime != self.mtime:
+            with open(self.path) as f:
+                self.data = validate(json.load(f))
+            self.mtime = mtime
+            self.rendered = {}
+        return self.data
+
+    def classes(self):
+        return list(self.load())
+
+    def params(self, preset_class, mode):
+        return self.load()[preset_class][mode]
+
+    def presets(self, preset_class):
+        # Rendered CLI strings, keyed like the old per-module PRESETS dicts
+        data = self.load()
+        if preset_class not in self.rendered:
+            self.rendered[preset_class] = {mode: render_args(params) for mode, params in data[preset_class].items()}
+        return self.rendered[preset_class]
+
+    def diff(self, preset_class, mode_a, mode_b, class_b=None):
+        a = self.params(preset_class, mode_a)
+        b = self.params(class_b or preset_class, mode_b)
+        return {name: (a.get(name), b.get(name)) for name in list(a) + [n for n in b if n not in a] if a.get(name) != b.get(name)}
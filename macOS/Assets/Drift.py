@@ -0,0 +1,75 @@
+import math
+from Assets.SMU import LIMIT_ROWS, parse_info, parse_args
+
+class AdaptiveInterval:
+    def __init__(self, base, min_interval=None, max_interval=None, stable_checks=3):
+        self.base = max(1, int(base))
+        self.min_interval = min_interval or max(1, self.base // 4)
+        self.max_interval = max_interval or self.base * 4
+        self.stable_checks = stable_checks
+        self.current = self.base
+        self.stable = 0
+
+    def on_stable(self):
+        self.stable += 1
+        if self.stable >= self.stable_checks:
+            self.current = min(self.max_interval, self.current * 2)
+            self.stable = 0
+        return self.current
+
+    def on_drift(self):
+        self.stable = 0
+        self.current = max(self.min_interval, self.current // 2)
+        return self.current
+
+class DriftMonitor:
+    def __init__(self, interval, tolerance=0.01):
+        self.interval = AdaptiveInterval(interval)
+        self.tolerance = tolerance
+        self.argv = None
+        self.expected = {}
+        self.clamped = {}
+
+    def matches(self, expected, actual):
+        return abs(actual - expected) <= max(0.01, abs(expected) * self.tolerance)
+
+    def applied(self, argv, info_text):
+        # Compare against what the SMU accepted, so limits clamped by firmware do not count as drift
+        self.argv = list(argv)
+        self.expected = {}
+        self.clamped = {}
+        readings = parse_info(info_text)
+        for option, value in parse_args(argv).items():
+            if option not in LIMIT_ROWS:
+                continue
+            row, scale = LIMIT_ROWS[option]
+            actual = readings.get(row, math.nan)
+            if math.isnan(actual):
+                continue
+            target = value / scale
+            self.expected[option] = target if self.matches(target, actual) else actual
+            if self.expected[option] != target:
+                self.clamped[option] = (target, actual)
+
+    def tracking(self, argv):
+        return self.argv == list(argv) and bool(self.expected)
+
+    def check(self, info_text):
+        readings = parse_info(info_text)
+        drifted = []
+        for option, expected in self.expected.items():
+            actual = readings.get(LIMIT_ROWS[option][0], math.nan)
+            if not math.isnan(actual) and not self.matches(expected, actual):
+                drifted.append((option, expected, actual))
+        if drifted:
+            self.interval.on_drift()
+        else:
+            self.interval.on_stable()
+        return drifted
+
+    @property
+    def next_interval(self):
+        return self.interval.current
+
+def describe(drifted):
+    return ", ".join(f"{option} (expected {expected:g}, got {actual:g})" for option, expected, actual in drifted)
@@ -0,0 +1,158 @@
+import os
+import time
+from collections import namedtuple
+
+LEVELS = ['Eco', 'Balance', 'Performance', 'Extreme']
+# The Framework 13/16 7040 classes name the upper levels BalPreset, PerformancePreset and ExtremePreset
+LEVEL_NAMES = {
+    'Balance': ('Balance', 'BalPreset'),
+    'Performance': ('Performance', 'PerformancePreset'),
+    'Extreme': ('Extreme', 'ExtremePreset'),
+}
+# Demand (0-100) needed to step up into Balance, Performance and Extreme
+THRESHOLDS = (25, 50, 75)
+HYSTERESIS = 10
+DWELL_UP = 6
+DWELL_DOWN = 30
+# Seconds between load samples while the load strategy runs
+SAMPLE_INTERVAL = 2
+# A single saturated core (a compile step, a game's main thread) counts as half of full demand
+BUSIEST_WEIGHT = 0.5
+
+LoadSample = namedtuple('LoadSample', ['utilization', 'busiest', 'pressure', 'demand'])
+
+def parse_proc_stat(text):
+    # cpu name -> (busy jiffies, total jiffies); iowait counts as idle
+    times = {}
+    for line in text.splitlines():
+        if not line.startswith('cpu'):
+            break
+        fields = line.split()
+        values = [int(value) for value in fields[1:9]]
+        idle = values[3] + values[4]
+        times[fields[0]] = (sum(values) - idle, sum(values))
+    return times
+
+def parse_psi(text):
+    # "some avg10=1.23 avg60=..." -> {'some': 1.23, 'full': ...}
+    pressure = {}
+    for line in text.splitlines():
+        kind, *fields = line.split()
+        values = dict(field.split('=', 1) for field in fields)
+        if 'avg10' in values:
+            pressure[kind] = float(values['avg10'])
+    return pressure
+
+class ProcLoad:
+    def __init__(self, root='/proc'):
+        # Opened once and re-read with pread; procfs regenerates the text at offset 0
+        self.stat = os.open(os.path.join(root, 'stat'), os.O_RDONLY)
+        try:
+            self.psi = os.open(os.path.join(root, 'pressure', 'cpu'), os.O_RDONLY)
+        except OSError:
+            self.psi = None
+        self.previous = parse_proc_stat(self.read(self.stat))
+
+    @staticmethod
+    def read(fd):
+        chunks = []
+        offset = 0
+        while True:
+            chunk = os.pread(fd, 65536, offset)
+            if not chunk:
+                return b''.join(chunks).decode()
+            chunks.append(chunk)
+            offset += len(chunk)
+
+    def sample(self):
+        current = parse_proc_stat(self.read(self.stat))
+        usage = {}
+        for cpu, (busy, total) in current.items():
+            last_busy, last_total = self.previous.get(cpu, (busy, total))
+            usage[cpu] = 100 * (busy - last_busy) / (total - last_total) if total > last_total else 0.0
+        self.previous = current
+        cores = [value for cpu, value in usage.items() if cpu != 'cpu']
+        pressure = parse_psi(self.read(self.psi)).get('some', 0.0) if self.psi is not None else 0.0
+        utilization = usage.get('cpu', 0.0)
+        busiest = max(cores, default=utilization)
+        return LoadSample(utilization, busiest, pressure, max(utilization, pressure, busiest * BUSIEST_WEIGHT))
+
+    def close(self):
+        for fd in (self.stat, self.psi):
+            if fd is not None:
+                os.close(fd)
+        self.stat = self.psi = None
+
+class LoadAverage:
+    # Fallback where /proc/stat is missing (macOS): one-minute load average per CPU
+    def __init__(self):
+        self.cpus = os.cpu_count() or 1
+
+    def sample(self):
+        utilization = min(100.0, 100 * os.getloadavg()[0] / self.cpus)
+        return LoadSample(utilization, utilization, 0.0, utilization)
+
+    def close(self):
+        pass
+
+def open_load(root='/proc'):
+    try:
+        return ProcLoad(root)
+    except OSError:
+        return LoadAverage()
+
+def parse_numbers(text, count, fallback):
+    try:
+        values = tuple(float(value) for value in text.split(','))
+    except (AttributeError, ValueError):
+        return fallback
+    return values if len(values) == count else fallback
+
+def preset_levels(modes):
+    # (index in LEVELS, mode name) for every level the preset class defines, lowest first
+    levels = []
+    for index, level in enumerate(LEVELS):
+        name = next((name for name in LEVEL_NAMES.get(level, (level,)) if name in modes), None)
+        if name is not None:
+            levels.append((index, name))
+    return levels
+
+class LoadPolicy:
+    # Steps one level at a time. Going up needs demand above the threshold for dwell_up
+    # seconds; going down needs it below threshold - hysteresis for dwell_down seconds,
+    # so short bursts and brief idles do not flap the preset.
+    def __init__(self, thresholds=THRESHOLDS, hysteresis=HYSTERESIS, dwell_up=DWELL_UP, dwell_down=DWELL_DOWN,
+                 levels=LEVELS, initial=None, clock=time.monotonic):
+        self.levels = levels
+        self.thresholds = thresholds
+        self.hysteresis = hysteresis
+        self.dwell_up = dwell_up
+        self.dwell_down = dwell_down
+        self.clock = clock
+        self.level = levels.index(initial) if initial in levels else 0
+        self.pending = None
+        self.since = None
+
+    @property
+    def mode(self):
+        return self.levels[self.level]
+
+    def wanted(self, demand):
+        if self.level + 1 < len(self.levels) and demand >= self.thresholds[self.level]:
+            return self.level + 1
+        if self.level > 0 and demand < self.thresholds[self.level - 1] - self.hysteresis:
+            return self.level - 1
+        return self.level
+
+    def update(self, demand, now=None):
+        now = self.clock() if now is None else now
+        wanted = self.wanted(demand)
+        if wanted == self.level:
+            self.pending = None
+            return self.mode
+        if wanted != self.pending:
+            self.pending, self.since = wanted, now
+        if now - self.since >= (self.dwell_up if wanted > self.level else self.dwell_down):
+            self.level = wanted
+            self.pending = None
+        return self.mode
@@ -0,0 +1,121 @@
+import os
+import json
+import gzip
+import time
+import shutil
+import logging
+import logging.handlers
+
+LOG_NAME = 'UXTU4Unix.log'
+MAX_BYTES = 1 << 20
+BACKUPS = 5
+# Start a new file at least daily, so old entries age out even when little is written
+MAX_AGE = 86400
+# A result that keeps repeating is still summarized at least this often
+DEDUP_WINDOW = 3600
+# Standard LogRecord attributes; anything passed through extra= becomes a field of the entry
+RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+def fields(record):
+    return {key: value for key, value in vars(record).items() if key not in RESERVED}
+
+class JsonFormatter(logging.Formatter):
+    # One JSON object per line: time, level, event, then the record's extra fields
+    def format(self, record):
+        entry = {'time': round(record.created, 3), 'level': record.levelname.lower(), 'event': record.getMessage()}
+        entry.update(fields(record))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class CompressingFileHandler(logging.handlers.RotatingFileHandler):
+    # Rolls over at max_bytes or once the current file is max_age old; rotated files are gzipped
+    def __init__(self, filename, max_bytes=MAX_BYTES, backups=BACKUPS, max_age=MAX_AGE):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backups, encoding='utf-8', delay=True)
+        self.max_age = max_age
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = self.compress
+        self.started = self.first_entry_time()
+
+    def first_entry_time(self):
+        # Appending across launches, so the file's age is its first entry's, not the process's
+        try:
+            with open(self.baseFilename, encoding='utf-8') as f:
+                return float(json.loads(f.readline())['time'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return time.time()
+
+    @staticmethod
+    def compress(source, dest):
+        with open(source, 'rb') as f, gzip.open(dest, 'wb') as compressed:
+            shutil.copyfileobj(f, compressed)
+        os.remove(source)
+
+    def shouldRollover(self, record):
+        if self.max_age and record.created - self.started >= self.max_age and os.path.exists(self.baseFilename):
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.started = time.time()
+
+class DedupHandler(logging.Handler):
+    # Records identical to the previous one (same event, level and fields) are only counted. The
+    # count is written as a copy of the record with `repeated` and `since` fields when a different
+    # record arrives, every `window` seconds while it keeps repeating, and on close.
+    def __init__(self, target, window=DEDUP_WINDOW):
+        super().__init__()
+        self.target = target
+        self.window = window
+        self.last = None
+        self.last_key = None
+        self.repeats = 0
+        self.since = 0.0
+
+    @staticmethod
+    def key(record):
+        return record.name, record.levelno, record.msg, record.args, fields(record)
+
+    def emit(self, record):
+        key = self.key(record)
+        if key == self.last_key:
+            self.repeats += 1
+            self.last = record
+            if record.created - self.since >= self.window:
+                self.summarize()
+            return
+        self.summarize()
+        self.last, self.last_key, self.since = record, key, record.created
+        self.target.handle(record)
+
+    def summarize(self):
+        if self.repeats:
+            summary = logging.makeLogRecord(dict(vars(self.last), repeated=self.repeats, since=round(self.since, 3)))
+            self.target.handle(summary)
+            self.repeats = 0
+            self.since = self.last.created
+
+    def flush(self):
+        self.target.flush()
+
+    def close(self):
+        self.acquire()
+        try:
+            self.summarize()
+        finally:
+            self.release()
+        self.target.close()
+        super().close()
+
+def setup_logging(log_dir, name='UXTU4Unix'):
+    # UI text goes through the root logger to the terminal only. Events go through `name` to a
+    # deduplicated, rotating JSON-lines file and never reach the terminal.
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[logging.StreamHandler()])
+    file_handler = CompressingFileHandler(os.path.join(log_dir, LOG_NAME))
+    file_handler.setFormatter(JsonFormatter())
+    event_log = logging.getLogger(name)
+    event_log.setLevel(logging.INFO)
+    event_log.propagate = False
+    event_log.addHandler(DedupHandler(file_handler))
+    return event_log
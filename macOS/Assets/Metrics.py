@@ -0,0 +1,155 @@
+import math
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from Assets.SMU import parse_args, LIMIT_ROWS
+from Assets.Telemetry import CHANNEL_NAMES
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+# name -> (type, help)
+DEFINITIONS = {
+    'uxtu4unix_info': ('gauge', "Active preset; always 1, the labels carry the value"),
+    'uxtu4unix_applies_total': ('counter', "Presets applied to the SMU"),
+    'uxtu4unix_requested_limit': ('gauge', "Limits in the applied preset, by ryzenadj option (ryzenadj units, e.g. mW)"),
+    'uxtu4unix_reapply_skipped_total': ('counter', "Reapplies skipped because the limits had not drifted"),
+    'uxtu4unix_drifts_total': ('counter', "Limits found changed by firmware or another tool, by ryzenadj option"),
+    'uxtu4unix_ryzenadj_errors_total': ('counter', "ryzenadj invocations that exited non-zero"),
+    'uxtu4unix_ryzenadj_duration_seconds': ('histogram', "ryzenadj invocation latency, including the SMU helper round trip"),
+    'uxtu4unix_smu': ('gauge', "Latest telemetry sample, by channel (W, A, C or GHz as reported by ryzenadj)"),
+    'uxtu4unix_smu_sample_timestamp_seconds': ('gauge', "Unix time of the latest telemetry sample"),
+}
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+def format_value(value):
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Metrics:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.values = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+        # Counters exist at 0 from the start, so rate() and absent() alerts work before the first event
+        for name, (kind, _) in DEFINITIONS.items():
+            if kind == 'counter' and name != 'uxtu4unix_drifts_total':
+                self.values[self.key(name, {})] = 0
+        for option in LIMIT_ROWS:
+            self.values[self.key('uxtu4unix_drifts_total', {'option': option})] = 0
+        self.histograms[self.key('uxtu4unix_ryzenadj_duration_seconds', {})] = ([0] * len(buckets), 0, 0.0)
+
+    @staticmethod
+    def key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        with self.lock:
+            key = self.key(name, labels)
+            self.values[key] = self.values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.values[self.key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        with self.lock:
+            key = self.key(name, labels)
+            buckets, count, total = self.histograms.get(key, ([0] * len(self.buckets), 0, 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    buckets[i] += 1
+            self.histograms[key] = (buckets, count + 1, total + value)
+
+    def applied(self, argv, **info):
+        with self.lock:
+            for key in [key for key in self.values if key[0] in ('uxtu4unix_info', 'uxtu4unix_requested_limit')]:
+                del self.values[key]
+            self.values[self.key('uxtu4unix_info', info)] = 1
+            for option, value in parse_args(argv).items():
+                self.values[self.key('uxtu4unix_requested_limit', {'option': option})] = value
+            key = self.key('uxtu4unix_applies_total', {})
+            self.values[key] = self.values.get(key, 0) + 1
+
+    def on_run(self, argv, returncode, seconds):
+        # SMUHelper observer
+        self.observe('uxtu4unix_ryzenadj_duration_seconds', seconds)
+        if returncode != 0:
+            self.inc('uxtu4unix_ryzenadj_errors_total')
+
+    def append(self, timestamp, values):
+        # TelemetrySampler sink
+        with self.lock:
+            for channel, value in zip(CHANNEL_NAMES, values):
+                self.values[self.key('uxtu4unix_smu', {'channel': channel})] = value
+            self.values[self.key('uxtu4unix_smu_sample_timestamp_seconds', {})] = timestamp
+
+    def render(self):
+        with self.lock:
+            values = dict(self.values)
+            histograms = {key: (list(buckets), count, total) for key, (buckets, count, total) in self.histograms.items()}
+        lines = []
+        for name in sorted({key[0] for key in values} | {key[0] for key in histograms}):
+            kind, help_text = DEFINITIONS.get(name, ('untyped', ''))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (_, labels), value in sorted((key, value) for key, value in values.items() if key[0] == name):
+                lines.append(f"{name}{format_labels(dict(labels))} {format_value(value)}")
+            for (_, labels), (buckets, count, total) in sorted(item for item in histograms.items() if item[0][0] == name):
+                labels = dict(labels)
+                for bound, cumulative in zip(self.buckets, buckets):
+                    lines.append(f"{name}_bucket{format_labels({**labels, 'le': format_value(bound)})} {cumulative}")
+                lines.append(f"{name}_bucket{format_labels({**labels, 'le': '+Inf'})} {count}")
+                lines.append(f"{name}_sum{format_labels(labels)} {format_value(total)}")
+                lines.append(f"{name}_count{format_labels(labels)} {count}")
+        return '\n'.join(lines) + '\n'
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsServer:
+    # Scrapes are answered on their own threads; the reapply loop only ever takes the registry lock
+    def __init__(self, metrics, port, host='127.0.0.1'):
+        self.metrics = metrics
+        self.address = (host, port)
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        if self.server is None:
+            self.server = ThreadingHTTPServer(self.address, MetricsHandler)
+            self.server.daemon_threads = True
+            self.server.metrics = self.metrics
+            self.thread = threading.Thread(target=self.server.serve_forever, name='metrics', daemon=True)
+            self.thread.start()
+        return self
+
+    @property
+    def port(self):
+        return self.server.server_address[1] if self.server else self.address[1]
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            self.thread = None
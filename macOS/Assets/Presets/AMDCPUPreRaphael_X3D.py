@@ -1,8 +0,0 @@
-PRESETS = {
-    "Eco": "--tctl-temp=85",
-    "Balance": "--tctl-temp=85",
-    "Performance": "--tctl-temp=85",
-    "Extreme": "--tctl-temp=85",
-    "AC": "--max-performance",
-    "DC": "--power-saving"
-}
@@ -1,8 +0,0 @@
-PRESETS = {
-    "Eco": "--tctl-temp=95",
-    "Balance": "--tctl-temp=95",
-    "Performance": "--tctl-temp=95",
-    "Extreme": "--tctl-temp=95",
-    "AC": "--max-performance",
-    "DC": "--power-saving"
-}
@@ -0,0 +1,140 @@
+import os
+import sys
+import hashlib
+import subprocess
+
+DMI_TABLE = '/sys/firmware/dmi/tables/DMI'
+# dmidecode field -> config.ini [Info] key
+DMI_FIELDS = {
+    'Version': 'CPU',
+    'Signature': 'Signature',
+    'Voltage': 'Voltage',
+    'Max Speed': 'Max Speed',
+    'Current Speed': 'Current Speed',
+    'Core Count': 'Core Count',
+    'Core Enabled': 'Core Enabled',
+    'Thread Count': 'Thread Count',
+}
+CPUINFO_FIELDS = ['model name', 'cpu family', 'model', 'stepping', 'microcode']
+SYSCTL_FIELDS = ['machdep.cpu.brand_string', 'machdep.cpu.family', 'machdep.cpu.model',
+                 'machdep.cpu.stepping', 'machdep.cpu.microcode_version', 'kern.uuid']
+
+def parse_dmidecode(text):
+    info = {}
+    for line in text.splitlines():
+        key, sep, value = line.strip().partition(': ')
+        # Only the first processor matters; later sockets repeat the same keys
+        if sep and key in DMI_FIELDS and DMI_FIELDS[key] not in info:
+            info[DMI_FIELDS[key]] = value.strip()
+    return info
+
+def parse_cpuinfo(text):
+    info = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(':')
+        if not sep:
+            if info:
+                break
+            continue
+        info.setdefault(key.strip(), value.strip())
+    return info
+
+def signature_from_cpuid(eax):
+    stepping = eax & 0xF
+    model = (eax >> 4) & 0xF
+    family = (eax >> 8) & 0xF
+    if family in (0x6, 0xF):
+        model += ((eax >> 16) & 0xF) << 4
+    if family == 0xF:
+        family += (eax >> 20) & 0xFF
+    return f"Family {family}, Model {model}, Stepping {stepping}"
+
+def decode_processor(record, strings):
+    def string(index):
+        return strings[index - 1].decode(errors='replace').strip() if 0 < index <= len(strings) else ''
+
+    def word(offset):
+        return int.from_bytes(record[offset:offset + 2], 'little')
+
+    info = {'CPU': string(record[0x10]) if len(record) > 0x10 else ''}
+    if len(record) >= 0x1A:
+        info['Signature'] = signature_from_cpuid(int.from_bytes(record[0x08:0x0C], 'little'))
+        voltage = record[0x11]
+        if voltage & 0x80:
+            info['Voltage'] = f"{(voltage & 0x7F) / 10:.1f} V"
+        else:
+            info['Voltage'] = ' '.join(v for bit, v in ((0, '5.0 V'), (1, '3.3 V'), (2, '2.9 V')) if voltage & (1 << bit))
+        info['Max Speed'] = f"{word(0x14)} MHz"
+        info['Current Speed'] = f"{word(0x16)} MHz"
+    if len(record) > 0x25:
+        counts = [record[0x23], record[0x24], record[0x25]]
+        if len(record) >= 0x30:
+            counts = [word(0x2A + 2 * i) if count == 0xFF else count for i, count in enumerate(counts)]
+        info['Core Count'], info['Core Enabled'], info['Thread Count'] = (str(count) for count in counts)
+    return info
+
+def parse_dmi_table(data):
+    offset = 0
+    while offset + 4 <= len(data):
+        kind, length = data[offset], data[offset + 1]
+        if length < 4:
+            break
+        end = data.find(b'\0\0', offset + length)
+        if end < 0:
+            break
+        if kind == 4:
+            return decode_processor(data[offset:offset + length], data[offset + length:end].split(b'\0'))
+        if kind == 127:
+            break
+        offset = end + 2
+    return {}
+
+def read_text(path):
+    try:
+        with open(path, errors='replace') as f:
+            return f.read()
+    except OSError:
+        return ''
+
+class HardwareProbe:
+    def __init__(self, dmidecode='dmidecode', password='', root='/'):
+        self.dmidecode = dmidecode
+        self.password = password
+        self.root = root
+
+    def path(self, path):
+        return os.path.join(self.root, path.lstrip('/'))
+
+    def cpuinfo(self):
+        return parse_cpuinfo(read_text(self.path('/proc/cpuinfo')))
+
+    def fingerprint(self):
+        # World-readable identity only, so root and user runs hash the same inputs: the DMI modalias
+        # (board, vendor and BIOS version, which changes with SMU firmware updates) plus CPUID and
+        # microcode. product_uuid is root-only and would make each side invalidate the other's cache.
+        if sys.platform == 'darwin':
+            parts = [subprocess.run(["sysctl", "-n"] + SYSCTL_FIELDS, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout.decode()]
+        else:
+            cpuinfo = self.cpuinfo()
+            parts = [read_text(self.path('/sys/class/dmi/id/modalias'))]
+            parts += [cpuinfo.get(field, '') for field in CPUINFO_FIELDS]
+        return hashlib.sha256('\n'.join(part.strip() for part in parts).encode()).hexdigest()[:16]
+
+    def probe(self):
+        info = {}
+        try:
+            with open(self.path(DMI_TABLE), 'rb') as f:
+                info = parse_dmi_table(f.read())
+        except OSError:
+            pass
+        if not info.get('CPU'):
+            # One privileged dmidecode run, parsed here instead of grep/awk per field
+            result = subprocess.run(["sudo", "-S", self.dmidecode, "-t", "processor"], input=f"{self.password}\n".encode(),
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            info = parse_dmidecode(result.stdout.decode(errors='replace'))
+        cpuinfo = self.cpuinfo() if sys.platform != 'darwin' else {}
+        if {'cpu family', 'model', 'stepping'} <= cpuinfo.keys():
+            info['Signature'] = f"Family {cpuinfo['cpu family']}, Model {cpuinfo['model']}, Stepping {cpuinfo['stepping']}"
+        if not info.get('CPU') and cpuinfo.get('model name'):
+            info['CPU'] = cpuinfo['model name']
+        return info
@@ -0,0 +1,292 @@
+import os
+import sys
+import json
+import time
+import socket
+import select
+import struct
+import resource
+import threading
+import subprocess
+import tempfile
+import ctypes
+
+LIB_NAMES = ['libryzenadj.so', 'libryzenadj.dylib']
+LIB_SETTERS = {
+    'apu-skin-temp': 'set_apu_skin_temp_limit',
+    'dgpu-skin-temp': 'set_dgpu_skin_temp_limit',
+}
+LIB_FLAGS = {'max-performance', 'power-saving'}
+# ryzenadj -i row and the factor between the row's unit and the argument's unit
+LIMIT_ROWS = {
+    'stapm-limit': ('STAPM LIMIT', 1000),
+    'fast-limit': ('PPT LIMIT FAST', 1000),
+    'slow-limit': ('PPT LIMIT SLOW', 1000),
+    'apu-slow-limit': ('PPT LIMIT APU', 1000),
+    'stapm-time': ('StapmTimeConst', 1),
+    'slow-time': ('SlowPPTTimeConst', 1),
+    'vrm-current': ('TDC LIMIT VDD', 1000),
+    'vrmsoc-current': ('TDC LIMIT SOC', 1000),
+    'vrmmax-current': ('EDC LIMIT VDD', 1000),
+    'vrmsocmax-current': ('EDC LIMIT SOC', 1000),
+    'tctl-temp': ('THM LIMIT CORE', 1),
+    'apu-skin-temp': ('STT LIMIT APU', 1),
+    'dgpu-skin-temp': ('STT LIMIT dGPU', 1),
+}
+
+def parse_info(text):
+    rows = {}
+    for line in text.splitlines():
+        cells = [cell.strip() for cell in line.strip().strip('|').split('|')]
+        if len(cells) >= 2 and cells[0]:
+            try:
+                rows[cells[0]] = float(cells[1])
+            except ValueError:
+                continue
+    return rows
+
+def parse_args(argv):
+    values = {}
+    for arg in argv:
+        option, _, value = arg.lstrip('-').partition('=')
+        if arg.startswith('--') and value:
+            try:
+                values[option] = int(value, 0)
+            except ValueError:
+                continue
+    return values
+
+# After the helper fails to start (or dies), calls go straight to sudo ryzenadj for this long
+RETRY_AFTER = 60
+
+def default_socket_path():
+    return os.path.join(tempfile.gettempdir(), f"uxtu4unix-{os.getuid()}.sock")
+
+class ExecBackend:
+    name = 'exec'
+
+    def __init__(self, ryzenadj):
+        self.ryzenadj = ryzenadj
+
+    def run(self, argv):
+        result = subprocess.run([self.ryzenadj] + list(argv), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        return result.returncode, result.stdout.decode(errors='replace'), result.stderr.decode(errors='replace')
+
+    def close(self):
+        pass
+
+class LibBackend(ExecBackend):
+    name = 'lib'
+
+    def __init__(self, ryzenadj, lib_path):
+        super().__init__(ryzenadj)
+        self.lib = ctypes.CDLL(lib_path)
+        self.lib.init_ryzenadj.restype = ctypes.c_void_p
+        self.lib.cleanup_ryzenadj.argtypes = [ctypes.c_void_p]
+        self.ry = self.lib.init_ryzenadj()
+        if not self.ry:
+            raise OSError("init_ryzenadj failed")
+
+    def setter(self, option):
+        name = LIB_SETTERS.get(option, 'set_' + option.replace('-', '_'))
+        func = getattr(self.lib, name, None)
+        if func is not None:
+            func.restype = ctypes.c_int
+        return func
+
+    def run(self, argv):
+        calls = []
+        for arg in argv:
+            option, _, value = arg.lstrip('-').partition('=')
+            func = self.setter(option) if arg.startswith('--') else None
+            if func is None or (option in LIB_FLAGS) == bool(value):
+                # Anything the library cannot express (info, dump-table, short flags) goes to the binary
+                return super().run(argv)
+            calls.append((option, func, int(value, 0) if value else None))
+        out, err, rc = [], [], 0
+        for option, func, value in calls:
+            ret = func(ctypes.c_void_p(self.ry)) if value is None else func(ctypes.c_void_p(self.ry), ctypes.c_uint32(value))
+            if ret:
+                rc = 1
+                err.append(f"Failed to set {option} (error {ret})")
+            else:
+                out.append(f"Successfully set {option}" + ('' if value is None else f" to {value}"))
+        return rc, '\n'.join(out) + '\n', '\n'.join(err)
+
+    def close(self):
+        self.lib.cleanup_ryzenadj(ctypes.c_void_p(self.ry))
+
+def load_backend(ryzenadj):
+    assets_dir = os.path.dirname(ryzenadj)
+    for name in LIB_NAMES:
+        lib_path = os.path.join(assets_dir, name)
+        if os.path.exists(lib_path):
+            try:
+                return LibBackend(ryzenadj, lib_path)
+            except (OSError, AttributeError):
+                break
+    return ExecBackend(ryzenadj)
+
+def peer_allowed(conn, owner):
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return True
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    _, uid, _ = struct.unpack('3i', creds)
+    return uid in (0, owner)
+
+def cpu_seconds():
+    # This process plus its reaped children, i.e. the helper and the ryzenadj runs it waited for
+    usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return sum(u.ru_utime + u.ru_stime for u in usage)
+
+def handle(backend, line):
+    try:
+        request = json.loads(line)
+        cpu = cpu_seconds()
+        rc, out, err = backend.run(request.get('argv', []))
+        return {'rc': rc, 'stdout': out, 'stderr': err, 'cpu': cpu_seconds() - cpu}
+    except Exception as e:
+        return {'rc': 1, 'stdout': '', 'stderr': f"Helper error: {e}"}
+
+def serve(ryzenadj, sock_path, owner):
+    backend = load_backend(ryzenadj)
+    if os.path.exists(sock_path):
+        os.unlink(sock_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(sock_path)
+    finally:
+        os.umask(old_umask)
+    os.chown(sock_path, owner, -1)
+    server.listen(4)
+    sys.stdout.write(f"READY {backend.name}\n")
+    sys.stdout.flush()
+    buffers = {}
+    try:
+        while True:
+            readable, _, _ = select.select([server, sys.stdin] + list(buffers), [], [])
+            if sys.stdin in readable and not os.read(sys.stdin.fileno(), 4096):
+                # The parent closed our stdin, so the session is over
+                break
+            if server in readable:
+                conn, _ = server.accept()
+                if peer_allowed(conn, owner):
+                    buffers[conn] = b''
+                else:
+                    conn.close()
+            for conn in [c for c in readable if c in buffers]:
+                data = conn.recv(65536)
+                if not data:
+                    del buffers[conn]
+                    conn.close()
+                    continue
+                buffers[conn] += data
+                while b'\n' in buffers[conn]:
+                    line, buffers[conn] = buffers[conn].split(b'\n', 1)
+                    conn.sendall(json.dumps(handle(backend, line)).encode() + b'\n')
+    finally:
+        for conn in buffers:
+            conn.close()
+        server.close()
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
+        backend.close()
+
+class SMUHelper:
+    def __init__(self, ryzenadj, password, sock_path=None, timeout=10):
+        self.ryzenadj = ryzenadj
+        self.password = password
+        self.sock_path = sock_path or default_socket_path()
+        self.timeout = timeout
+        self.proc = None
+        self.conn = None
+        self.backend = None
+        self.failed_at = None
+        # One request in flight at a time; the telemetry sampler shares the connection
+        self.lock = threading.RLock()
+        # Called with (argv, returncode, seconds) after every invocation
+        self.observers = []
+
+    def start(self):
+        command = ["sudo", "-S", sys.executable, os.path.realpath(__file__),
+                   "--ryzenadj", self.ryzenadj, "--socket", self.sock_path, "--owner", str(os.getuid())]
+        self.proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self.proc.stdin.write(f"{self.password}\n".encode())
+        self.proc.stdin.flush()
+        ready, _, _ = select.select([self.proc.stdout], [], [], self.timeout)
+        line = self.proc.stdout.readline().decode().split() if ready else []
+        if not line or line[0] != 'READY':
+            self.close()
+            return False
+        self.backend = line[1] if len(line) > 1 else 'exec'
+        self.conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.conn.connect(self.sock_path)
+        # A helper that hangs must not hold the lock (and the telemetry sampler) forever; a timeout
+        # is an OSError, so the request falls back to sudo like any other helper failure
+        self.conn.settimeout(self.timeout)
+        self.reader = self.conn.makefile('rb')
+        return True
+
+    def running(self):
+        return self.proc is not None and self.proc.poll() is None and self.conn is not None
+
+    def request(self, argv):
+        self.conn.sendall(json.dumps({'argv': list(argv)}).encode() + b'\n')
+        response = self.reader.readline()
+        if not response:
+            raise ConnectionError("SMU helper closed the connection")
+        return json.loads(response)
+
+    def run(self, argv):
+        start = time.perf_counter()
+        result = self.execute(argv)
+        for observer in self.observers:
+            observer(argv, result.returncode, time.perf_counter() - start)
+        return result
+
+    def execute(self, argv):
+        with self.lock:
+            if not self.running():
+                if self.failed_at is not None and time.monotonic() - self.failed_at < RETRY_AFTER:
+                    return self.run_sudo(argv)
+                if not self.start():
+                    self.failed_at = time.monotonic()
+                    return self.run_sudo(argv)
+                self.failed_at = None
+            try:
+                response = self.request(argv)
+            except (OSError, ValueError):
+                self.close()
+                self.failed_at = time.monotonic()
+                return self.run_sudo(argv)
+        result = subprocess.CompletedProcess(argv, response['rc'], response['stdout'], response['stderr'])
+        # CPU the helper spent on the request, ryzenadj included, for callers that account for it
+        result.cpu = response.get('cpu', 0.0)
+        return result
+
+    def run_sudo(self, argv):
+        cpu = os.times()
+        result = subprocess.run(["sudo", "-S", self.ryzenadj] + list(argv), input=self.password.encode(), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        done = os.times()
+        result = subprocess.CompletedProcess(argv, result.returncode, result.stdout.decode(errors='replace'), result.stderr.decode(errors='replace'))
+        result.cpu = (done.children_user - cpu.children_user) + (done.children_system - cpu.children_system)
+        return result
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.reader.close()
+                self.conn.close()
+                self.conn = None
+            if self.proc is not None:
+                try:
+                    self.proc.stdin.close()
+                    self.proc.wait(timeout=self.timeout)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+                self.proc = None
+
+if __name__ == "__main__":
+    args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+    serve(args['--ryzenadj'], args.get('--socket', default_socket_path()), int(args.get('--owner', 0)))
@@ -1,37 +1,297 @@
-import os, urllib.request, zipfile, shutil, subprocess
-
-def update():
-    url = "https://github.com/HorizonUnix/UXTU4Unix/releases/latest/download/macOS.zip"
-    script_dir = os.path.dirname(os.path.realpath(__file__))
-    current_dir = os.path.dirname(os.path.dirname(script_dir))
-    current_folder = os.path.join(current_dir, "UXTU4Unix")
-    new_folder = os.path.join(current_dir, "UXTU4Unix_new")
-    config_file = os.path.join(current_folder, "Assets", "config.ini")
-    backup_config = os.path.join(current_dir, "config.ini.bak")
-    zip_file_path = os.path.join(current_dir, "macOS.zip")
+import os
+import io
+import re
+import sys
+import json
+import stat
+import shutil
+import ctypes
+import hashlib
+import zipfile
+import compileall
+import subprocess
+import urllib.request
+import urllib.error
+
+RELEASE_URL = "https://github.com/HorizonUnix/UXTU4Unix/releases/latest/download/"
+ARCHIVE = "macOS.zip"
+MANIFEST = "macOS.manifest.json"
+MANIFEST_VERSION = 1
+ROOT = "UXTU4Unix"
+# User state carried over from the live install; never part of a release
+KEEP = ["Assets/config.ini", "Assets/update.json", "Assets/argv.cache", "Logs"]
+EXECUTABLES = ["UXTU4Unix.command", "Assets/ryzenadj", "Assets/dmidecode"]
+CHUNK = 64 * 1024
+TIMEOUT = 30
+
+class UpdateError(Exception):
+    pass
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def kept(rel):
+    return any(rel == path or rel.startswith(path + '/') for path in KEEP)
+
+def safe_path(base, rel):
+    # Archive members and manifest keys come from the download; none may point outside base
+    parts = rel.replace('\\', '/').split('/')
+    if not rel or rel.startswith('/') or any(part in ('', '.', '..') for part in parts):
+        raise UpdateError(f"Unsafe path in update: {rel!r}")
+    path = os.path.join(base, *parts)
+    real_base = os.path.realpath(base)
+    if os.path.commonpath([real_base, os.path.realpath(path)]) != real_base:
+        raise UpdateError(f"Unsafe path in update: {rel!r}")
+    return path
+
+def build_manifest(root, archive=None):
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, root).replace(os.sep, '/')
+            if not kept(rel) and not name.endswith('.pyc'):
+                files[rel] = {'sha256': sha256_file(path), 'size': os.path.getsize(path),
+                              'mode': stat.S_IMODE(os.stat(path).st_mode)}
+    manifest = {'version': MANIFEST_VERSION, 'root': os.path.basename(os.path.abspath(root)), 'files': files}
+    if archive:
+        manifest['archive'] = {'sha256': sha256_file(archive), 'size': os.path.getsize(archive)}
+    return manifest
+
+def fetch_json(url):
+    with urllib.request.urlopen(url, timeout=TIMEOUT) as response:
+        return json.loads(response.read())
+
+def download(url, dest, sha256=None, retries=3):
+    # Streams to dest.part, hashing as it goes; a retry resumes with a Range request
+    part = dest + '.part'
+    for attempt in range(retries):
+        digest = hashlib.sha256()
+        offset = 0
+        if os.path.exists(part):
+            with open(part, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK), b''):
+                    digest.update(chunk)
+                    offset += len(chunk)
+        request = urllib.request.Request(url, headers={'Range': f'bytes={offset}-'} if offset else {})
+        try:
+            with urllib.request.urlopen(request, timeout=TIMEOUT) as response, open(part, 'ab') as f:
+                if offset and response.status != 206:
+                    # Server ignored the range and is sending the whole file
+                    f.truncate(0)
+                    digest = hashlib.sha256()
+                for chunk in iter(lambda: response.read(CHUNK), b''):
+                    f.write(chunk)
+                    digest.update(chunk)
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and offset:
+                # The partial file is already complete, or stale; the hash check decides
+                pass
+            elif attempt == retries - 1:
+                raise
+            else:
+                continue
+        except OSError:
+            if attempt == retries - 1:
+                raise
+            continue
+        if sha256 is None or digest.hexdigest() == sha256:
+            os.replace(part, dest)
+            return dest
+        os.remove(part)
+    raise UpdateError(f"{os.path.basename(dest)}: checksum mismatch")
+
+class RangeReader(io.RawIOBase):
+    # Seekable view of a remote file, so zipfile can read single members over HTTP ranges
+    def __init__(self, url):
+        self.url = url
+        self.position = 0
+        request = urllib.request.Request(url, headers={'Range': 'bytes=0-0'})
+        with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+            total = re.match(r'bytes \d+-\d+/(\d+)', response.headers.get('Content-Range', ''))
+            if response.status != 206 or not total:
+                raise UpdateError("Server does not support range requests")
+            self.url = response.geturl()
+            self.size = int(total.group(1))
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self.position = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence] + offset
+        return self.position
+
+    def readinto(self, buffer):
+        if self.position >= self.size or not len(buffer):
+            return 0
+        end = min(self.position + len(buffer), self.size) - 1
+        request = urllib.request.Request(self.url, headers={'Range': f'bytes={self.position}-{end}'})
+        with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+            data = response.read()
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+def open_remote_zip(url):
+    return zipfile.ZipFile(io.BufferedReader(RangeReader(url), buffer_size=CHUNK))
+
+def extract(archive, member, dest, sha256=None):
+    digest = hashlib.sha256()
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    with archive.open(member) as src, open(dest, 'wb') as f:
+        for chunk in iter(lambda: src.read(CHUNK), b''):
+            f.write(chunk)
+            digest.update(chunk)
+    if sha256 is not None and digest.hexdigest() != sha256:
+        raise UpdateError(f"{member}: checksum mismatch")
+
+def local_changes(manifest, install_dir):
+    changed = []
+    for rel, entry in manifest['files'].items():
+        path = safe_path(install_dir, rel)
+        if not (os.path.isfile(path) and os.path.getsize(path) == entry['size'] and sha256_file(path) == entry['sha256']):
+            changed.append(rel)
+    return changed
+
+def stage(install_dir, staging, base_url):
+    if os.path.exists(staging):
+        shutil.rmtree(staging)
+    os.makedirs(staging)
+    parent = os.path.dirname(install_dir)
     try:
-        if os.path.exists(config_file):
-            shutil.copy2(config_file, backup_config)
-        urllib.request.urlretrieve(url, zip_file_path)
-        with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-            zip_ref.extractall(new_folder)
-        shutil.rmtree(current_folder)
-        inner_folder = os.path.join(new_folder, "UXTU4Unix")
-        shutil.move(inner_folder, current_dir)
-        shutil.rmtree(new_folder)
-        command_file_path = os.path.join(current_dir, "UXTU4Unix", "UXTU4Unix.command")
-        ryzenadj_path = os.path.join(current_dir, "UXTU4Unix", "Assets", "ryzenadj")
-        dmidecode_path = os.path.join(current_dir, "UXTU4Unix", "Assets", "dmidecode")
-        subprocess.run(['chmod', '+x', command_file_path], check=True)
-        subprocess.run(['chmod', '+x', ryzenadj_path], check=True)
-        subprocess.run(['chmod', '+x', dmidecode_path], check=True)
-        if os.path.exists(backup_config):
-            shutil.move(backup_config, config_file)
-        if os.path.exists(zip_file_path):
-            os.remove(zip_file_path)
-        subprocess.Popen(['open', command_file_path])
+        manifest = fetch_json(base_url + MANIFEST)
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise UpdateError(f"Unsupported manifest version: {manifest.get('version')}")
+    except (OSError, ValueError, UpdateError) as e:
+        # Releases without a manifest: whole archive, checked only by the zip CRCs
+        print(f"No usable manifest ({e}), downloading the full archive...")
+        manifest = None
+    if manifest is None:
+        archive_path = download(base_url + ARCHIVE, os.path.join(parent, ARCHIVE))
+        count = 0
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if info.filename.startswith(ROOT + '/') and not info.is_dir():
+                    count += 1
+                    dest = safe_path(staging, info.filename[len(ROOT) + 1:])
+                    extract(archive, info, dest)
+                    mode = info.external_attr >> 16
+                    if mode:
+                        os.chmod(dest, stat.S_IMODE(mode))
+        os.remove(archive_path)
+        for rel in EXECUTABLES:
+            path = os.path.join(staging, rel)
+            if os.path.exists(path):
+                os.chmod(path, os.stat(path).st_mode | 0o111)
+        return count
+    for rel in manifest['files']:
+        safe_path(staging, rel)
+    changed = set(local_changes(manifest, install_dir))
+    print(f"{len(manifest['files']) - len(changed)} files unchanged, {len(changed)} to download")
+    for rel in manifest['files']:
+        if rel not in changed:
+            dest = safe_path(staging, rel)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copy2(safe_path(install_dir, rel), dest)
+    if changed:
+        root = manifest.get('root', ROOT)
+        try:
+            archive = open_remote_zip(base_url + ARCHIVE)
+            archive_path = None
+        except (OSError, UpdateError):
+            archive_info = manifest.get('archive', {})
+            archive_path = download(base_url + ARCHIVE, os.path.join(parent, ARCHIVE), archive_info.get('sha256'))
+            archive = zipfile.ZipFile(archive_path)
+        with archive:
+            for rel in sorted(changed):
+                extract(archive, f"{root}/{rel}", safe_path(staging, rel), manifest['files'][rel]['sha256'])
+        if archive_path:
+            os.remove(archive_path)
+    for rel, entry in manifest['files'].items():
+        os.chmod(safe_path(staging, rel), entry['mode'])
+    return len(changed)
+
+def exchange(a, b):
+    # Swap two directories in one step where the kernel supports it
+    libc = ctypes.CDLL(None, use_errno=True)
+    if hasattr(libc, 'renamex_np'):
+        RENAME_SWAP = 2
+        return libc.renamex_np(os.fsencode(a), os.fsencode(b), RENAME_SWAP) == 0
+    return False
+
+def swap(install_dir, staging, rollback):
+    if os.path.exists(rollback):
+        shutil.rmtree(rollback)
+    if exchange(staging, install_dir):
+        os.rename(staging, rollback)
+        return
+    os.rename(install_dir, rollback)
+    try:
+        os.rename(staging, install_dir)
+    except OSError:
+        os.rename(rollback, install_dir)
+        raise
+
+def carry_over(install_dir, staging):
+    for rel in KEEP:
+        src = os.path.join(install_dir, rel)
+        dest = os.path.join(staging, rel)
+        if os.path.isdir(src):
+            shutil.copytree(src, dest, dirs_exist_ok=True)
+        elif os.path.isfile(src):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copy2(src, dest)
+
+def install_paths():
+    install_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    return install_dir, f"{install_dir}.new", f"{install_dir}.old"
+
+def update(base_url=RELEASE_URL):
+    install_dir, staging, rollback = install_paths()
+    try:
+        count = stage(install_dir, staging, base_url)
+        carry_over(install_dir, staging)
+        # Byte-compile against the final path so tracebacks and the first launch match the swapped tree
+        if not compileall.compile_dir(staging, ddir=install_dir, quiet=1):
+            raise UpdateError("New version failed to compile")
+        swap(install_dir, staging, rollback)
+        print(f"Updated {count} files; previous version kept in {os.path.basename(rollback)}")
+        subprocess.Popen(['open', os.path.join(install_dir, "UXTU4Unix.command")])
     except Exception as e:
+        if os.path.exists(staging):
+            shutil.rmtree(staging, ignore_errors=True)
         print(f"An error occurred: {e}")
+        return False
+    return True
+
+def restore():
+    install_dir, staging, rollback = install_paths()
+    if not os.path.isdir(rollback):
+        print("No previous version to roll back to")
+        return False
+    # The swap moves the current tree into the rollback slot, so rolling back twice redoes the update
+    swap(install_dir, rollback, staging)
+    os.rename(staging, rollback)
+    carry_over(rollback, install_dir)
+    print("Rolled back to the previous version")
+    return True
 
 if __name__ == "__main__":
-    update()
+    if sys.argv[1:2] == ['manifest']:
+        # Release build: python3 SU.py manifest <tree> [archive] > macOS.manifest.json
+        print(json.dumps(build_manifest(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None), indent=1, sort_keys=True))
+    elif sys.argv[1:2] == ['rollback']:
+        raise SystemExit(0 if restore() else 1)
+    else:
+        raise SystemExit(0 if update() else 1)
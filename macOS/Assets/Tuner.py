@@ -0,0 +1,330 @@
+import os
+import sys
+import glob
+import json
+import math
+import time
+import random
+import hashlib
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+from Assets.SMU import parse_info
+from Assets.Catalog import render_args
+
+TUNED = ('stapm-limit', 'fast-limit', 'slow-limit', 'vrm-current')
+TARGETS = ('perf', 'efficiency', 'cap')
+POWERCAP_ROOT = '/sys/class/powercap'
+# Fallback power source: package power as reported by the SMU
+SMU_POWER_ROW = 'PPT VALUE FAST'
+CHECKPOINT_VERSION = 1
+
+class RaplMeter:
+    # Package energy counter; wraps at max_energy_range_uj. Readable by root only on most kernels.
+    name = 'rapl'
+
+    def __init__(self, root=POWERCAP_ROOT):
+        for zone in sorted(glob.glob(os.path.join(root, '*'))):
+            try:
+                with open(os.path.join(zone, 'name')) as f:
+                    if not f.read().startswith('package'):
+                        continue
+                with open(os.path.join(zone, 'max_energy_range_uj')) as f:
+                    self.range = int(f.read())
+                self.path = os.path.join(zone, 'energy_uj')
+                self.read()
+                return
+            except (OSError, ValueError):
+                continue
+        raise OSError(f"No readable package energy counter under {root}")
+
+    def read(self):
+        with open(self.path) as f:
+            return int(f.read())
+
+    def start(self):
+        self.begin = self.read()
+
+    def stop(self):
+        return ((self.read() - self.begin) % self.range) / 1e6
+
+class SmuPowerMeter:
+    # Integrates the SMU's package power reading (trapezoid rule) when there is no RAPL counter
+    name = 'smu'
+
+    def __init__(self, smu, period=0.5):
+        self.smu = smu
+        self.period = period
+        self.thread = None
+
+    def sample(self):
+        return parse_info(self.smu.run(('-i',)).stdout).get(SMU_POWER_ROW, math.nan)
+
+    def loop(self):
+        last_time, last_power = time.monotonic(), self.sample()
+        while not self.stopping.wait(self.period):
+            now, power = time.monotonic(), self.sample()
+            if not math.isnan(power) and not math.isnan(last_power):
+                self.joules += (power + last_power) / 2 * (now - last_time)
+            last_time, last_power = now, power
+
+    def start(self):
+        self.joules = 0.0
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.loop, name='tuner-power', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join()
+        return self.joules
+
+def open_meter(smu):
+    try:
+        return RaplMeter()
+    except OSError:
+        return SmuPowerMeter(smu)
+
+def spin(counter, stopping):
+    block = bytes(4096)
+    while not stopping.is_set():
+        for _ in range(256):
+            block = hashlib.sha256(block).digest() * 128
+        with counter.get_lock():
+            counter.value += 1
+
+class BuiltinWorkload:
+    # One hashing process per CPU; work is the number of 256-hash batches completed
+    name = 'builtin'
+
+    def __init__(self, processes=None):
+        self.processes = processes or os.cpu_count() or 1
+
+    def run(self, seconds):
+        counter = multiprocessing.Value('Q', 0)
+        stopping = multiprocessing.Event()
+        workers = [multiprocessing.Process(target=spin, args=(counter, stopping), daemon=True) for _ in range(self.processes)]
+        for worker in workers:
+            worker.start()
+        start = time.monotonic()
+        time.sleep(seconds)
+        stopping.set()
+        elapsed = time.monotonic() - start
+        for worker in workers:
+            worker.join()
+        return counter.value, elapsed
+
+class CommandWorkload:
+    # Runs the command back to back; work is completed runs, and the run in flight at the
+    # deadline is waited for so the elapsed time covers whole runs only
+    def __init__(self, command):
+        self.name = command
+        self.command = command
+
+    def run(self, seconds):
+        runs = 0
+        start = time.monotonic()
+        while time.monotonic() - start < seconds:
+            if subprocess.run(self.command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode != 0:
+                raise RuntimeError(f"Workload failed: {self.command}")
+            runs += 1
+        return runs, time.monotonic() - start
+
+def default_bounds(modes):
+    # Search box spanned by the class's own presets: from its lowest STAPM to its highest limits
+    values = {option: [params[option] for params in modes.values() if isinstance(params.get(option), int) and not isinstance(params.get(option), bool)]
+              for option in TUNED}
+    if not values['stapm-limit']:
+        raise ValueError("Preset class has no stapm-limit to derive search bounds from")
+    stapm = (min(values['stapm-limit']), max(values['stapm-limit']))
+    fast = max(values['fast-limit'] or [stapm[1]])
+    vrm = values['vrm-current'] or [0]
+    return {
+        'stapm-limit': stapm,
+        'slow-limit': (stapm[0], max(values['slow-limit'] or [stapm[1]])),
+        'fast-limit': (stapm[0], fast),
+        'vrm-current': (int(min(vrm) * 0.6), max(vrm)),
+    }
+
+def parse_bounds(text, bounds):
+    # "stapm-limit=5000:30000,vrm-current=60000:120000"
+    bounds = dict(bounds)
+    for item in filter(None, (text or '').split(',')):
+        option, _, span = item.partition('=')
+        low, _, high = span.partition(':')
+        if option not in TUNED:
+            raise ValueError(f"Cannot tune {option}; tunable: {', '.join(TUNED)}")
+        bounds[option] = (int(low), int(high))
+    return bounds
+
+def sample_candidates(bounds, count, seed, step=500):
+    # Latin hypercube: every option's range is cut into `count` strata and each stratum is used once,
+    # so the candidates cover the box evenly instead of clumping like plain random draws
+    rng = random.Random(seed)
+    columns = {}
+    for option in TUNED:
+        low, high = bounds[option]
+        strata = list(range(count))
+        rng.shuffle(strata)
+        columns[option] = [low + (high - low) * (stratum + rng.random()) / count for stratum in strata]
+    candidates = []
+    for i in range(count):
+        params = {option: int(round(columns[option][i] / step) * step) for option in TUNED}
+        if params['vrm-current'] <= 0:
+            del params['vrm-current']
+        # The firmware expects fast >= slow >= STAPM
+        params['slow-limit'] = max(params['slow-limit'], params['stapm-limit'])
+        params['fast-limit'] = max(params['fast-limit'], params['slow-limit'])
+        candidates.append(params)
+    return candidates
+
+def score(target, result, cap=None):
+    # Higher is better. For the capped target, anything under the cap beats anything over it,
+    # and over-cap candidates are ranked by how little they draw.
+    throughput = result['work'] / result['seconds']
+    power = result['joules'] / result['seconds']
+    if target == 'perf':
+        return (throughput,)
+    if target == 'efficiency':
+        return (result['work'] / result['joules'] if result['joules'] > 0 else 0.0,)
+    return (1, throughput) if power <= cap else (0, -power)
+
+class Tuner:
+    def __init__(self, smu, workload, meter, candidates, base, checkpoint, eta=3, min_seconds=10, settle=3, cap=None,
+                 log=print):
+        self.smu = smu
+        self.workload = workload
+        self.meter = meter
+        self.base = base
+        self.eta = eta
+        self.min_seconds = min_seconds
+        self.settle = settle
+        self.cap = cap
+        self.log = log
+        self.checkpoint = checkpoint
+        self.state = {
+            'version': CHECKPOINT_VERSION,
+            'workload': workload.name,
+            'meter': meter.name,
+            'eta': eta,
+            'min_seconds': min_seconds,
+            'candidates': candidates,
+            'results': {},
+        }
+        self.resume()
+
+    @property
+    def candidates(self):
+        return self.state['candidates']
+
+    def resume(self):
+        # Measurements from an interrupted run are reused when they were taken the same way
+        try:
+            with open(self.checkpoint) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        keys = ('version', 'workload', 'meter', 'eta', 'min_seconds', 'candidates')
+        if all(saved.get(key) == self.state[key] for key in keys):
+            self.state['results'] = saved.get('results', {})
+            self.log(f"Resuming from {self.checkpoint}: {len(self.state['results'])} measurements reused")
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.checkpoint))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tuner-', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.checkpoint)
+
+    def argv(self, index):
+        params = dict(self.base, **self.candidates[index])
+        return tuple(render_args(params).split())
+
+    def measure(self, index, rung):
+        key = f"{index}@{rung}"
+        if key not in self.state['results']:
+            seconds = self.min_seconds * self.eta ** rung
+            result = self.smu.run(self.argv(index))
+            if result.returncode != 0:
+                raise RuntimeError(f"ryzenadj rejected candidate {index}: {result.stderr.strip()}")
+            time.sleep(self.settle)
+            self.meter.start()
+            try:
+                work, elapsed = self.workload.run(seconds)
+            finally:
+                joules = self.meter.stop()
+            self.state['results'][key] = {'work': work, 'seconds': elapsed, 'joules': joules}
+            self.save()
+            self.log(f"  candidate {index:>2} rung {rung} ({seconds:g} s): {work / elapsed:.1f} work/s, "
+                     f"{joules / elapsed:.1f} W, {work / joules if joules else 0:.2f} work/J")
+        return self.state['results'][key]
+
+    def halving(self, target):
+        # Successive halving: measure everyone briefly, keep the best 1/eta for eta times longer,
+        # until one is left. Measurements are shared between targets through the checkpoint.
+        survivors = list(range(len(self.candidates)))
+        rung = 0
+        while True:
+            self.log(f"{target}: rung {rung}, {len(survivors)} candidates")
+            ranked = sorted(survivors, key=lambda index: score(target, self.measure(index, rung), self.cap), reverse=True)
+            if len(ranked) <= self.eta:
+                return ranked[0], self.state['results'][f"{ranked[0]}@{rung}"]
+            survivors = ranked[:max(1, len(ranked) // self.eta)]
+            rung += 1
+
+def tune(smu, workload, meter, preset_class, modes, targets, cap=None, bounds=None, count=27, seed=0, **options):
+    base = next((modes[mode] for mode in ('Balance', 'BalPreset') if mode in modes), next(iter(modes.values())))
+    base = {option: value for option, value in base.items() if option not in TUNED}
+    candidates = sample_candidates(bounds or default_bounds(modes), count, seed)
+    # The hand-written presets compete too, so a tuned preset never loses to them on the same workload
+    candidates += [{option: params[option] for option in TUNED if option in params} for params in modes.values() if 'stapm-limit' in params]
+    tuner = Tuner(smu, workload, meter, candidates, base, cap=cap, **options)
+    presets = {}
+    for target in targets:
+        index, result = tuner.halving(target)
+        name = {'perf': 'Tuned Performance', 'efficiency': 'Tuned Efficiency', 'cap': f"Tuned {cap:g}W"}[target]
+        presets[name] = dict(base, **tuner.candidates[index])
+        tuner.log(f"{name}: {render_args(presets[name])} ({result['work'] / result['seconds']:.1f} work/s, "
+                  f"{result['joules'] / result['seconds']:.1f} W)")
+    return {'version': 1, 'presets': {preset_class: presets}}
+
+if __name__ == "__main__":
+    # From the install folder: python3 -m Assets.Tuner [--command "make -j8"] [--targets perf,efficiency,cap]
+    #   [--cap watts] [--candidates 27] [--eta 3] [--seconds 10] [--settle 3] [--seed 0]
+    #   [--bounds stapm-limit=5000:30000,...] [--checkpoint tuner.json] [--output tuned.json]
+    from Assets.Config import ConfigStore
+    from Assets.Catalog import PresetCatalog
+    from Assets.SMU import SMUHelper
+    args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+    assets_dir = os.path.dirname(os.path.realpath(__file__))
+    cfg = ConfigStore(os.path.join(assets_dir, 'config.ini')).load()
+    catalog = PresetCatalog(os.path.join(assets_dir, 'Presets.json'))
+    preset_class = cfg.get('User', 'Preset', fallback='')
+    modes = catalog.load()[preset_class]
+    targets = args.get('--targets', 'perf,efficiency').split(',')
+    cap = float(args['--cap']) if '--cap' in args else None
+    if 'cap' in targets and cap is None:
+        raise SystemExit("--cap <watts> is required for the cap target")
+    smu = SMUHelper(os.path.join(assets_dir, 'ryzenadj'), cfg.get('User', 'Password', fallback=''))
+    workload = CommandWorkload(args['--command']) if '--command' in args else BuiltinWorkload()
+    meter = open_meter(smu)
+    print(f"Tuning {preset_class} for {workload.name}, energy from {meter.name}")
+    try:
+        tuned = tune(smu, workload, meter, preset_class, modes, targets, cap,
+                     parse_bounds(args.get('--bounds'), default_bounds(modes)),
+                     int(args.get('--candidates', '27')), int(args.get('--seed', '0')),
+                     checkpoint=args.get('--checkpoint', f"tuner-{preset_class}.json"), eta=int(args.get('--eta', '3')),
+                     min_seconds=float(args.get('--seconds', '10')), settle=float(args.get('--settle', '3')))
+    finally:
+        # Put the preset from config.ini back
+        mode = cfg.get('User', 'Mode', fallback='')
+        restore = cfg.get('User', 'CustomArgs', fallback='') if mode == 'Custom' else render_args(modes[mode]) if mode in modes else ''
+        if restore:
+            smu.run(tuple(restore.split()))
+        smu.close()
+    text = json.dumps(tuned, indent=4)
+    if '--output' in args:
+        with open(args['--output'], 'w') as f:
+            f.write(text + '\n')
+    print(text)
@@ -0,0 +1,130 @@
+import os
+import re
+import sys
+import json
+import time
+import tempfile
+import threading
+import urllib.request
+import urllib.error
+
+RELEASE_URL = "https://api.github.com/repos/HorizonUnix/UXTU4Unix/releases/latest"
+CACHE_TTL = 6 * 3600
+VERSION = re.compile(r'^v?(\d+(?:\.\d+)*)(?:[-+.]?(.*))?$')
+
+def parse_version(version):
+    # "0.3.10" > "0.3.9"; a pre-release tag ("0.4.0-beta1") sorts before its release
+    match = VERSION.match(version.strip())
+    if not match:
+        return (), False, version
+    numbers = tuple(int(part) for part in match.group(1).split('.'))
+    while len(numbers) > 1 and numbers[-1] == 0:
+        numbers = numbers[:-1]
+    prerelease = match.group(2) or ''
+    return numbers, not prerelease, prerelease
+
+def compare_versions(a, b):
+    a, b = parse_version(a), parse_version(b)
+    return (a > b) - (a < b)
+
+class UpdateChecker:
+    def __init__(self, local_version, cache_path, url=RELEASE_URL, ttl=CACHE_TTL, timeout=5):
+        self.local_version = local_version
+        self.cache_path = cache_path
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.release = None
+        self.error = None
+        self.thread = None
+
+    def read_cache(self):
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # A cache written for another endpoint (e.g. a test server) is not reused
+        return cache if isinstance(cache, dict) and cache.get('url') == self.url else {}
+
+    def write_cache(self, cache):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.cache_path) or '.', prefix='.update-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(cache, tmp_file)
+            os.replace(tmp_path, self.cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def fetch(self, force=False):
+        cache = self.read_cache()
+        now = time.time()
+        if not force and cache.get('tag') and 0 <= now - cache.get('checked', 0) < self.ttl:
+            return cache
+        request = urllib.request.Request(self.url, headers={'Accept': 'application/vnd.github+json', 'User-Agent': 'UXTU4Unix'})
+        if cache.get('tag'):
+            # GitHub answers 304 without a body, and 304s do not count against the rate limit
+            if cache.get('etag'):
+                request.add_header('If-None-Match', cache['etag'])
+            if cache.get('modified'):
+                request.add_header('If-Modified-Since', cache['modified'])
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = json.loads(response.read())
+                cache = {'url': self.url, 'tag': data['tag_name'], 'changelog': data.get('body') or '',
+                         'etag': response.headers.get('ETag'), 'modified': response.headers.get('Last-Modified')}
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or not cache.get('tag'):
+                raise
+        cache['checked'] = now
+        try:
+            self.write_cache(cache)
+        except OSError:
+            pass
+        return cache
+
+    def run(self, force=False):
+        try:
+            self.release = self.fetch(force)
+            self.error = None
+        except Exception as e:
+            self.error = e
+        return self.release
+
+    def start(self, force=False):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.run, args=(force,), daemon=True)
+            self.thread.start()
+        return self
+
+    def done(self):
+        return self.thread is not None and not self.thread.is_alive()
+
+    def wait(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+        return self.release
+
+    @property
+    def latest_version(self):
+        return self.release['tag'] if self.release else None
+
+    @property
+    def changelog(self):
+        return self.release['changelog'] if self.release else ''
+
+    def status(self):
+        # 'update', 'beta', 'current', or None while unknown
+        if not self.release:
+            return None
+        order = compare_versions(self.local_version, self.release['tag'])
+        return 'update' if order < 0 else 'beta' if order > 0 else 'current'
+
+if __name__ == "__main__":
+    # python3 Update.py <local version> [url] checks once, bypassing the cache TTL
+    checker = UpdateChecker(sys.argv[1], os.path.join(tempfile.gettempdir(), 'uxtu4unix-update.json'),
+                            sys.argv[2] if len(sys.argv) > 2 else RELEASE_URL)
+    checker.run(force=True)
+    print(checker.error or f"{checker.status()}: {checker.latest_version}")
@@ -1,50 +1,149 @@
 import os
+import sys
 import time
+
+started = time.perf_counter()
+LOCAL_VERSION = "0.3.2"
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Headless subcommands (apply, status, watch, probe) skip the UI setup and the imports below
+    from Assets.CLI import main as cli_main
+    raise SystemExit(cli_main(sys.argv[1:], os.path.dirname(os.path.realpath(__file__)), LOCAL_VERSION, started))
+
 import subprocess
 import getpass
 import webbrowser
 import logging
-import sys
 import binascii
-import urllib.request
-import json
-import select
+import re
 import plistlib
-from configparser import ConfigParser
+import atexit
+import functools
+from Assets.Config import ConfigStore
+from Assets.Log import setup_logging
+from Assets.TUI import clear_screen, resize_terminal, open_screen, ScreenHandler, next_time
+from Assets.SMU import SMUHelper, parse_args
+from Assets.Probe import HardwareProbe
+from Assets.Classifier import classify_codename, classify_presets
+from Assets.Catalog import PresetCatalog
+from Assets.Drift import DriftMonitor, describe
+from Assets.Engine import ReapplyEngine
+from Assets.Update import UpdateChecker
+from Assets.Telemetry import TelemetrySampler
+from Assets.Recorder import TelemetryLog
+from Assets.Metrics import Metrics, MetricsServer
+from Assets.Thermal import ThermalController, SENSORS
+from Assets.Processes import ProcessWatcher
+from Assets.Load import open_load, LoadPolicy, parse_numbers, preset_levels, THRESHOLDS, HYSTERESIS, DWELL_UP, DWELL_DOWN, SAMPLE_INTERVAL
 
-LOCAL_VERSION = "0.3.2"
-LATEST_VERSION_URL = "https://github.com/HorizonUnix/UXTU4Unix/releases/latest"
 GITHUB_API_URL = "https://api.github.com/repos/HorizonUnix/UXTU4Unix/releases/latest"
 current_dir = os.path.dirname(os.path.realpath(__file__))
 command_file = os.path.join(current_dir, 'UXTU4Unix.command')
 command_file_name = os.path.basename(command_file)
 CONFIG_PATH = os.path.join(current_dir, 'Assets', 'config.ini')
+RYZENADJ_PATH = os.path.join(current_dir, 'Assets', 'ryzenadj')
+PRESETS_PATH = os.path.join(current_dir, 'Assets', 'Presets.json')
+UPDATE_CACHE_PATH = os.path.join(current_dir, 'Assets', 'update.json')
+DMIDECODE_PATH = os.path.join(current_dir, 'Assets', 'dmidecode')
 
 log_dir = os.path.join(current_dir, 'Logs')
 os.makedirs(log_dir, exist_ok=True)
-logging.basicConfig(
-    filename=os.path.join(log_dir, 'UXTU4Unix.log'),
-    filemode='w',
-    encoding='utf-8',
-    level=logging.INFO,
-    format='%(levelname)s %(message)s',
-    datefmt='%d/%m/%Y %H:%M:%S'
-)
-logging.getLogger().addHandler(logging.StreamHandler())
-
-cfg = ConfigParser()
-cfg.read(CONFIG_PATH)
-
-ryzen_family = [
-    "Unknown", "SummitRidge", "PinnacleRidge", "RavenRidge", "Dali", "Pollock",
-    "Picasso", "FireFlight", "Matisse", "Renoir", "Lucienne", "VanGogh", "Mendocino",
-    "Vermeer", "Cezanne_Barcelo", "Rembrandt", "Raphael", "DragonRange", "PhoenixPoint",
-    "PhoenixPoint2", "HawkPoint", "SonomaValley", "GraniteRidge", "FireRange",
-    "StrixPoint", "StrixPoint2", "Sarlak"
-]
+event_log = setup_logging(log_dir)
+
+cfg = ConfigStore(CONFIG_PATH).load()
+atexit.register(cfg.flush)
+
+smu = None
+preset_cache = {}
+preset_catalog = PresetCatalog(PRESETS_PATH)
+update_checker = UpdateChecker(LOCAL_VERSION, UPDATE_CACHE_PATH, GITHUB_API_URL)
+update_notified = False
+telemetry = None
+metrics = Metrics()
+metrics_server = None
+screen = None
+
+def get_smu():
+    global smu
+    if smu is None:
+        smu = SMUHelper(RYZENADJ_PATH, cfg.get('User', 'Password', fallback=''))
+        atexit.register(smu.close)
+        smu.observers.append(metrics.on_run)
+    smu.password = cfg.get('User', 'Password', fallback='')
+    return smu
+
+def get_telemetry():
+    global telemetry
+    if telemetry is None:
+        rate = float(cfg.get('Settings', 'TelemetryRate', fallback='1'))
+        telemetry = TelemetrySampler(lambda: get_smu().run(('-i',)), rate)
+        telemetry.sinks.append(metrics)
+    recording = [sink for sink in telemetry.sinks if isinstance(sink, TelemetryLog)]
+    if cfg.get('Settings', 'TelemetryLog', fallback='0') == '1' and not recording:
+        recorder = TelemetryLog(os.path.join(log_dir, 'Telemetry'))
+        atexit.register(recorder.close)
+        telemetry.sinks.append(recorder)
+    elif cfg.get('Settings', 'TelemetryLog', fallback='0') != '1' and recording:
+        recording[0].close()
+        telemetry.sinks.remove(recording[0])
+    return telemetry
+
+def start_metrics():
+    global metrics_server
+    if metrics_server is None:
+        port = int(cfg.get('Settings', 'MetricsPort', fallback='9877'))
+        try:
+            metrics_server = MetricsServer(metrics, port).start()
+        except OSError as e:
+            logging.info(f"Metrics endpoint unavailable on port {port}: {e}")
+            event_log.warning('metrics_unavailable', extra={'port': port, 'error': str(e)})
+
+def thermal_controller():
+    target = float(cfg.get('Settings', 'ThermalTarget', fallback='85'))
+    sensor = cfg.get('Settings', 'ThermalSensor', fallback='tctl')
+    return ThermalController(target, sensor if sensor in SENSORS else 'tctl')
+
+def thermal_floor():
+    # The class's Eco preset is the lowest the controller may go
+    try:
+        return preset_catalog.params(cfg.get('User', 'Preset', fallback=''), 'Eco')
+    except KeyError:
+        return {}
+
+def load_policy(initial, modes):
+    thresholds = parse_numbers(cfg.get('Settings', 'LoadThresholds', fallback=''), 3, THRESHOLDS)
+    dwell_up, dwell_down = parse_numbers(cfg.get('Settings', 'LoadDwell', fallback=''), 2, (DWELL_UP, DWELL_DOWN))
+    hysteresis = float(cfg.get('Settings', 'LoadHysteresis', fallback=str(HYSTERESIS)))
+    # Only the levels this preset class defines; a missing one is skipped, and stepping into the
+    # next one still takes that level's own threshold
+    levels = preset_levels(modes)
+    return LoadPolicy(tuple(thresholds[index - 1] for index, _ in levels[1:]), hysteresis, dwell_up, dwell_down,
+                      levels=[name for _, name in levels], initial=initial)
+
+def read_profiles(presets):
+    # [Profiles] maps an executable name to the preset to use while it runs
+    if not cfg.has_section('Profiles'):
+        return {}
+    modes = {mode.lower(): mode for mode in presets}
+    return {name: modes[mode.lower()] for name, mode in cfg.items('Profiles') if mode.lower() in modes}
+
+def log_applied(ryzenadj_args, result, mode, dynamic):
+    preset = cfg.get('User', 'Preset', fallback='')
+    metrics.applied(ryzenadj_args, preset=preset, mode=mode, dynamic=dynamic)
+    # -i table rows carry live readings; without them, identical reapplies collapse into one log entry
+    output = '\n'.join(line for line in result.stdout.splitlines() if not line.startswith('|')).strip()
+    event_log.info('apply', extra={'preset': preset, 'mode': mode, 'dynamic': dynamic == '1', 'ryzenadj_args': ' '.join(ryzenadj_args),
+                                   'returncode': result.returncode, 'output': output, 'errors': result.stderr.strip()})
+    if screen:
+        failure = (result.stderr.strip().splitlines() or [''])[0]
+        screen.set_status('Last apply', f"{time.strftime('%H:%M:%S')} " + ('OK' if result.returncode == 0 else f"failed ({result.returncode}) {failure}"))
 
 def clear():
-    subprocess.call('clear', shell=True)
+    if screen:
+        # The reapply screen has its own title and status area
+        screen.reset()
+        return
+    clear_screen()
     logging.info(r"""
    _   ___  _______ _   _ _ _  _   _      _     
   | | | \ \/ /_   _| | | | | || | | |_ _ (_)_ __
@@ -60,168 +159,66 @@ def clear():
     logging.info(f"  Version: {LOCAL_VERSION} by HorizonUnix (macOS Edition)")
     logging.info("")
 
-def get_hardware_info(command, use_sudo=False):
-    password = cfg.get('User', 'Password', fallback='')
-    if use_sudo:
-        command = f"echo '{password}' | sudo -S {command}"
-    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True)
-    output, error = process.communicate()
-    return output.decode('utf-8').strip()
+def hardware_probe():
+    return HardwareProbe(DMIDECODE_PATH, cfg.get('User', 'Password', fallback=''))
 
-def get_codename():
-    cpu = cfg.get('Info', 'CPU')
-    signature = cfg.get('Info', 'Signature')
-    words = signature.split(' ')
-    family_index = words.index("Family") + 1
-    model_index = words.index("Model") + 1
-    stepping_index = words.index("Stepping") + 1
-    cpu_family = int(words[family_index].rstrip(','))
-    cpu_model = int(words[model_index].rstrip(','))
-    cpu_stepping = int(words[stepping_index].rstrip(','))
-
-    architecture = 'Unknown'
-    family = 'Unknown'
-
-    if cpu == 'Intel':
-        architecture = 'Intel'
-        family = 'Intel'
-    elif cpu_family == 23:
-        architecture = 'Zen 1 - Zen 2'
-        if cpu_model == 1:
-            family = 'SummitRidge'
-        elif cpu_model == 8:
-            family = 'PinnacleRidge'
-        elif cpu_model in {17, 18}:
-            family = 'RavenRidge'
-        elif cpu_model == 24:
-            family = 'Picasso'
-        elif cpu_model == 32:
-            family = 'Pollock' if '15e' in cpu or '15Ce' in cpu or '20e' in cpu else 'Dali'
-        elif cpu_model == 80:
-            family = 'FireFlight'
-        elif cpu_model == 96:
-            family = 'Renoir'
-        elif cpu_model == 104:
-            family = 'Lucienne'
-        elif cpu_model == 113:
-            family = 'Matisse'
-        elif cpu_model == 144:
-            family = 'VanGogh'
-        elif cpu_model == 160:
-            family = 'Mendocino'
-    elif cpu_family == 25:
-        architecture = 'Zen 3 - Zen 4'
-        if cpu_model == 33:
-            family = 'Vermeer'
-        elif cpu_model in {63, 68}:
-            family = 'Rembrandt'
-        elif cpu_model == 80:
-            family = 'Cezanne_Barcelo'
-        elif cpu_model == 97:
-            family = 'DragonRange' if 'HX' in cpu else 'Raphael'
-        elif cpu_model == 116:
-            family = 'PhoenixPoint'
-        elif cpu_model == 120:
-            family = 'PhoenixPoint2'
-        elif cpu_model == 117:
-            family = 'HawkPoint'
-    elif cpu_family == 26:
-        architecture = 'Zen 5 - Zen 6'
-        if cpu_model in {32, 36}:
-            family = 'StrixPoint'
-        else:
-            family = 'GraniteRidge'
+def probe_hardware(probe):
+    for key, value in probe.probe().items():
+        cfg.set('Info', key, value)
+    cfg.set('Info', 'Fingerprint', probe.fingerprint())
+    cfg.set('Info', 'SMU', '')
 
+def check_hardware():
+    probe = hardware_probe()
+    if cfg.get('Info', 'Fingerprint', fallback='') != probe.fingerprint():
+        with cfg.transaction():
+            probe_hardware(probe)
+            get_codename()
+
+def get_codename():
+    architecture, family, cpu_type = classify_codename(cfg.get('Info', 'CPU'), cfg.get('Info', 'Signature'))
     cfg.set('Info', 'Architecture', architecture)
     cfg.set('Info', 'Family', family)
+    cfg.set('Info', 'Type', cpu_type)
+    cfg.save()
 
-    with open(CONFIG_PATH, 'w') as config_file:
-        cfg.write(config_file)
-
-    if family in {'SummitRidge', 'PinnacleRidge', 'Matisse', 'Vermeer', 'Raphael', 'GraniteRidge'}:
-        cfg.set('Info', 'Type', 'Amd_Desktop_Cpu')
-    elif architecture == 'Intel':
-        cfg.set('Info', 'Type', 'Intel')
-    elif architecture == 'Unknown':
-        cfg.set('Info', 'Type', 'Unknown')
-    else:
-        cfg.set('Info', 'Type', 'Amd_Apu')
-    with open(CONFIG_PATH, 'w') as config_file:
-        cfg.write(config_file)
+def get_preset_class():
+    return classify_presets(cfg.get('Info', 'CPU'), cfg.get('Info', 'Family'), cfg.get('Info', 'Type'))
 
 def get_presets():
-    cpu_family = cfg.get('Info', 'Family')
-    cpu_model = cfg.get('Info', 'CPU').replace("AMD", "").replace("with", "").replace("Mobile", "").replace("Ryzen", "").replace("Radeon", "").replace("Graphics", "").replace("Vega", "").replace("Gfx", "")
-    cpu_type = cfg.get('Info', 'Type')
-    presets_module = None
-
-    if cpu_type == 'Amd_Apu':
-        if ryzen_family.index(cpu_family) < ryzen_family.index("Matisse"):
-            if any(x in cpu_model for x in ["U", "e", "Ce"]):
-                presets_module = "AMDAPUPreMatisse_U_e_Ce"
-            elif "H" in cpu_model:
-                presets_module = "AMDAPUPreMatisse_H"
-            elif "GE" in cpu_model:
-                presets_module = "AMDAPUPreMatisse_GE"
-            elif "G" in cpu_model:
-                presets_module = "AMDAPUPreMatisse_G"
-            else:
-                presets_module = "AMDCPU"
-        elif ryzen_family.index(cpu_family) > ryzen_family.index("Matisse"):
-            if "U" in cpu_model:
-                presets_module = "AMDAPUPostMatisse_U"
-            elif "HX" in cpu_model:
-                presets_module = "AMDAPUPostMatisse_HX"
-            elif "HS" in cpu_model:
-                presets_module = "AMDAPUPostMatisse_HS"
-            elif "H" in cpu_model:
-                presets_module = "AMDAPUPostMatisse_H"
-            elif "GE" in cpu_model:
-                presets_module = "AMDAPUPostMatisse_GE"
-            elif "G" in cpu_model:
-                presets_module = "AMDAPUPostMatisse_G"
-            else:
-                presets_module = "AMDCPU"
-    elif cpu_type == 'Amd_Desktop_Cpu':
-        if ryzen_family.index(cpu_family) < ryzen_family.index("Raphael"):
-            if "E" in cpu_model:
-                presets_module = "AMDCPUPreRaphael_E"
-            elif "X3D" in cpu_model:
-                presets_module = "AMDCPUPreRaphael_X3D"
-            elif "X" in cpu_model and "9" in cpu_model:
-                presets_module = "AMDCPUPreRaphael_X9"
-            elif "X" in cpu_model:
-                presets_module = "AMDCPUPreRaphael_X"
-            else:
-                presets_module = "AMDCPUPreRaphael"
-        else:
-            if "E" in cpu_model:
-                presets_module = "AMDCPU_E"
-            elif "X3D" in cpu_model:
-                presets_module = "AMDCPU_X3D"
-            elif "X" in cpu_model and "9" in cpu_model:
-                presets_module = "AMDCPU_X9"
-            else:
-                presets_module = "AMDCPU"
-    else:
-        presets_module = "AMDCPU"
+    key = (cfg.get('Info', 'CPU'), cfg.get('Info', 'Family'), cfg.get('Info', 'Type'), os.stat(PRESETS_PATH).st_mtime_ns)
+    if key not in preset_cache:
+        preset_cache.clear()
+        preset_class = get_preset_class()
+        presets = preset_catalog.presets(preset_class)
+        for preset_args in presets.values():
+            compile_args(preset_args)
+        preset_cache[key] = presets
+        if cfg.get('User', 'Preset', fallback='') != preset_class:
+            cfg.set('User', 'Preset', preset_class)
+            cfg.save()
+    return preset_cache[key]
 
-    module = __import__(f"Assets.Presets.{presets_module}", fromlist=['PRESETS'])
-    cfg.set('User', 'Preset', f"Assets.Presets.{presets_module}")
-    with open(CONFIG_PATH, 'w') as config_file:
-        cfg.write(config_file)
-    return module.PRESETS
+@functools.lru_cache(maxsize=None)
+def compile_args(args):
+    return tuple(args.split())
 
 def hardware_info():
     clear()
     logging.info("Processor Information:")
     logging.info(f" - Processor: {cfg.get('Info', 'CPU')}")
     cpu_family = cfg.get('Info', 'Family')
-    smu_version = get_hardware_info(f"{os.path.join(current_dir, 'Assets', 'ryzenadj')} -i | grep 'SMU BIOS Interface Version'", use_sudo=True).strip()
+    smu_version = cfg.get('Info', 'SMU', fallback='')
+    if not smu_version:
+        match = re.search(r"SMU BIOS Interface Version: *(\S+)", get_smu().run(('-i',)).stdout)
+        if match:
+            smu_version = match.group(1)
+            cfg.set('Info', 'SMU', smu_version)
+            cfg.save()
     if cpu_family:
         logging.info(f" - Codename: {cpu_family}")
     if smu_version:
-        logging.info(f" - {smu_version}")
+        logging.info(f" - SMU BIOS Interface Version: {smu_version}")
     logging.info(f" - Architecture: {cfg.get('Info', 'Architecture')}")
     logging.info(f" - Type: {cfg.get('Info', 'Type')}")
     logging.info(f" - Cores: {cfg.get('Info', 'Core Count')}")
@@ -266,22 +263,16 @@ def welcome_tutorial():
     cfg.set('Settings', 'Time', '30')
     cfg.set('Settings', 'SoftwareUpdate', '1')
     cfg.set('Settings', 'ReApply', '0')
+    cfg.set('Settings', 'Verify', '0')
     cfg.set('Settings', 'ApplyOnStart', '1')
     cfg.set('Settings', 'DynamicMode', '0')
     cfg.set('Settings', 'Debug', '1')
     cfg.set('Settings', 'SIP', '03080000')
-    cfg.set('Info', 'CPU', get_hardware_info(f"{os.path.join(current_dir, 'Assets', 'dmidecode')} -t processor | grep 'Version' | awk -F': ' '{{print $2}}'", use_sudo=True).strip())
-    cfg.set('Info', 'Signature', get_hardware_info(f"{os.path.join(current_dir, 'Assets', 'dmidecode')} -t processor | grep 'Signature' | awk -F': ' '{{print $2}}'", use_sudo=True).strip())
-    cfg.set('Info', 'Voltage', get_hardware_info(f"{os.path.join(current_dir, 'Assets', 'dmidecode')} -t processor | grep 'Voltage' | awk -F': ' '{{print $2}}'", use_sudo=True).strip())
-    cfg.set('Info', 'Max Speed', get_hardware_info(f"{os.path.join(current_dir, 'Assets', 'dmidecode')} -t processor | grep 'Max Speed' | awk -F': ' '{{print $2}}'", use_sudo=True).strip())
-    cfg.set('Info', 'Current Speed', get_hardware_info(f"{os.path.join(current_dir, 'Assets', 'dmidecode')} -t processor | grep 'Current Speed' | awk -F': ' '{{print $2}}'", use_sudo=True).strip())
-    cfg.set('Info', 'Core Count', get_hardware_info(f"{os.path.join(current_dir, 'Assets', 'dmidecode')} -t processor | grep 'Core Count' | awk -F': ' '{{print $2}}'", use_sudo=True).strip())
-    cfg.set('Info', 'Core Enabled', get_hardware_info(f"{os.path.join(current_dir, 'Assets', 'dmidecode')} -t processor | grep 'Core Enabled' | awk -F': ' '{{print $2}}'", use_sudo=True).strip())
-    cfg.set('Info', 'Thread Count', get_hardware_info(f"{os.path.join(current_dir, 'Assets', 'dmidecode')} -t processor | grep 'Thread Count' | awk -F': ' '{{print $2}}'", use_sudo=True).strip())
-    with open(CONFIG_PATH, 'w') as config_file:
-        cfg.write(config_file)
+    probe_hardware(hardware_probe())
+    cfg.save()
     get_codename()
     preset_cfg()
+    cfg.flush()
     if not check_run():
         install_menu()
     clear()
@@ -341,8 +332,7 @@ def applystart_cfg():
         else:
             logging.info("Invalid option.")
             input("Press Enter to continue...")
-        with open(CONFIG_PATH, 'w') as config_file:
-            cfg.write(config_file)
+        cfg.save()
 
 def debug_cfg():
     while True:
@@ -362,8 +352,7 @@ def debug_cfg():
         else:
             logging.info("Invalid option.")
             input("Press Enter to continue...")
-        with open(CONFIG_PATH, 'w') as config_file:
-            cfg.write(config_file)
+        cfg.save()
 
 def reapply_cfg():
     while True:
@@ -371,20 +360,40 @@ def reapply_cfg():
         logging.info("--------------- Auto reapply ---------------")
         logging.info("(Automatic reapply preset)")
         reapply_enabled = cfg.get('Settings', 'ReApply', fallback='0') == '1'
+        verify_enabled = cfg.get('Settings', 'Verify', fallback='0') == '1'
+        telemetry_enabled = cfg.get('Settings', 'Telemetry', fallback='0') == '1'
+        recording_enabled = cfg.get('Settings', 'TelemetryLog', fallback='0') == '1'
         logging.info("Status: Enabled" if reapply_enabled else "Status: Disabled")
-        logging.info("\n1. Enable Auto reapply\n2. Disable Auto reapply\n\nB. Back\n")
+        logging.info(f"Verify before reapply: {'Enabled' if verify_enabled else 'Disabled'}")
+        logging.info(f"Telemetry: {'Enabled' if telemetry_enabled else 'Disabled'}")
+        logging.info(f"Telemetry recording: {'Enabled' if recording_enabled else 'Disabled'}")
+        logging.info("\n1. Enable Auto reapply\n2. Disable Auto reapply")
+        logging.info("3. Enable Verify before reapply\n4. Disable Verify before reapply")
+        logging.info("5. Enable Telemetry\n6. Disable Telemetry")
+        logging.info("7. Enable Telemetry recording\n8. Disable Telemetry recording\n\nB. Back\n")
         choice = input("Option: ").strip()
         if choice == "1":
             cfg.set('Settings', 'ReApply', '1')
         elif choice == "2":
             cfg.set('Settings', 'ReApply', '0')
+        elif choice == "3":
+            cfg.set('Settings', 'Verify', '1')
+        elif choice == "4":
+            cfg.set('Settings', 'Verify', '0')
+        elif choice == "5":
+            cfg.set('Settings', 'Telemetry', '1')
+        elif choice == "6":
+            cfg.set('Settings', 'Telemetry', '0')
+        elif choice == "7":
+            cfg.set('Settings', 'TelemetryLog', '1')
+        elif choice == "8":
+            cfg.set('Settings', 'TelemetryLog', '0')
         elif choice.lower() == "b":
             break
         else:
             logging.info("Invalid option.")
             input("Press Enter to continue...")
-        with open(CONFIG_PATH, 'w') as config_file:
-            cfg.write(config_file)
+        cfg.save()
 
 def sip_cfg():
     while True:
@@ -405,8 +414,7 @@ def sip_cfg():
         else:
             logging.info("Invalid option.")
             input("Press Enter to continue...")
-        with open(CONFIG_PATH, 'w') as config_file:
-            cfg.write(config_file)
+        cfg.save()
             
 def sleep_cfg():
     while True:
@@ -419,8 +427,7 @@ def sleep_cfg():
         if choice == "1":
             set_time = input("Enter your auto reapply time (Default is 30): ")
             cfg.set('Settings', 'Time', set_time)
-            with open(CONFIG_PATH, 'w') as config_file:
-                cfg.write(config_file)
+            cfg.save()
         elif choice.lower() == "b":
             break
         else:
@@ -443,8 +450,7 @@ def pass_cfg():
                 sudo_check_process = subprocess.run(sudo_check_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
                 if sudo_check_process.returncode == 0:
                     cfg.set('User', 'Password', password)
-                    with open(CONFIG_PATH, 'w') as config_file:
-                        cfg.write(config_file)
+                    cfg.save()
                     break
                 else:
                     logging.info("Incorrect sudo password. Please try again.")
@@ -502,8 +508,7 @@ def cfu_cfg():
         else:
             logging.info("Invalid option.")
             input("Press Enter to continue.")
-        with open(CONFIG_PATH, 'w') as config_file:
-            cfg.write(config_file)
+        cfg.save()
 
 def preset_cfg():
     PRESETS = get_presets()
@@ -523,17 +528,17 @@ def preset_cfg():
                 cfg.set('Settings', 'DynamicMode', '0')
             logging.info("Set preset successfully!")
             input("Press Enter to continue...")
-            with open(CONFIG_PATH, 'w') as config_file:
-                cfg.write(config_file)
+            cfg.save()
             break
         elif choice == 'd':
+            strategy = input("Switch presets by 1. Power source or 2. CPU load (Default is 1): ").strip()
+            cfg.set('Settings', 'DynamicStrategy', 'load' if strategy == '2' else 'power')
             cfg.set('User', 'Mode', 'Balance')
             cfg.set('Settings', 'DynamicMode', '1')
             cfg.set('Settings', 'ReApply', '1')
             logging.info("Set preset successfully!")
             input("Press Enter to continue...")
-            with open(CONFIG_PATH, 'w') as config_file:
-                cfg.write(config_file)
+            cfg.save()
             break
         elif choice == 'b':
             return
@@ -546,8 +551,7 @@ def preset_cfg():
                     cfg.set('Settings', 'DynamicMode', '0')
                 logging.info("Set preset successfully!")
                 input("Press Enter to continue...")
-                with open(CONFIG_PATH, 'w') as config_file:
-                    cfg.write(config_file)
+                cfg.save()
                 break
             except ValueError:
                 logging.info("Invalid option.")
@@ -639,7 +643,7 @@ def prompt_restart():
         subprocess.call(restart_command, shell=True)
 
 def reset():
-    os.remove(CONFIG_PATH)
+    cfg.reset()
     welcome_tutorial()
 
 def read_cfg() -> str:
@@ -658,16 +662,6 @@ def check_cfg_integrity() -> None:
     any(key not in cfg['Info'] for key in required_keys_info):
         reset()
 
-def get_latest_ver():
-    latest_version = urllib.request.urlopen(LATEST_VERSION_URL).geturl()
-    return latest_version.split("/")[-1]
-
-def get_changelog():
-    request = urllib.request.Request(GITHUB_API_URL)
-    response = urllib.request.urlopen(request)
-    data = json.loads(response.read())
-    return data['body']
-
 def check_run():
     SIP = cfg.get('Settings', 'SIP', fallback='03080000')
     
@@ -684,12 +678,16 @@ def check_run():
         return False
 
 def updater():
+    if update_checker.release is None and update_checker.run(force=True) is None:
+        logging.info(f"Failed to fetch latest version: {update_checker.error}")
+        event_log.warning('update_check_failed', extra={'error': str(update_checker.error)})
+        input("Press Enter to continue...")
+        return
     while True:
         clear()
-        changelog = get_changelog()
         logging.info("--------------- UXTU4Unix Software Update ---------------")
         logging.info("A new update is available!")
-        logging.info(f"Changelog for the latest version ({get_latest_ver()}):\n{changelog}")
+        logging.info(f"Changelog for the latest version ({update_checker.latest_version}):\n{update_checker.changelog}")
         logging.info("Do you want to update? (y/n): \n")
         
         choice = input("Option: ").lower().strip()
@@ -700,6 +698,7 @@ def updater():
                 subprocess.run(["python3", update_script_path], check=True)
                 logging.info("Updating...")
                 logging.info("Update complete. Restarting the application, please close this window...")
+                raise SystemExit
             except subprocess.CalledProcessError as e:
                 logging.error(f"Update failed: {e}")
             break
@@ -708,42 +707,24 @@ def updater():
             break
         else:
             logging.info("Invalid option. Please enter 'y' or 'n'.")
-    
-    raise SystemExit
 
 def check_updates():
-    clear()
-    max_retries = 10
-    skip_update_check = False
-    for i in range(max_retries):
-        try:
-            latest_version = get_latest_ver()
-        except Exception as e:
-            if i < max_retries - 1:
-                logging.info(f"Failed to fetch latest version. Retrying {i+1}/{max_retries}... {str(e)}")
-                time.sleep(5)
-            else:
-                clear()
-                logging.info("Failed to fetch latest version")
-                result = input("Do you want to skip the check for updates? (y/n): ").lower().strip()
-                if result == "y":
-                    skip_update_check = True
-                else:
-                    logging.info("Quitting...")
-                    raise SystemExit
-    if not skip_update_check:
-        if LOCAL_VERSION < latest_version:
-            updater()
-        elif LOCAL_VERSION > latest_version:
-            clear()
-            logging.info("Welcome to the UXTU4Unix Beta Program")
-            logging.info("This beta build may not work as expected and is only for testing purposes!")
-            result = input("Do you want to continue (y/n): ").lower().strip()
-            if result == "y":
-                pass
-            else:
-                logging.info("Quitting...")
-                raise SystemExit
+    # Reports the background check once it has finished; never waits on the network
+    global update_notified
+    if update_notified or not update_checker.done():
+        return
+    update_notified = True
+    status = update_checker.status()
+    if status == 'update':
+        updater()
+    elif status == 'beta':
+        clear()
+        logging.info("Welcome to the UXTU4Unix Beta Program")
+        logging.info("This beta build may not work as expected and is only for testing purposes!")
+        result = input("Do you want to continue (y/n): ").lower().strip()
+        if result != "y":
+            logging.info("Quitting...")
+            raise SystemExit
 
 def about():
     options = {
@@ -762,10 +743,11 @@ def about():
         logging.info("dmidecode for macOS: Acidanthera")
         logging.info("Command file for macOS: CorpNewt")
         logging.info("----------------------------")
-        try:
-            logging.info(f"F. Force update to the latest version ({get_latest_ver()})")
-        except:
-            pass
+        if update_checker.thread is None:
+            # A fresh cache answers immediately; otherwise the version shows up on the next redraw
+            update_checker.start().wait(1)
+        if update_checker.latest_version:
+            logging.info(f"F. Force update to the latest version ({update_checker.latest_version})")
         logging.info("\nB. Back\n")
         choice = input("Option: ").lower().strip()
         action = options.get(choice, None)
@@ -837,13 +819,13 @@ def preset_menu():
         input("Press Enter to continue...")
 
 def apply_smu(args, user_mode, save_to_config=True):
+    global screen
     if not check_run():
         clear()
         logging.info("Cannot run RyzenAdj because your computer is missing debug=0x144 or required SIP is not SET yet\nPlease run Install UXTU4Unix dependencies under Setting \nand restart after install.")
         input("Press Enter to continue...")
         return
     sleep_time = cfg.get('Settings', 'Time', fallback='30')
-    password = cfg.get('User', 'Password', fallback='')
     dynamic = cfg.get('Settings', 'DynamicMode', fallback='0')
     last_apply = cfg.get('Settings', 'ReApply', fallback='0')
     PRESETS = get_presets()
@@ -855,13 +837,43 @@ def apply_smu(args, user_mode, save_to_config=True):
     if save_to_config and user_mode == 'Custom':
         cfg.set('User', 'Mode', 'Custom')
         cfg.set('User', 'CustomArgs', args)
-        with open(CONFIG_PATH, 'w') as config_file:
-            cfg.write(config_file)
+        cfg.save()
 
     reapply = cfg.get('Settings', 'ReApply', fallback='0')
     if reapply == '1':
-        while True:
-            if dynamic == '1':
+        verify = cfg.get('Settings', 'Verify', fallback='0') == '1'
+        load = open_load() if dynamic == '1' and cfg.get('Settings', 'DynamicStrategy', fallback='power') == 'load' else None
+        policy = load_policy(user_mode, PRESETS) if load else None
+        next_apply = 0
+        controller = thermal_controller() if cfg.get('Settings', 'Thermal', fallback='0') == '1' else None
+        # The controller moves the limits every tick, so there is nothing for Verify to hold steady
+        monitor = DriftMonitor(int(float(sleep_time))) if verify and not controller else None
+        # The metrics endpoint exports the latest sample, so it needs the sampler running too
+        sampler = get_telemetry().start() if '1' in (cfg.get('Settings', 'Telemetry', fallback='0'), cfg.get('Settings', 'Metrics', fallback='0')) else None
+        profiles = read_profiles(PRESETS)
+        profile_base = None
+        profile_name = None
+
+        def reapply_tick(command):
+            nonlocal args, user_mode, dynamic, next_apply, profile_base, profile_name
+            if isinstance(command, tuple) and command[0] == 'profile':
+                # A profiled application suspends Dynamic Mode; the previous preset returns when it exits
+                _, mode, profile_name = command
+                event_log.info('profile', extra={'executable': profile_name, 'mode': mode})
+                if mode and profile_base is None:
+                    profile_base = (user_mode, args, dynamic)
+                if mode:
+                    user_mode, args, dynamic = mode, PRESETS[mode], '0'
+                elif profile_base:
+                    user_mode, args, dynamic = profile_base
+                    profile_base = None
+            if dynamic == '1' and load:
+                load_sample = load.sample()
+                mode = policy.update(load_sample.demand)
+                if command is None and mode == user_mode and time.monotonic() < next_apply:
+                    return min(SAMPLE_INTERVAL, next_apply - time.monotonic())
+                user_mode, args = mode, PRESETS[mode]
+            elif dynamic == '1':
                 battery_status = subprocess.check_output(["pmset", "-g", "batt"]).decode("utf-8")
                 if 'AC Power' in battery_status:
                    user_mode = 'Extreme'
@@ -869,54 +881,128 @@ def apply_smu(args, user_mode, save_to_config=True):
                    user_mode = 'Eco'
                 else:
                    user_mode = 'Extreme'
+                args = PRESETS[user_mode]
             clear()
-            if args == 'Custom':
-                command = ["sudo", "-S", os.path.join(current_dir, 'Assets', 'ryzenadj')] + user_mode.split()
-            else:
-                command = ["sudo", "-S", os.path.join(current_dir, 'Assets', 'ryzenadj')] + args.split()
+            ryzenadj_args = compile_args(user_mode if args == 'Custom' else args)
             logging.info(f"Using preset: {user_mode}")
-            if dm_enabled:
+            if dynamic == '1' and load:
+                logging.info(f"Dynamic mode: Enabled (CPU load {load_sample.utilization:.0f}%, busiest core {load_sample.busiest:.0f}%, pressure {load_sample.pressure:.1f}%)")
+            elif dynamic == '1':
                 logging.info("Dynamic mode: Enabled")
             else:
                 logging.info("Dynamic mode: Disabled")
+            if profile_base:
+                logging.info(f"App profile: {profile_name} is running")
             logging.info("Auto reapply: Enabled")
-            logging.info(f"Script will check and auto reapply if need every {sleep_time} seconds")
-            logging.info("Press B then Enter to go back to the main menu")
+            if controller:
+                controller.set_bounds(parse_args(ryzenadj_args), thermal_floor())
+                ryzenadj_args = controller.adjust(ryzenadj_args, get_smu().run(('-i',)).stdout)
+                logging.info(f"Thermal control: holding {controller.sensor} at {controller.target:g} C (now {controller.temperature:.1f} C), limits at {controller.fraction():.0%} of the preset")
+            elif monitor:
+                logging.info("Verify before reapply: Enabled")
+                logging.info(f"Script will check limits and reapply only if they drift (next check in {monitor.next_interval} seconds)")
+            else:
+                logging.info(f"Script will check and auto reapply if need every {sleep_time} seconds")
+            if sampler:
+                recent = sampler.summary(600)
+                logging.info(f"Telemetry: {len(sampler.buffer)} samples at {sampler.rate:g} Hz (sampler overhead {sampler.overhead():.3%} CPU, "
+                             f"{sampler.overhead(children=False):.3%} of it in this process)")
+                if 'stapm_value' in recent and 'tctl_value' in recent:
+                    logging.info(f"Last 10 minutes: STAPM {recent['stapm_value'][1]:.1f} W avg, {recent['stapm_value'][2]:.1f} W max, Tctl {recent['tctl_value'][2]:.1f} C max")
+            if not screen:
+                logging.info("Press B then Enter to go back to the main menu")
             logging.info("--------------- RyzenAdj Log ---------------")
-            result = subprocess.run(command, input=password.encode(), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            logging.info(result.stdout.decode())
-            if cfg.get('Settings', 'Debug', fallback='1') == '1':
-                if result.stderr:
-                    logging.info(f"{result.stderr.decode()}")
-            for _ in range(int(float(sleep_time))):
-                time.sleep(1)
-                if sys.stdin in select.select([sys.stdin], [], [], 0)[0]:
-                    line = sys.stdin.readline()
-                    if line.lower().strip() == 'b':
-                        cfg.set('Settings', 'ReApply', last_apply)
-                        return
+            drifted = None
+            if monitor and monitor.tracking(ryzenadj_args):
+                drifted = monitor.check(get_smu().run(['-i']).stdout)
+                if drifted:
+                    logging.info(f"Verify: limits drifted, reapplying: {describe(drifted)}")
+                    event_log.warning('drift', extra={'mode': user_mode, 'changes': describe(drifted)})
+                    for option, _, _ in drifted:
+                        metrics.inc('uxtu4unix_drifts_total', option=option)
+                else:
+                    logging.info(f"Verify: limits unchanged, reapply skipped (next check in {monitor.next_interval} seconds)")
+                    event_log.info('reapply_skipped', extra={'mode': user_mode})
+                    metrics.inc('uxtu4unix_reapply_skipped_total')
+            if drifted is None or drifted:
+                result = get_smu().run(ryzenadj_args + ('-i',) if monitor else ryzenadj_args)
+                log_applied(ryzenadj_args, result, user_mode, dynamic)
+                logging.info(result.stdout)
+                if cfg.get('Settings', 'Debug', fallback='1') == '1':
+                    if result.stderr:
+                        logging.info(f"{result.stderr}")
+                if monitor:
+                    monitor.applied(ryzenadj_args, result.stdout)
+                    for option, (target, actual) in monitor.clamped.items():
+                        logging.info(f"Verify: firmware clamped {option} to {actual:g} (requested {target:g})")
+                        event_log.warning('clamped', extra={'option': option, 'requested': target, 'actual': actual})
+            if controller:
+                interval = float(cfg.get('Settings', 'ThermalInterval', fallback='2'))
+            else:
+                interval = monitor.next_interval if monitor else int(float(sleep_time))
+            if dynamic == '1' and load:
+                # Load is sampled every few seconds; the SMU is only written on a mode change or when a reapply is due
+                next_apply = time.monotonic() + interval
+                return min(interval, SAMPLE_INTERVAL)
+            return interval
+
+        def screen_tick(command):
+            interval = reapply_tick(command)
+            due = next_apply - time.monotonic() if dynamic == '1' and load else interval
+            screen.set_status('Preset', user_mode)
+            screen.set_status('Next reapply', next_time(due))
+            screen.refresh()
+            return interval
+
+        screen = open_screen(f"UXTU4Unix {LOCAL_VERSION}") if cfg.get('Settings', 'TUI', fallback='1') == '1' else None
+        terminal = logging.getLogger().handlers
+        if screen:
+            for name in ('Preset', 'Next reapply', 'Last apply'):
+                screen.set_status(name, None)
+            logging.getLogger().handlers = [ScreenHandler(screen)]
+            engine = ReapplyEngine(screen_tick, stdin=None)
+            engine.add_source(screen, lambda: 'stop' if screen.back_requested() else None)
+        else:
+            engine = ReapplyEngine(reapply_tick)
+        watcher = ProcessWatcher(profiles, lambda mode, name: engine.post(('profile', mode, name))).start() if profiles else None
+        try:
+            engine.run()
+        finally:
+            if screen:
+                screen.stop()
+                screen = None
+                logging.getLogger().handlers = terminal
+            if watcher:
+                watcher.stop()
+            if load:
+                load.close()
+            if sampler:
+                sampler.stop()
+        cfg.set('Settings', 'ReApply', last_apply)
     else:
         clear()
-        if args == 'Custom':
-            command = ["sudo", "-S", os.path.join(current_dir, 'Assets', 'ryzenadj')] + user_mode.split()
-        else:
-            command = ["sudo", "-S", os.path.join(current_dir, 'Assets', 'ryzenadj')] + args.split()
+        ryzenadj_args = compile_args(user_mode if args == 'Custom' else args)
         logging.info(f"Using preset: {user_mode}")
         logging.info("Auto reapply: Disabled")
         logging.info("--------------- RyzenAdj Log ---------------")
-        result = subprocess.run(command, input=password.encode(), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        logging.info(result.stdout.decode())
+        result = get_smu().run(ryzenadj_args)
+        log_applied(ryzenadj_args, result, user_mode, '0')
+        logging.info(result.stdout)
         if cfg.get('Settings', 'Debug', fallback='1') == '1':
             if result.stderr:
-                logging.info(f"{result.stderr.decode()}")
+                logging.info(f"{result.stderr}")
         input("Press Enter to continue...")
 
 def main():
-    subprocess.run("printf '\\e[8;30;100t'", shell=True)
+    event_log.info('start', extra={'version': LOCAL_VERSION, 'edition': 'macOS'})
+    resize_terminal(30, 100)
     check_cfg_integrity()
+    check_hardware()
     PRESETS = get_presets()
     if cfg.get('Settings', 'SoftwareUpdate', fallback='0') == '1':
-        check_updates()
+        update_checker.start()
+    if cfg.get('Settings', 'Metrics', fallback='0') == '1':
+        start_metrics()
     if cfg.get('Settings', 'ApplyOnStart', fallback='1') == '1':
         user_mode = read_cfg()
         if user_mode == 'Custom':
@@ -930,6 +1016,7 @@ def main():
             input("Press Enter to continue...")
             welcome_tutorial()
     while True:
+        check_updates()
         clear()
         options = {
             "1": preset_menu,